@@ -1908,6 +1908,35 @@ DEFINE_QUANTIZED_RNN_CELL(quantized_rnn_relu_cell, simple_hx_type, quantized_rnn
 using quantized_rnn_tanh_cell_type = SimpleCell<tanh_f, QuantizedCellParams>;
 DEFINE_QUANTIZED_RNN_CELL(quantized_rnn_tanh_cell, simple_hx_type, quantized_rnn_tanh_cell_type, Tensor, prepare_quantized_hx);
 
+// Dynamic quantized cells take the prepacked weights of
+// quantized::linear_prepack, like the cell params of the dynamic quantized
+// LSTM and GRU, and quantize their inputs on the fly.
+#define DEFINE_QUANTIZED_RNN_CELL_DYNAMIC(name, hx_type, cell_type, return_type, prepare_hx_fn) \
+return_type name( \
+    const Tensor& input, \
+    hx_type hx, \
+    const Tensor& _packed_w_ih, \
+    const Tensor& _packed_w_hh, \
+    const Tensor& b_ih, \
+    const Tensor& b_hh) { \
+  QRNNCellParamsWrapper params(make_quantized_cell_params_dynamic( \
+      _packed_w_ih, _packed_w_hh, b_ih, b_hh)); \
+  return cell_type{}( \
+      input, prepare_hx_fn(hx), params); \
+}
+
+using quantized_lstm_cell_dynamic_type = LSTMCell<QRNNCellParamsWrapper>;
+DEFINE_QUANTIZED_RNN_CELL_DYNAMIC(quantized_lstm_cell_dynamic, TensorList, quantized_lstm_cell_dynamic_type, quantized_lstm_return_type, prepare_quantized_lstm_hx);
+
+using quantized_gru_cell_dynamic_type = GRUCell<QRNNCellParamsWrapper>;
+DEFINE_QUANTIZED_RNN_CELL_DYNAMIC(quantized_gru_cell_dynamic, simple_hx_type, quantized_gru_cell_dynamic_type, Tensor, prepare_quantized_hx);
+
+using quantized_rnn_relu_cell_dynamic_type = SimpleCell<relu_f, QRNNCellParamsWrapper>;
+DEFINE_QUANTIZED_RNN_CELL_DYNAMIC(quantized_rnn_relu_cell_dynamic, simple_hx_type, quantized_rnn_relu_cell_dynamic_type, Tensor, prepare_quantized_hx);
+
+using quantized_rnn_tanh_cell_dynamic_type = SimpleCell<tanh_f, QRNNCellParamsWrapper>;
+DEFINE_QUANTIZED_RNN_CELL_DYNAMIC(quantized_rnn_tanh_cell_dynamic, simple_hx_type, quantized_rnn_tanh_cell_dynamic_type, Tensor, prepare_quantized_hx);
+
 namespace {
 
 static auto cell_params_base_registry =
@@ -1975,7 +2004,27 @@ static auto registry =
             torch::RegisterOperators::options()
                 .kernel<
                     decltype(quantized_gru_data_legacy),
-                    quantized_gru_data_legacy>(DispatchKey::CPUTensorId));
+                    quantized_gru_data_legacy>(DispatchKey::CPUTensorId))
+        .op("quantized::quantized_lstm_cell_dynamic(Tensor input, Tensor[] hx, Tensor w_ih, Tensor w_hh, Tensor b_ih, Tensor b_hh) -> (Tensor, Tensor)",
+            torch::RegisterOperators::options()
+                .kernel<
+                    decltype(quantized_lstm_cell_dynamic),
+                    quantized_lstm_cell_dynamic>(DispatchKey::CPUTensorId))
+        .op("quantized::quantized_gru_cell_dynamic(Tensor input, Tensor hx, Tensor w_ih, Tensor w_hh, Tensor b_ih, Tensor b_hh) -> Tensor",
+            torch::RegisterOperators::options()
+                .kernel<
+                    decltype(quantized_gru_cell_dynamic),
+                    quantized_gru_cell_dynamic>(DispatchKey::CPUTensorId))
+        .op("quantized::quantized_rnn_relu_cell_dynamic(Tensor input, Tensor hx, Tensor w_ih, Tensor w_hh, Tensor b_ih, Tensor b_hh) -> Tensor",
+            torch::RegisterOperators::options()
+                .kernel<
+                    decltype(quantized_rnn_relu_cell_dynamic),
+                    quantized_rnn_relu_cell_dynamic>(DispatchKey::CPUTensorId))
+        .op("quantized::quantized_rnn_tanh_cell_dynamic(Tensor input, Tensor hx, Tensor w_ih, Tensor w_hh, Tensor b_ih, Tensor b_hh) -> Tensor",
+            torch::RegisterOperators::options()
+                .kernel<
+                    decltype(quantized_rnn_tanh_cell_dynamic),
+                    quantized_rnn_tanh_cell_dynamic>(DispatchKey::CPUTensorId));
 
 } // namespace
 }}  // namespace at::native
@@ -0,0 +1,209 @@
+#include <ATen/ATen.h>
+#include <ATen/Parallel.h>
+#include <ATen/native/quantized/cpu/qembeddingbag_utils.h>
+#include <torch/library.h>
+
+#include <caffe2/perfkernels/fused_8bit_rowwise_embedding_lookup_idx.h>
+
+#include <algorithm>
+#include <vector>
+
+namespace at {
+namespace native {
+namespace {
+
+constexpr int64_t MODE_SUM = 0;
+constexpr int64_t MODE_MEAN = 1;
+
+void check_embedding_bag_inputs(
+    const Tensor& packed_weight,
+    const Tensor& indices,
+    const Tensor& offsets,
+    int64_t mode,
+    const c10::optional<Tensor>& per_sample_weights,
+    const char* op_name) {
+  TORCH_CHECK(
+      packed_weight.dim() == 2 && packed_weight.scalar_type() == kByte,
+      op_name,
+      " expects a 2D uint8 packed weight");
+  TORCH_CHECK(
+      indices.dim() == 1 && indices.scalar_type() == kLong,
+      op_name,
+      " expects 1D int64 indices");
+  TORCH_CHECK(
+      offsets.dim() == 1 && offsets.scalar_type() == kLong,
+      op_name,
+      " expects 1D int64 offsets");
+  TORCH_CHECK(
+      mode == MODE_SUM || mode == MODE_MEAN,
+      op_name,
+      " only supports the sum (0) and mean (1) modes, got ",
+      mode);
+  if (per_sample_weights.has_value() && per_sample_weights->defined()) {
+    TORCH_CHECK(
+        mode == MODE_SUM,
+        op_name,
+        " only supports per_sample_weights with the sum mode");
+    TORCH_CHECK(
+        per_sample_weights->scalar_type() == kFloat &&
+            per_sample_weights->sizes() == indices.sizes(),
+        op_name,
+        " expects float per_sample_weights of the same shape as indices");
+  }
+}
+
+// Returns the offsets of all bags followed by the end offset of the last bag,
+// which is the form expected by the lookup kernels.
+std::vector<int64_t> get_bag_boundaries(
+    const Tensor& offsets,
+    int64_t num_indices,
+    bool include_last_offset,
+    const char* op_name) {
+  const auto offsets_contig = offsets.contiguous();
+  const auto* offsets_data = offsets_contig.data_ptr<int64_t>();
+  std::vector<int64_t> boundaries(offsets_data, offsets_data + offsets.numel());
+  if (!include_last_offset) {
+    boundaries.push_back(num_indices);
+  }
+  TORCH_CHECK(
+      boundaries.size() >= 1 && boundaries.front() == 0,
+      op_name,
+      " expects the first offset to be 0");
+  TORCH_CHECK(
+      std::is_sorted(boundaries.begin(), boundaries.end()) &&
+          boundaries.back() <= num_indices,
+      op_name,
+      " expects non-decreasing offsets that are at most the number of indices");
+  return boundaries;
+}
+
+Tensor qembeddingbag_byte(
+    const Tensor& packed_weight,
+    const Tensor& indices,
+    const Tensor& offsets,
+    int64_t mode,
+    const c10::optional<Tensor>& per_sample_weights,
+    bool include_last_offset) {
+  check_embedding_bag_inputs(
+      packed_weight,
+      indices,
+      offsets,
+      mode,
+      per_sample_weights,
+      "embedding_bag_byte");
+  const auto weight_contig = packed_weight.contiguous();
+  const auto indices_contig = indices.contiguous();
+  const int64_t num_rows = weight_contig.size(0);
+  const int64_t embedding_dim =
+      weight_contig.size(1) - kByteRowwiseScaleBiasBytes;
+  const auto boundaries = get_bag_boundaries(
+      offsets, indices.numel(), include_last_offset, "embedding_bag_byte");
+  const int64_t output_size = boundaries.size() - 1;
+
+  Tensor weights_contig;
+  const float* weights_data = nullptr;
+  if (per_sample_weights.has_value() && per_sample_weights->defined()) {
+    weights_contig = per_sample_weights->contiguous();
+    weights_data = weights_contig.data_ptr<float>();
+  }
+  auto output = at::empty(
+      {output_size, embedding_dim}, weight_contig.options().dtype(kFloat));
+  const auto* weight_data = weight_contig.data_ptr<uint8_t>();
+  const auto* indices_data = indices_contig.data_ptr<int64_t>();
+  auto* output_data = output.data_ptr<float>();
+
+  at::parallel_for(0, output_size, 1, [&](int64_t start_idx, int64_t end_idx) {
+    const int64_t first = boundaries[start_idx];
+    caffe2::Fused8BitRowwiseEmbeddingLookupIdx<int64_t, uint8_t, float>(
+        /*block_size=*/embedding_dim,
+        /*output_size=*/end_idx - start_idx,
+        /*index_size=*/boundaries[end_idx] - first,
+        /*data_size=*/num_rows,
+        /*input=*/weight_data,
+        /*indices=*/indices_data + first,
+        /*offsets=*/boundaries.data() + start_idx,
+        /*weights=*/weights_data ? weights_data + first : nullptr,
+        /*normalize_by_lengths=*/mode == MODE_MEAN,
+        /*out=*/output_data + start_idx * embedding_dim);
+  });
+  return output;
+}
+
+Tensor qembeddingbag_4bit(
+    const Tensor& packed_weight,
+    const Tensor& indices,
+    const Tensor& offsets,
+    int64_t mode,
+    const c10::optional<Tensor>& per_sample_weights,
+    bool include_last_offset) {
+  check_embedding_bag_inputs(
+      packed_weight,
+      indices,
+      offsets,
+      mode,
+      per_sample_weights,
+      "embedding_bag_4bit");
+  const auto weight_contig = packed_weight.contiguous();
+  const auto indices_contig = indices.contiguous();
+  const int64_t num_rows = weight_contig.size(0);
+  const int64_t packed_cols = weight_contig.size(1);
+  const int64_t data_bytes = packed_cols - kNBitRowwiseScaleBiasBytes;
+  const int64_t embedding_dim = data_bytes * kNBitRowwiseElemsPerByte;
+  const auto boundaries = get_bag_boundaries(
+      offsets, indices.numel(), include_last_offset, "embedding_bag_4bit");
+  const int64_t output_size = boundaries.size() - 1;
+
+  Tensor weights_contig;
+  const float* weights_data = nullptr;
+  if (per_sample_weights.has_value() && per_sample_weights->defined()) {
+    weights_contig = per_sample_weights->contiguous();
+    weights_data = weights_contig.data_ptr<float>();
+  }
+  auto output = at::zeros(
+      {output_size, embedding_dim}, weight_contig.options().dtype(kFloat));
+  const auto* weight_data = weight_contig.data_ptr<uint8_t>();
+  const auto* indices_data = indices_contig.data_ptr<int64_t>();
+  auto* output_data = output.data_ptr<float>();
+
+  at::parallel_for(0, output_size, 1, [&](int64_t start_idx, int64_t end_idx) {
+    for (int64_t bag = start_idx; bag < end_idx; ++bag) {
+      float* out = output_data + bag * embedding_dim;
+      for (int64_t i = boundaries[bag]; i < boundaries[bag + 1]; ++i) {
+        const int64_t idx = indices_data[i];
+        TORCH_CHECK(
+            idx >= 0 && idx < num_rows,
+            "embedding_bag_4bit: index ",
+            idx,
+            " is out of bounds for a table of ",
+            num_rows,
+            " rows");
+        const uint8_t* row = weight_data + idx * packed_cols;
+        const at::Half* scale_bias =
+            reinterpret_cast<const at::Half*>(row + data_bytes);
+        const float weight = weights_data ? weights_data[i] : 1.0f;
+        const float scale = weight * static_cast<float>(scale_bias[0]);
+        const float bias = weight * static_cast<float>(scale_bias[1]);
+        for (int64_t col = 0; col < embedding_dim; ++col) {
+          out[col] += scale * unpack_nbit_rowwise(row, col) + bias;
+        }
+      }
+      const int64_t length = boundaries[bag + 1] - boundaries[bag];
+      if (mode == MODE_MEAN && length > 0) {
+        const float inverse_length = 1.0f / length;
+        for (int64_t col = 0; col < embedding_dim; ++col) {
+          out[col] *= inverse_length;
+        }
+      }
+    }
+  });
+  return output;
+}
+
+TORCH_LIBRARY_IMPL(quantized, CPU, m) {
+  m.impl("embedding_bag_byte", qembeddingbag_byte);
+  m.impl("embedding_bag_4bit", qembeddingbag_4bit);
+}
+
+} // namespace
+} // namespace native
+} // namespace at
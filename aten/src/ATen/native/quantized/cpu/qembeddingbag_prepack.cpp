@@ -0,0 +1,193 @@
+#include <ATen/ATen.h>
+#include <ATen/Parallel.h>
+#include <ATen/native/quantized/cpu/qembeddingbag_utils.h>
+#include <torch/library.h>
+
+#include <caffe2/perfkernels/fused_8bit_rowwise_conversion.h>
+
+#include <algorithm>
+#include <cmath>
+
+namespace at {
+namespace native {
+namespace {
+
+void check_float_weight(const Tensor& weight, const char* op_name) {
+  TORCH_CHECK(
+      weight.dim() == 2,
+      op_name,
+      " expects a 2D weight, got a ",
+      weight.dim(),
+      "D tensor");
+  TORCH_CHECK(
+      weight.scalar_type() == kFloat,
+      op_name,
+      " expects a float weight, got ",
+      weight.scalar_type());
+}
+
+void check_packed_weight(
+    const Tensor& packed_weight,
+    int64_t scale_bias_bytes,
+    const char* op_name) {
+  TORCH_CHECK(
+      packed_weight.dim() == 2 && packed_weight.scalar_type() == kByte,
+      op_name,
+      " expects a 2D uint8 packed weight");
+  TORCH_CHECK(
+      packed_weight.size(1) > scale_bias_bytes,
+      op_name,
+      " expects rows of more than ",
+      scale_bias_bytes,
+      " bytes, got ",
+      packed_weight.size(1));
+}
+
+// Quantizes every row of a float embedding table to 8 bits with its own
+// scale and bias, stored as floats after the quantized values. This is the
+// layout of the caffe2 Fused8BitRowwise operators:
+// | ... quantized data ... | scale | bias |
+// |    embedding_dim       |  4B   |  4B  |
+Tensor qembeddingbag_byte_prepack(const Tensor& weight) {
+  check_float_weight(weight, "embedding_bag_byte_prepack");
+  const auto weight_contig = weight.contiguous();
+  const int64_t rows = weight_contig.size(0);
+  const int64_t cols = weight_contig.size(1);
+  const int64_t packed_cols = cols + kByteRowwiseScaleBiasBytes;
+  auto output = at::empty({rows, packed_cols}, weight_contig.options().dtype(kByte));
+  const auto* weight_data = weight_contig.data_ptr<float>();
+  auto* output_data = output.data_ptr<uint8_t>();
+
+  at::parallel_for(0, rows, 1, [&](int64_t start_idx, int64_t end_idx) {
+    caffe2::FloatToFused8BitRowwiseQuantized(
+        weight_data + start_idx * cols,
+        end_idx - start_idx,
+        cols,
+        output_data + start_idx * packed_cols);
+  });
+  return output;
+}
+
+Tensor qembeddingbag_byte_unpack(const Tensor& packed_weight) {
+  check_packed_weight(
+      packed_weight, kByteRowwiseScaleBiasBytes, "embedding_bag_byte_unpack");
+  const auto packed_contig = packed_weight.contiguous();
+  const int64_t rows = packed_contig.size(0);
+  const int64_t packed_cols = packed_contig.size(1);
+  const int64_t cols = packed_cols - kByteRowwiseScaleBiasBytes;
+  auto output = at::empty({rows, cols}, packed_contig.options().dtype(kFloat));
+  const auto* packed_data = packed_contig.data_ptr<uint8_t>();
+  auto* output_data = output.data_ptr<float>();
+
+  at::parallel_for(0, rows, 1, [&](int64_t start_idx, int64_t end_idx) {
+    caffe2::Fused8BitRowwiseQuantizedToFloat(
+        packed_data + start_idx * packed_cols,
+        end_idx - start_idx,
+        packed_cols,
+        output_data + start_idx * cols);
+  });
+  return output;
+}
+
+// Quantizes every row of a float embedding table to 4 bits with its own
+// scale and bias, stored as halfs after the packed values. Two values are
+// packed per byte, the first one in the low nibble. This is the layout of the
+// caffe2 FusedNBitRowwise operators:
+// | ... packed data ... | scale | bias |
+// |  embedding_dim / 2  |  2B   |  2B  |
+Tensor qembeddingbag_4bit_prepack(const Tensor& weight) {
+  check_float_weight(weight, "embedding_bag_4bit_prepack");
+  const auto weight_contig = weight.contiguous();
+  const int64_t rows = weight_contig.size(0);
+  const int64_t cols = weight_contig.size(1);
+  TORCH_CHECK(
+      cols % kNBitRowwiseElemsPerByte == 0,
+      "embedding_bag_4bit_prepack expects the embedding dimension to be a "
+      "multiple of ",
+      kNBitRowwiseElemsPerByte,
+      ", got ",
+      cols);
+  const int64_t data_bytes = cols / kNBitRowwiseElemsPerByte;
+  const int64_t packed_cols = data_bytes + kNBitRowwiseScaleBiasBytes;
+  auto output =
+      at::zeros({rows, packed_cols}, weight_contig.options().dtype(kByte));
+  const auto* weight_data = weight_contig.data_ptr<float>();
+  auto* output_data = output.data_ptr<uint8_t>();
+  constexpr int kMaxQuantized = (1 << kNBitRowwiseBitRate) - 1;
+
+  at::parallel_for(0, rows, 1, [&](int64_t start_idx, int64_t end_idx) {
+    for (int64_t row = start_idx; row < end_idx; ++row) {
+      const float* input_row = weight_data + row * cols;
+      uint8_t* output_row = output_data + row * packed_cols;
+      at::Half* output_scale_bias =
+          reinterpret_cast<at::Half*>(output_row + data_bytes);
+
+      // Round the minimum and the scale to half precision before quantizing
+      // so that dequantization uses exactly the values stored in the row.
+      const float Xmin = static_cast<at::Half>(
+          cols ? *std::min_element(input_row, input_row + cols) : 0.0f);
+      const float Xmax =
+          cols ? *std::max_element(input_row, input_row + cols) : 0.0f;
+      const float range = Xmax - Xmin;
+      float scale = static_cast<at::Half>(range / kMaxQuantized);
+      if (scale == 0) {
+        // All values of the row are equal, any non-zero scale works.
+        scale = 1.0f;
+      }
+      const float inverse_scale = 1.0f / scale;
+      output_scale_bias[0] = scale;
+      output_scale_bias[1] = Xmin;
+
+      for (int64_t col = 0; col < cols; ++col) {
+        const int quantized = std::max(
+            0,
+            std::min<int>(
+                std::lrintf((input_row[col] - Xmin) * inverse_scale),
+                kMaxQuantized));
+        output_row[col / kNBitRowwiseElemsPerByte] |= quantized
+            << ((col % kNBitRowwiseElemsPerByte) * kNBitRowwiseBitRate);
+      }
+    }
+  });
+  return output;
+}
+
+Tensor qembeddingbag_4bit_unpack(const Tensor& packed_weight) {
+  check_packed_weight(
+      packed_weight, kNBitRowwiseScaleBiasBytes, "embedding_bag_4bit_unpack");
+  const auto packed_contig = packed_weight.contiguous();
+  const int64_t rows = packed_contig.size(0);
+  const int64_t packed_cols = packed_contig.size(1);
+  const int64_t data_bytes = packed_cols - kNBitRowwiseScaleBiasBytes;
+  const int64_t cols = data_bytes * kNBitRowwiseElemsPerByte;
+  auto output = at::empty({rows, cols}, packed_contig.options().dtype(kFloat));
+  const auto* packed_data = packed_contig.data_ptr<uint8_t>();
+  auto* output_data = output.data_ptr<float>();
+
+  at::parallel_for(0, rows, 1, [&](int64_t start_idx, int64_t end_idx) {
+    for (int64_t row = start_idx; row < end_idx; ++row) {
+      const uint8_t* input_row = packed_data + row * packed_cols;
+      const at::Half* input_scale_bias =
+          reinterpret_cast<const at::Half*>(input_row + data_bytes);
+      const float scale = input_scale_bias[0];
+      const float bias = input_scale_bias[1];
+      float* output_row = output_data + row * cols;
+      for (int64_t col = 0; col < cols; ++col) {
+        output_row[col] =
+            scale * unpack_nbit_rowwise(input_row, col) + bias;
+      }
+    }
+  });
+  return output;
+}
+
+TORCH_LIBRARY_IMPL(quantized, CPU, m) {
+  m.impl("embedding_bag_byte_prepack", qembeddingbag_byte_prepack);
+  m.impl("embedding_bag_byte_unpack", qembeddingbag_byte_unpack);
+  m.impl("embedding_bag_4bit_prepack", qembeddingbag_4bit_prepack);
+  m.impl("embedding_bag_4bit_unpack", qembeddingbag_4bit_unpack);
+}
+
+} // namespace
+} // namespace native
+} // namespace at
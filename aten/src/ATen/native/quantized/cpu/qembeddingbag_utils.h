@@ -0,0 +1,25 @@
+#pragma once
+
+#include <ATen/ATen.h>
+
+namespace at {
+namespace native {
+
+// Row-wise quantized embedding tables store every row as its quantized
+// values followed by the scale and the bias of the row, see
+// qembeddingbag_prepack.cpp. 8-bit rows use a float scale and bias, 4-bit
+// rows pack two values per byte and use a half scale and bias.
+constexpr int64_t kByteRowwiseScaleBiasBytes = 2 * sizeof(float);
+constexpr int kNBitRowwiseBitRate = 4;
+constexpr int64_t kNBitRowwiseElemsPerByte = 8 / kNBitRowwiseBitRate;
+constexpr int64_t kNBitRowwiseScaleBiasBytes = 2 * sizeof(at::Half);
+
+// Returns the quantized value of column ``col`` of a packed 4-bit row.
+inline int unpack_nbit_rowwise(const uint8_t* row, int64_t col) {
+  return (row[col / kNBitRowwiseElemsPerByte] >>
+          ((col % kNBitRowwiseElemsPerByte) * kNBitRowwiseBitRate)) &
+      ((1 << kNBitRowwiseBitRate) - 1);
+}
+
+} // namespace native
+} // namespace at
@@ -0,0 +1,204 @@
+from __future__ import print_function
+import argparse
+import itertools
+import json
+import sys
+import time
+from collections import namedtuple
+
+import torch
+from torch.utils.data import DataLoader, BatchSampler, SequentialSampler, RandomSampler, \
+    WeightedRandomSampler
+
+from .datasets import SAMPLE_KINDS, SyntheticDataset, SyntheticIterableDataset, TimedBatchSampler, \
+    TimedCollate
+
+SAMPLERS = ['sequential', 'random', 'weighted']
+
+BenchConfig = namedtuple('BenchConfig', [
+    'dataset', 'sampler', 'kind', 'num_workers', 'batch_size', 'pin_memory', 'prefetch_factor',
+])
+
+BenchResult = namedtuple('BenchResult', [
+    'samples_per_sec', 'first_batch_ms', 'batch_p50_ms', 'batch_p99_ms',
+    'dispatch_ms', 'fetch_ms', 'collate_ms', 'ipc_ms', 'pin_ms',
+])
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(int(round(p / 100. * (len(values) - 1))), len(values) - 1)]
+
+
+def make_sampler(name, dataset):
+    if name == 'sequential':
+        return SequentialSampler(dataset)
+    if name == 'random':
+        return RandomSampler(dataset)
+    if name == 'weighted':
+        return WeightedRandomSampler(torch.rand(len(dataset)), len(dataset))
+    raise ValueError('Unknown sampler {}, expected one of {}'.format(name, SAMPLERS))
+
+
+def make_loader(config, num_samples, sample_size, cost_us):
+    """Returns the DataLoader of the config, and the batch sampler timing the
+    index dispatch, or None for iterable-style datasets."""
+    kwargs = dict(num_workers=config.num_workers, pin_memory=config.pin_memory,
+                  collate_fn=TimedCollate())
+    if config.num_workers > 0:
+        kwargs['prefetch_factor'] = config.prefetch_factor
+    if config.dataset == 'iterable':
+        dataset = SyntheticIterableDataset(num_samples, config.kind, sample_size, cost_us)
+        return DataLoader(dataset, batch_size=config.batch_size, **kwargs), None
+    dataset = SyntheticDataset(num_samples, config.kind, sample_size, cost_us)
+    batch_sampler = TimedBatchSampler(BatchSampler(
+        make_sampler(config.sampler, dataset), config.batch_size, drop_last=False))
+    return DataLoader(dataset, batch_sampler=batch_sampler, **kwargs), batch_sampler
+
+
+def run(config, num_batches, warmup_batches, sample_size, cost_us):
+    """Loads num_batches batches after warmup_batches ones and returns the
+    BenchResult. Stage times are averages per batch."""
+    num_samples = config.batch_size * (num_batches + warmup_batches)
+    loader, batch_sampler = make_loader(config, num_samples, sample_size, cost_us)
+
+    start = time.perf_counter()
+    it = iter(loader)
+    first_batch_ms = None
+    latencies = []
+    stages = {'fetch': 0., 'collate': 0., 'ipc': 0., 'pin': 0.}
+    num_loaded = 0
+    dispatch_start = 0.
+    while True:
+        batch_start = time.perf_counter()
+        try:
+            batch = next(it)
+        except StopIteration:
+            break
+        received = time.time()
+        batch_end = time.perf_counter()
+        if first_batch_ms is None:
+            first_batch_ms = (batch_end - start) * 1e3
+        if num_loaded == warmup_batches:
+            # Measure the steady state, once workers are started and queues are full
+            start = batch_start
+            dispatch_start = batch_sampler.time if batch_sampler is not None else 0.
+        if num_loaded >= warmup_batches:
+            latencies.append(batch_end - batch_start)
+            stages['fetch'] += batch.fetch
+            stages['collate'] += batch.collate
+            stages['pin'] += batch.pin
+            # Transfer from the process that collated the batch to the main
+            # process, including the wait in queues, excluding pinning
+            stages['ipc'] += max(received - batch.created - batch.pin, 0.)
+        num_loaded += 1
+    total_time = time.perf_counter() - start
+    del it
+
+    num_measured = len(latencies)
+    if num_measured == 0:
+        raise RuntimeError('No batch was loaded after the warmup, increase num_batches')
+    dispatch = (batch_sampler.time - dispatch_start) if batch_sampler is not None else 0.
+    return BenchResult(
+        samples_per_sec=num_measured * config.batch_size / total_time,
+        first_batch_ms=first_batch_ms,
+        batch_p50_ms=percentile(latencies, 50) * 1e3,
+        batch_p99_ms=percentile(latencies, 99) * 1e3,
+        dispatch_ms=dispatch * 1e3 / num_measured,
+        fetch_ms=stages['fetch'] * 1e3 / num_measured,
+        collate_ms=stages['collate'] * 1e3 / num_measured,
+        ipc_ms=stages['ipc'] * 1e3 / num_measured,
+        pin_ms=stages['pin'] * 1e3 / num_measured,
+    )
+
+
+def configs(args):
+    for values in itertools.product(args.dataset, args.sampler, args.kind, args.num_workers,
+                                    args.batch_size, args.pin_memory, args.prefetch_factor):
+        config = BenchConfig(*values)
+        # Iterable-style datasets don't take samplers
+        if config.dataset == 'iterable' and config.sampler != args.sampler[0]:
+            continue
+        # prefetch_factor only applies to multi-process loading
+        if config.num_workers == 0 and config.prefetch_factor != args.prefetch_factor[0]:
+            continue
+        yield config
+
+
+def fmt(item):
+    if isinstance(item, float):
+        return '{:.4g}'.format(item)
+    if item is None:
+        # Config field that doesn't apply, e.g. the sampler of an iterable-style dataset
+        return '-'
+    return str(item)
+
+
+def print_header(colwidth, sep):
+    print(sep.join(field[:colwidth].rjust(colwidth)
+                   for field in BenchConfig._fields + BenchResult._fields))
+
+
+def print_row(config, result, colwidth, sep):
+    config = config._replace(
+        sampler=config.sampler if config.dataset == 'map' else None,
+        prefetch_factor=config.prefetch_factor if config.num_workers > 0 else None)
+    print(sep.join(fmt(item)[:colwidth].rjust(colwidth)
+                   for item in tuple(config) + tuple(result)))
+
+
+def comma_list(type):
+    def parse(string):
+        return [type(item) for item in string.split(',')]
+    return parse
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(
+        description='Benchmarks the throughput and latency of torch.utils.data.DataLoader')
+    parser.add_argument('--dataset', type=comma_list(str), default=['map', 'iterable'],
+                        help='Comma-separated dataset kinds: map, iterable')
+    parser.add_argument('--sampler', type=comma_list(str), default=['sequential', 'random'],
+                        help='Comma-separated samplers of map-style datasets: ' + ', '.join(SAMPLERS))
+    parser.add_argument('--kind', type=comma_list(str), default=['tensor'],
+                        help='Comma-separated sample kinds, which exercise different collate '
+                             'paths: ' + ', '.join(SAMPLE_KINDS))
+    parser.add_argument('--num_workers', type=comma_list(int), default=[0, 2, 4])
+    parser.add_argument('--batch_size', type=comma_list(int), default=[64])
+    parser.add_argument('--pin_memory', type=comma_list(int), default=[0],
+                        help='Comma-separated 0/1 values, 1 requires CUDA')
+    parser.add_argument('--prefetch_factor', type=comma_list(int), default=[2])
+    parser.add_argument('--sample_size', type=int, default=3 * 32 * 32,
+                        help='Number of float32 values per sample')
+    parser.add_argument('--cost_us', type=float, default=0,
+                        help='CPU time in microseconds spent producing each sample')
+    parser.add_argument('--num_batches', type=int, default=200)
+    parser.add_argument('--warmup_batches', type=int, default=10)
+    parser.add_argument('--colwidth', type=int, default=10)
+    parser.add_argument('--sep', type=str, default=' ')
+    parser.add_argument('--output_json', type=str, default=None,
+                        help='Also save the configs and results to this JSON file')
+    args = parser.parse_args(argv)
+
+    if any(args.pin_memory) and not torch.cuda.is_available():
+        print('CUDA is not available, skipping pin_memory=1', file=sys.stderr)
+        args.pin_memory = [p for p in args.pin_memory if not p] or [0]
+    args.pin_memory = [bool(p) for p in args.pin_memory]
+
+    print('Samples of {} float32 values, {}us of CPU time each, {} batches after {} warmup batches'.format(
+        args.sample_size, args.cost_us, args.num_batches, args.warmup_batches))
+    print('Stage times (ms) are averages per batch; fetch and collate run in the workers, in parallel\n')
+    print_header(args.colwidth, args.sep)
+    records = []
+    for config in configs(args):
+        result = run(config, args.num_batches, args.warmup_batches, args.sample_size, args.cost_us)
+        print_row(config, result, args.colwidth, args.sep)
+        records.append(dict(config._asdict(), **result._asdict()))
+
+    if args.output_json is not None:
+        with open(args.output_json, 'w') as f:
+            json.dump({'args': vars(args), 'results': records}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,155 @@
+"""Synthetic datasets with a tunable per-sample CPU cost and size, and the
+instrumentation used to split the time of a batch across the stages of the
+DataLoader pipeline."""
+import time
+
+import numpy as np
+import torch
+from torch.utils.data import Dataset, IterableDataset, get_worker_info
+from torch.utils.data._utils.collate import default_collate
+from torch.utils.data._utils.pin_memory import pin_memory
+
+SAMPLE_KINDS = ['tensor', 'numpy', 'dict', 'string']
+
+# Time spent producing samples in this process since the last collate, see
+# TimedCollate. Every worker process has its own copy.
+_fetch_time = [0.]
+
+
+def busy_wait(cost_us):
+    """Spins for cost_us microseconds, like decoding or augmenting a sample."""
+    if cost_us <= 0:
+        return
+    end = time.perf_counter() + cost_us * 1e-6
+    while time.perf_counter() < end:
+        pass
+
+
+def make_sample(kind, size, index):
+    """Returns a sample of the given kind holding size float32 values."""
+    if kind == 'tensor':
+        return torch.full((size,), float(index))
+    if kind == 'numpy':
+        return np.full((size,), index, dtype=np.float32)
+    if kind == 'dict':
+        return {
+            'input': torch.full((size,), float(index)),
+            'target': index % 10,
+            'meta': {'weights': torch.ones(4), 'index': index},
+        }
+    if kind == 'string':
+        return {'input': torch.full((size,), float(index)), 'name': 'sample_{:08d}'.format(index)}
+    raise ValueError('Unknown sample kind {}, expected one of {}'.format(kind, SAMPLE_KINDS))
+
+
+class SyntheticDataset(Dataset):
+    """A map-style dataset of num_samples samples of the given kind and size,
+    each taking cost_us microseconds of CPU time to produce."""
+
+    def __init__(self, num_samples, kind='tensor', size=3 * 32 * 32, cost_us=0):
+        self.num_samples = num_samples
+        self.kind = kind
+        self.size = size
+        self.cost_us = cost_us
+
+    def __len__(self):
+        return self.num_samples
+
+    def __getitem__(self, index):
+        start = time.perf_counter()
+        busy_wait(self.cost_us)
+        sample = make_sample(self.kind, self.size, index)
+        _fetch_time[0] += time.perf_counter() - start
+        return sample
+
+
+class SyntheticIterableDataset(IterableDataset):
+    """The iterable-style version of SyntheticDataset. The samples are split
+    evenly across the workers."""
+
+    def __init__(self, num_samples, kind='tensor', size=3 * 32 * 32, cost_us=0):
+        self.num_samples = num_samples
+        self.kind = kind
+        self.size = size
+        self.cost_us = cost_us
+
+    def __iter__(self):
+        worker_info = get_worker_info()
+        if worker_info is None:
+            indices = range(self.num_samples)
+        else:
+            indices = range(worker_info.id, self.num_samples, worker_info.num_workers)
+        for index in indices:
+            start = time.perf_counter()
+            busy_wait(self.cost_us)
+            sample = make_sample(self.kind, self.size, index)
+            _fetch_time[0] += time.perf_counter() - start
+            yield sample
+
+
+class TimedBatch(object):
+    """A batch with the time spent on it in every stage of the pipeline.
+
+    Attributes:
+        data: the collated batch.
+        fetch (float): time in seconds spent producing the samples.
+        collate (float): time in seconds spent collating them.
+        created (float): wall clock time at which the batch was collated.
+        pin (float): time in seconds spent pinning the batch, 0 without
+            pin_memory.
+        pin_start (float): wall clock time at which pinning started, or None.
+    """
+
+    def __init__(self, data, fetch, collate):
+        self.data = data
+        self.fetch = fetch
+        self.collate = collate
+        self.created = time.time()
+        self.pin = 0.
+        self.pin_start = None
+
+    def pin_memory(self):
+        # Called by the pin memory thread of the DataLoader
+        self.pin_start = time.time()
+        self.data = pin_memory(self.data)
+        self.pin = time.time() - self.pin_start
+        return self
+
+
+class TimedCollate(object):
+    """Collates the samples with collate_fn and wraps the result in a
+    TimedBatch. Runs in the process that fetched the samples."""
+
+    def __init__(self, collate_fn=default_collate):
+        self.collate_fn = collate_fn
+
+    def __call__(self, samples):
+        fetch = _fetch_time[0]
+        _fetch_time[0] = 0.
+        start = time.perf_counter()
+        data = self.collate_fn(samples)
+        return TimedBatch(data, fetch, time.perf_counter() - start)
+
+
+class TimedBatchSampler(object):
+    """Wraps a batch sampler and records the time the DataLoader spends
+    drawing the indices of batches in the main process."""
+
+    def __init__(self, batch_sampler):
+        self.batch_sampler = batch_sampler
+        self.time = 0.
+
+    def __len__(self):
+        return len(self.batch_sampler)
+
+    def __iter__(self):
+        it = iter(self.batch_sampler)
+        while True:
+            start = time.perf_counter()
+            try:
+                indices = next(it)
+            except StopIteration:
+                return
+            finally:
+                self.time += time.perf_counter() - start
+            yield indices
@@ -15,6 +15,7 @@ import ast
 import cpp_extension # noqa
 
 import cpp_extension # noqa
+import benchmark_results
 import benchmark_utils
 from collections import namedtuple
 
@@ -362,7 +363,11 @@ class BenchmarkRunner(object):
         return False
 
     def run(self):
+        """ Run the selected tests. Return the list of regressions against
+            the baseline file, empty when there is no baseline.
+        """
         self._print_header()
+        results = []
 
         for test_metainfo in BENCHMARK_TESTER:
             for test in _build_test(*test_metainfo):
@@ -399,3 +404,15 @@ class BenchmarkRunner(object):
                                  for _ in range(self.num_runs)]
 
                 self._print_perf_result(reported_time, test_case)
+                results.append(benchmark_results.make_result(
+                    test_case, "JIT" if self.use_jit else "Eager", reported_time))
+
+        if not self.args.output_json and not self.args.baseline_json:
+            return []
+        environment = benchmark_results.environment_fingerprint()
+        if self.args.output_json:
+            benchmark_results.save_results(self.args.output_json, results, environment)
+        if not self.args.baseline_json:
+            return []
+        return benchmark_results.compare_files(
+            self.args.baseline_json, results, environment, self.args.regression_threshold)
@@ -0,0 +1,194 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import argparse
+import json
+import os
+import platform
+import sys
+
+import numpy as np
+
+"""Performance microbenchmarks's result files.
+
+This module saves the results of a benchmark run to a JSON file and compares
+them with the results of a baseline run, e.g. of the previous build.
+"""
+
+# A change is only reported when it is larger than this multiple of the
+# relative spread of the runs of the test, in the baseline or the current run.
+NOISE_MULTIPLIER = 2
+
+
+def environment_fingerprint():
+    """ Return a dictionary describing the machine and the build the
+        benchmark runs on. Results are only comparable when these match.
+    """
+    import torch
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'torch': torch.__version__,
+        'git_version': getattr(torch.version, 'git_version', None),
+        'cuda': torch.version.cuda,
+        'num_threads': torch.get_num_threads(),
+        'OMP_NUM_THREADS': os.environ.get('OMP_NUM_THREADS'),
+        'MKL_NUM_THREADS': os.environ.get('MKL_NUM_THREADS'),
+    }
+
+
+def relative_spread(run_times):
+    """ Return the interquartile range of the per-run times relative to their
+        median, or 0 when there are too few runs to estimate it.
+    """
+    if len(run_times) < 2:
+        return 0.
+    median = np.percentile(run_times, 50)
+    if median <= 0:
+        return 0.
+    return float(np.percentile(run_times, 75) - np.percentile(run_times, 25)) / median
+
+
+def make_result(test_case, mode, run_times_us):
+    """ Return the result of one test as a JSON serializable dictionary.
+        Args:
+            test_case: the test case that ran
+            mode: 'JIT' or 'Eager'
+            run_times_us: the time per iteration of every run, in microseconds
+    """
+    test_config = test_case.test_config
+    return {
+        'framework': test_case.framework,
+        'op': test_case.op_bench.module_name(),
+        'test_name': test_config.test_name,
+        'config': test_config.input_config,
+        'tag': test_config.tag,
+        'mode': mode,
+        'pass': 'Backward' if test_config.run_backward else 'Forward',
+        'median_us': float(np.percentile(run_times_us, 50)),
+        'spread': relative_spread(run_times_us),
+        'run_times_us': [float(t) for t in run_times_us],
+    }
+
+
+def _result_key(result):
+    return (result['framework'], result['test_name'], result['mode'], result['pass'])
+
+
+def save_results(path, results, environment=None):
+    with open(path, 'w') as f:
+        json.dump({
+            'environment': environment if environment is not None else environment_fingerprint(),
+            'results': results,
+        }, f, indent=2, sort_keys=True)
+
+
+def load_results(path):
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def compare_results(baseline, current, threshold):
+    """ Match the results of the current run with those of the baseline and
+        classify the change of their median.
+        Args:
+            baseline: list of results of the baseline run
+            current: list of results of the current run
+            threshold: minimum relative change of the median to be reported,
+                it is raised for noisy tests
+        Return:
+            list of (current result, baseline result or None, relative change,
+            threshold of the test, status), status being one of 'regression',
+            'improvement', 'unchanged' or 'new'
+    """
+    baseline_by_key = {_result_key(r): r for r in baseline}
+    comparisons = []
+    for result in current:
+        base = baseline_by_key.get(_result_key(result))
+        if base is None:
+            comparisons.append((result, None, None, None, 'new'))
+            continue
+        test_threshold = max(threshold, NOISE_MULTIPLIER * max(base['spread'], result['spread']))
+        change = result['median_us'] / base['median_us'] - 1
+        if change > test_threshold:
+            status = 'regression'
+        elif change < -test_threshold:
+            status = 'improvement'
+        else:
+            status = 'unchanged'
+        comparisons.append((result, base, change, test_threshold, status))
+    return comparisons
+
+
+def print_environment_diff(baseline_environment, current_environment):
+    keys = sorted(set(baseline_environment) | set(current_environment))
+    different = [key for key in keys
+                 if baseline_environment.get(key) != current_environment.get(key)]
+    if not different:
+        return
+    print("# Warning: the environment differs from the baseline's")
+    print("# {:20s} {:>30s}      {:>30s}".format("", "baseline", "current"))
+    for key in different:
+        print("# {:20s} {:>30s}  vs  {:>30s}".format(
+            key + ":", str(baseline_environment.get(key, "-")), str(current_environment.get(key, "-"))))
+    print()
+
+
+def print_comparison(comparisons):
+    """ Print the comparisons of compare_results and return the list of
+        regressions.
+    """
+    print("# {:60s} {:>7s} {:>8s} {:>14s} {:>14s} {:>9s} {:>9s}  {}".format(
+        "Name", "Mode", "Pass", "Baseline (us)", "Current (us)", "Change", "Threshold", "Status"))
+    for result, base, change, test_threshold, status in comparisons:
+        if base is None:
+            print("# {:60s} {:>7s} {:>8s} {:>14s} {:>14.3f} {:>9s} {:>9s}  {}".format(
+                result['test_name'], result['mode'], result['pass'], "-",
+                result['median_us'], "-", "-", status))
+            continue
+        print("# {:60s} {:>7s} {:>8s} {:>14.3f} {:>14.3f} {:>+8.1f}% {:>8.1f}%  {}".format(
+            result['test_name'], result['mode'], result['pass'], base['median_us'],
+            result['median_us'], 100 * change, 100 * test_threshold,
+            status.upper() if status == 'regression' else status))
+
+    regressions = [c for c in comparisons if c[4] == 'regression']
+    improvements = [c for c in comparisons if c[4] == 'improvement']
+    print("\n# {} tests compared: {} regressions, {} improvements".format(
+        len(comparisons), len(regressions), len(improvements)))
+    return regressions
+
+
+def compare_files(baseline_path, current, current_environment, threshold):
+    """ Compare the results of the current run with the baseline file and
+        print the report. Return the list of regressions.
+    """
+    baseline = load_results(baseline_path)
+    print("\n# Comparison with baseline {}".format(baseline_path))
+    print_environment_diff(baseline['environment'], current_environment)
+    return print_comparison(compare_results(baseline['results'], current, threshold))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare two result files of the operator microbenchmarks.")
+    parser.add_argument("baseline", help="results of the baseline run (--output_json)")
+    parser.add_argument("current", help="results of the run to compare")
+    parser.add_argument(
+        "--regression_threshold",
+        help="Minimum relative change of the median time reported as a regression or an improvement",
+        type=float,
+        default=0.05)
+    args = parser.parse_args()
+
+    current = load_results(args.current)
+    regressions = compare_files(
+        args.baseline, current['results'], current['environment'], args.regression_threshold)
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@ from __future__ import print_function
 from __future__ import unicode_literals
 
 import argparse
+import sys
 
 import torch
 
@@ -132,6 +133,25 @@ def main():
         help='Run tests on the provided architecture (cpu, cuda)',
         default='None')
 
+    parser.add_argument(
+        "--output_json",
+        help="Save the results, with a fingerprint of the environment, to this JSON file",
+        default=None)
+
+    parser.add_argument(
+        "--baseline_json",
+        help="Compare the results with those saved by --output_json in this file, "
+             "and exit with a non-zero code if any test regressed",
+        default=None)
+
+    parser.add_argument(
+        "--regression_threshold",
+        help="Minimum relative change of the median time reported as a regression or "
+             "an improvement. It is raised for tests whose runs are noisy, so use "
+             "--num_runs of at least 5 when comparing with a baseline",
+        type=float,
+        default=0.05)
+
     args, _ = parser.parse_known_args()
 
     if args.omp_num_threads:
@@ -150,7 +170,9 @@ def main():
     if args.mkl_num_threads:
         benchmark_utils.set_mkl_threads(args.mkl_num_threads)
 
-    benchmark_core.BenchmarkRunner(args).run()
+    regressions = benchmark_core.BenchmarkRunner(args).run()
+    if regressions:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
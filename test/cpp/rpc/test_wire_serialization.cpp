@@ -36,6 +36,34 @@ TEST(WireSerialize, Base) {
   run("more", {torch::randn({5, 5}), torch::rand({10, 10})});
 }
 
+TEST(WireSerialize, AliasReceiveBuffer) {
+  std::vector<at::Tensor> tensors = {
+      torch::randn({5, 5}), torch::arange(7), torch::rand({100, 3})};
+  auto ser = torch::distributed::rpc::wireSerialize({'h', 'i'}, tensors);
+
+  // Copy into a tensor, as the ProcessGroup agent does when receiving, which
+  // gives an allocator-aligned buffer.
+  auto buffer = torch::empty({(int64_t)ser.size()}, {torch::kChar});
+  memcpy(buffer.data_ptr(), ser.data(), ser.size());
+  auto deser = torch::distributed::rpc::wireDeserialize(buffer);
+  EXPECT_EQ(2, deser.first.size());
+  EXPECT_EQ(tensors.size(), deser.second.size());
+
+  const char* begin = static_cast<const char*>(buffer.data_ptr());
+  const char* end = begin + ser.size();
+  for (size_t i = 0; i < tensors.size(); ++i) {
+    EXPECT_TRUE(torch::equal(tensors[i], deser.second[i]));
+    const char* data = static_cast<const char*>(deser.second[i].data_ptr());
+    EXPECT_TRUE(data >= begin && data < end);
+  }
+
+  // The received tensors keep the buffer alive.
+  buffer.reset();
+  for (size_t i = 0; i < tensors.size(); ++i) {
+    EXPECT_TRUE(torch::equal(tensors[i], deser.second[i]));
+  }
+}
+
 TEST(WireSerialize, RecopySparseTensors) {
   // Take a 1K row of a 1M tensors, and make sure we don't send across 1M rows.
   constexpr size_t k1K = 1024;
@@ -1431,6 +1431,100 @@ class _DistTestBase(object):
         group, group_id, rank = self._init_full_group_test()
         self._test_all_gather_helper(group, group_id, rank)
 
+    # HIERARCHICAL ALL REDUCE
+    @unittest.skipIf(BACKEND == "nccl", "Nccl does not support CPU tensors")
+    def test_hierarchical_all_reduce(self):
+        group, group_id, rank = self._init_global_test()
+        world_size = len(group)
+        # Simulate nodes on a single machine by choosing every divisor of the
+        # world size as the number of processes per node.
+        for local_world_size in range(1, world_size + 1):
+            if world_size % local_world_size != 0:
+                continue
+            hgroup = dist.new_hierarchical_group(local_world_size)
+            self.assertEqual(
+                hgroup.leader_rank, rank - rank % local_world_size)
+            for op, expected in [
+                (dist.ReduceOp.SUM, sum(i + 1 for i in group)),
+                (dist.ReduceOp.MAX, world_size),
+                (dist.ReduceOp.MIN, 1),
+            ]:
+                tensor = _build_tensor(3, rank + 1)
+                dist.hierarchical_all_reduce(tensor, hgroup, op=op)
+                self.assertEqual(tensor, _build_tensor(3, expected))
+        self._barrier()
+
+    # OBJECT COLLECTIVES
+    def _object_for_rank(self, rank):
+        # Sizes differ per rank to exercise padding of the pickled payloads.
+        return {"rank": rank, "data": list(range(rank * 10)), "name": "r" * rank}
+
+    @unittest.skipIf(BACKEND == "nccl", "Nccl does not support CPU tensors")
+    def test_all_gather_object(self):
+        group, group_id, rank = self._init_global_test()
+        object_list = [None for _ in group]
+        dist.all_gather_object(object_list, self._object_for_rank(rank), group_id)
+        self.assertEqual(object_list, [self._object_for_rank(i) for i in group])
+        self._barrier()
+
+    @unittest.skipIf(BACKEND == "nccl", "Nccl does not support CPU tensors")
+    def test_gather_object(self):
+        group, group_id, rank = self._init_global_test()
+        for dst in group:
+            object_list = [None for _ in group] if rank == dst else None
+            dist.gather_object(
+                self._object_for_rank(rank), object_list, dst=dst, group=group_id)
+            if rank == dst:
+                self.assertEqual(
+                    object_list, [self._object_for_rank(i) for i in group])
+        self._barrier()
+
+    @unittest.skipIf(BACKEND == "nccl", "Nccl does not support CPU tensors")
+    def test_broadcast_object_list(self):
+        group, group_id, rank = self._init_global_test()
+        for src in group:
+            expected = [self._object_for_rank(src), None, ("tuple", 1.5)]
+            if rank == src:
+                object_list = list(expected)
+            else:
+                object_list = [None, None, None]
+            dist.broadcast_object_list(object_list, src=src, group=group_id)
+            self.assertEqual(object_list, expected)
+        self._barrier()
+
+    @unittest.skipIf(BACKEND == "nccl", "Nccl does not support CPU tensors")
+    def test_all_reduce_observers(self):
+        group, group_id, rank = self._init_global_test()
+
+        def prepared_model():
+            torch.manual_seed(0)
+            model = nn.Sequential(
+                torch.quantization.QuantStub(), nn.Linear(5, 5), torch.quantization.DeQuantStub())
+            model.qconfig = torch.quantization.default_qconfig
+            return torch.quantization.prepare(model)
+
+        def calibration_shard(shard_rank):
+            # Ranges differ per rank, so every rank contributes to the result.
+            return torch.arange(20, dtype=torch.float).view(4, 5) * (shard_rank - 1) + shard_rank
+
+        model = prepared_model()
+        model(calibration_shard(rank))
+        torch.quantization.all_reduce_observers(model, group_id)
+
+        # Same as calibrating a single model on the union of the shards
+        expected = prepared_model()
+        for shard_rank in group:
+            expected(calibration_shard(shard_rank))
+        observers, expected_observers = {}, {}
+        torch.quantization.get_observer_dict(model, observers)
+        torch.quantization.get_observer_dict(expected, expected_observers)
+        self.assertEqual(set(observers.keys()), set(expected_observers.keys()))
+        for name, obs in observers.items():
+            self.assertEqual(obs.min_val, expected_observers[name].min_val)
+            self.assertEqual(obs.max_val, expected_observers[name].max_val)
+            self.assertEqual(obs.calculate_qparams(), expected_observers[name].calculate_qparams())
+        self._barrier()
+
     def _run_all_gather_coalesced_and_verify(
         self, output_tensor_lists, input_tensors, expected_tensors, group_id
     ):
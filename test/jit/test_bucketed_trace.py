@@ -0,0 +1,100 @@
+import io
+
+import torch
+import torch.nn as nn
+from torch.testing._internal.jit_utils import JitTestCase
+
+if __name__ == '__main__':
+    raise RuntimeError("This test file is not meant to be run directly, use:\n\n"
+                       "\tpython test/test_jit.py TESTNAME\n\n"
+                       "instead.")
+
+
+class ShapeDependent(nn.Module):
+    def __init__(self):
+        super(ShapeDependent, self).__init__()
+        self.linear = nn.Linear(4, 4)
+
+    def forward(self, x):
+        # Data-dependent control flow on the sequence length.
+        if x.size(1) > 8:
+            return self.linear(x).sum(1)
+        return self.linear(x).mean(1)
+
+
+class TestBucketedTrace(JitTestCase):
+    def test_dispatch(self):
+        model = ShapeDependent()
+        bucketed = torch.jit.trace_bucketed(model, boundaries=[8, 16], check_trace=False)
+        self.assertEqual(bucketed.traced_buckets(), [])
+
+        short = torch.rand(2, 5, 4)
+        long = torch.rand(2, 12, 4)
+        self.assertEqual(bucketed(short), model(short))
+        self.assertEqual(bucketed(long), model(long))
+        self.assertEqual(bucketed.traced_buckets(), [8, 16])
+        # Calls in a traced bucket reuse its graph.
+        graph = bucketed.graph_for_bucket(8)
+        other_short = torch.rand(2, 7, 4)
+        self.assertEqual(bucketed(other_short), model(other_short))
+        self.assertTrue(bucketed.graph_for_bucket(8) is graph)
+        self.assertEqual(bucketed.traced_buckets(), [16, 8])
+
+        with self.assertRaisesRegex(RuntimeError, "larger than the largest bucket"):
+            bucketed(torch.rand(2, 17, 4))
+
+    def test_pad_and_eviction(self):
+        model = ShapeDependent()
+        bucketed = torch.jit.trace_bucketed(
+            model, example_inputs={4: torch.rand(1, 4, 4), 16: torch.rand(1, 16, 4)},
+            pad=True, max_cached=2)
+        self.assertEqual(bucketed.boundaries, [4, 16])
+        self.assertEqual(bucketed.traced_buckets(), [4, 16])
+
+        x = torch.rand(3, 10, 4)
+        padded = torch.cat([x, torch.zeros(3, 6, 4)], 1)
+        self.assertEqual(bucketed(x), model(padded))
+
+        bucketed = torch.jit.trace_bucketed(model, boundaries=[2, 4, 8], pad=True, max_cached=2)
+        for length in (2, 4, 8):
+            bucketed(torch.rand(1, length, 4))
+        self.assertEqual(bucketed.traced_buckets(), [4, 8])
+
+    def test_save_load(self):
+        model = ShapeDependent()
+        bucketed = torch.jit.trace_bucketed(model, boundaries=[8, 16], pad=True, pad_value=1.0)
+        short = torch.rand(2, 5, 4)
+        long = torch.rand(2, 12, 4)
+        expected = (bucketed(short), bucketed(long))
+
+        buffer = io.BytesIO()
+        bucketed.save(buffer)
+        buffer.seek(0)
+        loaded = torch.jit.load_bucketed(buffer)
+        self.assertEqual(loaded.boundaries, [8, 16])
+        self.assertEqual(loaded.traced_buckets(), [8, 16])
+        self.assertTrue(loaded.pad)
+        self.assertEqual((loaded(short), loaded(long)), expected)
+
+        buffer = io.BytesIO()
+        torch.jit.trace_bucketed(model, boundaries=[8, 16]).save(buffer)
+        buffer.seek(0)
+        with self.assertRaisesRegex(RuntimeError, "original module is not available"):
+            torch.jit.load_bucketed(buffer)(short)
+
+    def test_save_load_function(self):
+        def fn(x):
+            return x.sum(1) if x.size(1) > 8 else x.mean(1)
+
+        bucketed = torch.jit.trace_bucketed(fn, boundaries=[8, 16], pad=True)
+        short = torch.rand(2, 5, 4)
+        long = torch.rand(2, 12, 4)
+        expected = (bucketed(short), bucketed(long))
+        self.assertEqual(expected[1], fn(torch.cat([long, torch.zeros(2, 4, 4)], 1)))
+
+        buffer = io.BytesIO()
+        bucketed.save(buffer)
+        buffer.seek(0)
+        loaded = torch.jit.load_bucketed(buffer)
+        self.assertEqual(loaded.traced_buckets(), [8, 16])
+        self.assertEqual((loaded(short), loaded(long)), expected)
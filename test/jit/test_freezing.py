@@ -833,3 +833,53 @@ class TestFreezing(JitTestCase):
         out3 = smod(inp)
         self.assertNotEqual(out1, out2)
         self.assertEqual(out2, out3)
+
+    def test_freeze_api(self):
+        class Net(nn.Module):
+            def __init__(self):
+                super(Net, self).__init__()
+                self.conv = nn.Conv2d(3, 4, 3)
+                self.bn = nn.BatchNorm2d(4)
+                self.dropout = nn.Dropout(0.5)
+                self.fc = nn.Linear(4, 6)
+
+            def forward(self, x):
+                x = self.dropout(self.bn(self.conv(x)))
+                return self.fc(x)
+
+        with self.assertRaisesRegex(RuntimeError, "Freezing expects a ScriptModule"):
+            torch.jit.freeze(Net())
+
+        net = Net()
+        net.bn.running_mean.uniform_()
+        net.bn.running_var.uniform_(1, 2)
+        smod = torch.jit.script(net)
+        self.assertTrue(smod.training)
+        fmod = torch.jit.freeze(smod)
+        # The input module is left in training mode and unchanged.
+        self.assertTrue(smod.training)
+        self.assertTrue(smod._c.hasattr('bn'))
+        self.assertFalse(fmod._c.hasattr('conv'))
+        self.assertFalse(fmod._c.hasattr('fc'))
+        FileCheck().check_not('GetAttr[name=') \
+                   .check_not('aten::batch_norm') \
+                   .check('aten::linear') \
+                   .check_not('aten::addmm') \
+                   .run(fmod.graph)
+
+        inp = torch.rand(2, 3, 8, 6)
+        smod.eval()
+        self.assertEqual(fmod(inp), smod(inp))
+
+        buffer = io.BytesIO()
+        torch.jit.save(fmod, buffer)
+        buffer.seek(0)
+        loaded = torch.jit.load(buffer)
+        self.assertEqual(loaded(inp), smod(inp))
+
+        # Without optimizations batch norm is kept as a separate op.
+        fmod_unoptimized = torch.jit.freeze(smod, optimize=False)
+        FileCheck().check_not('GetAttr[name=') \
+                   .check('aten::batch_norm') \
+                   .run(fmod_unoptimized.graph)
+        self.assertEqual(fmod_unoptimized(inp), smod(inp))
@@ -0,0 +1,137 @@
+import gc
+import io
+import os
+import shutil
+import tempfile
+import warnings
+
+import torch
+import torch.nn as nn
+from torch.testing._internal.jit_utils import JitTestCase
+
+if __name__ == '__main__':
+    raise RuntimeError("This test file is not meant to be run directly, use:\n\n"
+                       "\tpython test/test_jit.py TESTNAME\n\n"
+                       "instead.")
+
+
+class Block(nn.Module):
+    def __init__(self, scale):
+        super(Block, self).__init__()
+        self.linear = nn.Linear(4, 4)
+        self.scale = scale
+
+    def forward(self, x):
+        return torch.relu(self.linear(x)) * self.scale
+
+
+class Net(nn.Module):
+    def __init__(self, scale=2.0):
+        super(Net, self).__init__()
+        self.blocks = nn.ModuleList([Block(scale), Block(scale)])
+        self.register_buffer('offset', torch.ones(4))
+
+    def forward(self, x):
+        for block in self.blocks:
+            x = block(x)
+        return x + self.offset
+
+
+class TestScriptCache(JitTestCase):
+    def setUp(self):
+        super(TestScriptCache, self).setUp()
+        self.cache_dir = tempfile.mkdtemp()
+        torch.jit.enable_script_cache(self.cache_dir)
+
+    def tearDown(self):
+        torch.jit.disable_script_cache()
+        shutil.rmtree(self.cache_dir)
+        super(TestScriptCache, self).tearDown()
+
+    def _entries(self):
+        return sorted(name for name in os.listdir(self.cache_dir) if name.endswith('.pt'))
+
+    def test_cache_hit(self):
+        x = torch.rand(3, 4)
+        first = Net()
+        scripted = torch.jit.script(first)
+        entries = self._entries()
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(scripted(x), first(x))
+
+        # A new instance with different weights loads the cached code but uses
+        # its own parameters and buffers.
+        second = Net()
+        second.offset.fill_(3)
+        cached = torch.jit.script(second)
+        self.assertEqual(self._entries(), entries)
+        self.assertEqual(cached(x), second(x))
+        self.assertTrue(cached.blocks[0].linear.weight is second.blocks[0].linear.weight)
+
+        # Cached modules behave like freshly scripted ones.
+        cached.blocks[1].linear.weight.data.zero_()
+        self.assertEqual(cached(x), second(x))
+        self.assertEqual(cached.state_dict().keys(), scripted.state_dict().keys())
+
+    def test_cache_hit_outlives_entry(self):
+        torch.jit.script(Net())
+        net = Net()
+        cached = torch.jit.script(net)
+        # Nothing else references the module loaded from the entry anymore.
+        gc.collect()
+        x = torch.rand(3, 4)
+        self.assertEqual(cached(x), net(x))
+        self.assertEqual(cached.blocks[0](x), net.blocks[0](x))
+        self.assertIn('offset', cached.code)
+        buffer = io.BytesIO()
+        torch.jit.save(cached, buffer)
+        buffer.seek(0)
+        self.assertEqual(torch.jit.load(buffer)(x), net(x))
+
+    def test_cache_miss_on_changed_attributes(self):
+        torch.jit.script(Net(scale=2.0))
+        torch.jit.script(Net(scale=3.0))
+        self.assertEqual(len(self._entries()), 2)
+        x = torch.rand(3, 4)
+        net = Net(scale=3.0)
+        self.assertEqual(torch.jit.script(net)(x), net(x))
+        self.assertEqual(len(self._entries()), 2)
+
+    def test_invalid_entry(self):
+        torch.jit.script(Net())
+        entry, = self._entries()
+        with open(os.path.join(self.cache_dir, entry), 'wb') as f:
+            f.write(b'not a module')
+        net = Net()
+        with self.assertWarnsRegex(UserWarning, "Ignoring invalid TorchScript cache entry"):
+            scripted = torch.jit.script(net)
+        x = torch.rand(3, 4)
+        self.assertEqual(scripted(x), net(x))
+        # The entry was replaced by a valid one.
+        self.assertEqual(self._entries(), [entry])
+
+    def test_eviction(self):
+        torch.jit.script(Net(scale=1.0))
+        size = os.path.getsize(os.path.join(self.cache_dir, self._entries()[0]))
+        torch.jit.enable_script_cache(self.cache_dir, max_size=size * 2 + size // 2)
+        torch.jit.script(Net(scale=2.0))
+        torch.jit.script(Net(scale=3.0))
+        self.assertEqual(len(self._entries()), 2)
+
+    def test_scripted_submodule(self):
+        net = Net()
+        net.blocks[0] = torch.jit.script(Block(2.0))
+        entries = self._entries()
+        # The hierarchy is compiled without the cache, silently.
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            scripted = torch.jit.script(net)
+        self.assertEqual(caught, [])
+        self.assertEqual(self._entries(), entries)
+        x = torch.rand(3, 4)
+        self.assertEqual(scripted(x), net(x))
+
+    def test_disabled(self):
+        torch.jit.disable_script_cache()
+        torch.jit.script(Net())
+        self.assertEqual(self._entries(), [])
@@ -547,6 +547,28 @@ class TestUtilityFuns(TestCase):
         ort_outs = ort_sess.run(None, ort_inputs)
         assert x != ort_outs[0]
 
+    def test_symbolic_registration_once_per_opset(self):
+        import torch.onnx.symbolic_registry as sym_registry
+
+        model = torch.nn.Sequential(*[torch.nn.Linear(4, 4) for _ in range(5)])
+        x = torch.randn(2, 4)
+        torch.onnx.export(model, x, io.BytesIO(), opset_version=self.opset_version)
+        self.assertIn(('', self.opset_version), sym_registry._registered_opset_modules)
+
+        calls = []
+        register_ops_in_version = sym_registry.register_ops_in_version
+
+        def counting_register_ops_in_version(*args):
+            calls.append(args)
+            return register_ops_in_version(*args)
+
+        sym_registry.register_ops_in_version = counting_register_ops_in_version
+        try:
+            torch.onnx.export(model, x, io.BytesIO(), opset_version=self.opset_version)
+        finally:
+            sym_registry.register_ops_in_version = register_ops_in_version
+        self.assertEqual(calls, [])
+
 
 # opset 10 tests
 TestUtilityFuns_opset10 = type(str("TestUtilityFuns_opset10"),
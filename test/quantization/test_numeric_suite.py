@@ -16,6 +16,10 @@ from torch.quantization._numeric_suite import (
     compare_model_outputs,
     compare_model_stub,
     compare_weights,
+    compute_error,
+    get_layer_sensitivity,
+    plan_mixed_precision,
+    quantize_layers,
 )
 from torch.testing._internal.common_quantization import (
     AnnotatedConvBnReLUModel,
@@ -82,6 +86,23 @@ class ModelWithFunctionals(torch.nn.Module):
         return w
 
 
+class ModelForMixedPrecision(torch.nn.Module):
+    def __init__(self):
+        super(ModelForMixedPrecision, self).__init__()
+        self.quant = QuantStub()
+        self.conv1 = torch.nn.Conv2d(3, 4, 3).to(dtype=torch.float)
+        self.conv2 = torch.nn.Conv2d(4, 4, 3).to(dtype=torch.float)
+        self.relu = nn.ReLU()
+        self.fc = torch.nn.Linear(4 * 6 * 6, 5).to(dtype=torch.float)
+        self.dequant = DeQuantStub()
+
+    def forward(self, x):
+        x = self.quant(x)
+        x = self.relu(self.conv2(self.conv1(x)))
+        x = self.fc(x.reshape(x.size(0), -1))
+        return self.dequant(x)
+
+
 class TestEagerModeNumericSuite(QuantizationTestCase):
     def test_compare_weights(self):
         r"""Compare the weights of float and quantized conv layer
@@ -219,3 +240,39 @@ class TestEagerModeNumericSuite(QuantizationTestCase):
                 )
                 for k, v in act_compare_dict.items():
                     self.assertTrue(v["float"].shape == v["quantized"].shape)
+
+    def test_mixed_precision_planner(self):
+        r"""Rank the layers by sensitivity and check that the planned
+        qconfig_dict stays within the error budget
+        """
+        for qengine in supported_qengines:
+            with override_quantized_engine(qengine):
+                model = ModelForMixedPrecision().eval()
+                data = [x for x, _ in self.img_data]
+                sensitivity = get_layer_sensitivity(model, data)
+                self.assertEqual(sorted(c for c, _ in sensitivity), ["conv1", "conv2", "fc"])
+                errors = [error for _, error in sensitivity]
+                self.assertEqual(errors, sorted(errors, reverse=True))
+
+                # Quantizing a single layer only swaps that layer.
+                q_model = quantize_layers(model, {"conv2": default_qconfig}, data)
+                self.assertEqual(type(q_model.conv1), nn.Conv2d)
+                self.assertEqual(type(q_model.conv2.module), nnq.Conv2d)
+                self.assertEqual(type(q_model.quant), nn.Identity)
+                self.assertEqual(q_model(data[0]).shape, model(data[0]).shape)
+
+                qconfig_dict = plan_mixed_precision(
+                    model, data, float("inf"), sensitivity=sensitivity)
+                self.assertEqual(sorted(qconfig_dict), ["conv1", "conv2", "fc"])
+                self.assertEqual(
+                    plan_mixed_precision(model, data, 0.0, sensitivity=sensitivity), {})
+
+                budget = sensitivity[-1][1]
+                qconfig_dict = plan_mixed_precision(
+                    model, data, budget, sensitivity=sensitivity)
+                self.assertIn(sensitivity[-1][0], qconfig_dict)
+                q_model = quantize_layers(model, qconfig_dict, data)
+                with torch.no_grad():
+                    ref = torch.cat([model(x) for x in data])
+                    out = torch.cat([q_model(x) for x in data])
+                self.assertLessEqual(compute_error(ref, out), budget + 1e-6)
@@ -13,8 +13,12 @@ from torch.quantization import (
     prepare_qat,
     quantize_qat,
     fuse_modules,
+    find_fusable_modules,
+    fuse_modules_by_tracing,
     quantize_dynamic,
     QuantWrapper,
+    QuantStub,
+    DeQuantStub,
     QConfig,
     default_qconfig,
     default_per_channel_qconfig,
@@ -23,6 +27,8 @@ from torch.quantization import (
     per_channel_dynamic_qconfig,
     default_eval_fn,
     float16_dynamic_qconfig,
+    embedding_8bit_dynamic_qconfig,
+    embedding_4bit_dynamic_qconfig,
     default_observer,
     default_weight_observer,
     default_per_channel_weight_observer,
@@ -856,6 +862,213 @@ class TestPostTrainingDynamic(QuantizationTestCase):
 
                 y, (h, c) = cell_dq(x, (h, c))
 
+    def test_quantized_gru(self):
+        r"""Test execution and scripting for dynamic quantized GRU modules on int8 and fp16
+        """
+        d_in, d_hid = 2, 2
+        cell = torch.nn.GRU(d_in, d_hid).float()
+        # As in test_quantized_rnn, the weights and inputs have a range of
+        # exactly 255, so that the quantized GEMMs have no quantization error.
+        vals = [[100, -155],
+                [100, -155],
+                [-155, 100],
+                [-155, 100],
+                [100, -155],
+                [-155, 100]]
+        cell.weight_ih_l0 = torch.nn.Parameter(torch.tensor(vals, dtype=torch.float), requires_grad=False)
+        cell.weight_hh_l0 = torch.nn.Parameter(torch.tensor(vals, dtype=torch.float), requires_grad=False)
+        model = torch.nn.Sequential(cell).eval()
+
+        niter = 10
+        x = torch.tensor([[100, -155],
+                          [-155, 100],
+                          [100, -155]], dtype=torch.float).unsqueeze(0).repeat(niter, 1, 1)
+        hx = torch.tensor([[-155, 100],
+                           [-155, 155],
+                           [100, -155]], dtype=torch.float).unsqueeze(0)
+        ref_out, ref_hid = cell(x, hx)
+
+        for qengine in supported_qengines:
+            with override_quantized_engine(qengine):
+                for dtype in [torch.qint8, torch.float16]:
+                    if dtype == torch.float16 and qengine == "qnnpack":
+                        # fp16 dynamic quant is not supported for qnnpack
+                        continue
+                    model_quantized = quantize_dynamic(model=model, dtype=dtype)
+                    self.assertTrue('DynamicQuantizedGRU' in str(model_quantized))
+                    cell_quantized = model_quantized[0]
+                    self.assertEqual(type(cell_quantized), torch.nn.quantized.dynamic.GRU)
+
+                    output_quantized, hid_quantized = cell_quantized(x, hx)
+                    torch.testing.assert_allclose(output_quantized, ref_out)
+                    torch.testing.assert_allclose(hid_quantized, ref_hid)
+
+                    packed_input = torch.nn.utils.rnn.pack_padded_sequence(x, torch.tensor([10, 5, 2]))
+                    ref_out_packed, ref_hid_packed = cell(packed_input, hx)
+                    output_packed, hid_packed = cell_quantized(packed_input, hx)
+                    torch.testing.assert_allclose(output_packed.data, ref_out_packed.data)
+                    torch.testing.assert_allclose(hid_packed, ref_hid_packed)
+
+                    if dtype == torch.qint8:
+                        class ScriptWrapper(torch.nn.Module):
+                            def __init__(self, cell):
+                                super(ScriptWrapper, self).__init__()
+                                self.cell = cell
+
+                            def forward(self, x, hx):
+                                # type: (torch.Tensor, torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor]
+                                return self.cell(x, hx)
+
+                        cell_script = torch.jit.script(ScriptWrapper(cell_quantized))
+                        out_script, hid_script = cell_script(x, hx)
+                        torch.testing.assert_allclose(out_script, ref_out)
+
+    def test_quantized_rnn_cell(self):
+        r"""Test execution, serialization and scripting for dynamic quantized
+        LSTMCell, GRUCell and RNNCell, and consistency of the LSTM cell with the
+        dynamic quantized LSTM
+        """
+        d_in, d_hid = 2, 2
+        vals = [[100, -155],
+                [100, -155],
+                [-155, 100],
+                [-155, 100],
+                [100, -155],
+                [-155, 100],
+                [-155, 100],
+                [100, -155]]
+        x = torch.tensor([[100, -155],
+                          [-155, 100],
+                          [100, -155]], dtype=torch.float)
+        h0 = torch.tensor([[-155, 100],
+                           [-155, 155],
+                           [100, -155]], dtype=torch.float)
+
+        for qengine in supported_qengines:
+            with override_quantized_engine(qengine):
+                for cell_cls, num_chunks in [(torch.nn.LSTMCell, 4), (torch.nn.GRUCell, 3), (torch.nn.RNNCell, 1)]:
+                    cell = cell_cls(d_in, d_hid).float()
+                    cell.weight_ih = torch.nn.Parameter(
+                        torch.tensor(vals[:d_hid * num_chunks], dtype=torch.float), requires_grad=False)
+                    cell.weight_hh = torch.nn.Parameter(
+                        torch.tensor(vals[:d_hid * num_chunks], dtype=torch.float), requires_grad=False)
+                    hiddens = (h0, h0) if cell_cls == torch.nn.LSTMCell else h0
+                    ref = cell(x, hiddens)
+
+                    model_quantized = quantize_dynamic(torch.nn.Sequential(cell).eval())
+                    cell_quantized = model_quantized[0]
+                    self.assertTrue('DynamicQuantized' + cell_cls.__name__ in str(model_quantized))
+                    out = cell_quantized(x, hiddens)
+                    torch.testing.assert_allclose(out, ref)
+
+                    cell_script = torch.jit.script(cell_quantized)
+                    torch.testing.assert_allclose(cell_script(x, hiddens), ref)
+
+                    # Serialization through state_dict
+                    b = io.BytesIO()
+                    torch.save(cell_quantized.state_dict(), b)
+                    b.seek(0)
+                    loaded = type(cell_quantized)(d_in, d_hid)
+                    loaded.load_state_dict(torch.load(b))
+                    torch.testing.assert_allclose(loaded(x, hiddens), out)
+
+                # Stepping the LSTM cell over a sequence closely matches the
+                # dynamic quantized LSTM with the same weights. They differ only
+                # in the input quantization, which the LSTM does over the whole
+                # sequence at once.
+                lstm = torch.nn.LSTM(d_in, d_hid).float()
+                lstm_cell = torch.nn.LSTMCell(d_in, d_hid).float()
+                lstm_cell.weight_ih = lstm.weight_ih_l0
+                lstm_cell.weight_hh = lstm.weight_hh_l0
+                lstm_cell.bias_ih = lstm.bias_ih_l0
+                lstm_cell.bias_hh = lstm.bias_hh_l0
+                quantized = quantize_dynamic(torch.nn.Sequential(lstm, lstm_cell).eval())
+                seq = torch.randn(5, 3, d_in)
+                out_lstm, _ = quantized[0](seq)
+                hx = (torch.zeros(3, d_hid), torch.zeros(3, d_hid))
+                for i in range(seq.size(0)):
+                    hx = quantized[1](seq[i], hx)
+                    self.assertEqual(hx[0], out_lstm[i], atol=0.05, rtol=0)
+
+    def test_rnn_static_quantization(self):
+        r"""Static quantization leaves the RNNs and RNN cells that are only
+        quantized dynamically alone
+        """
+        class RNNModel(torch.nn.Module):
+            def __init__(self):
+                super(RNNModel, self).__init__()
+                self.quant = QuantStub()
+                self.fc = torch.nn.Linear(4, 4)
+                self.dequant = DeQuantStub()
+                self.gru = torch.nn.GRU(4, 4)
+                self.cell = torch.nn.LSTMCell(4, 4)
+
+            def forward(self, x):
+                x = self.dequant(self.fc(self.quant(x)))
+                x, _ = self.gru(x)
+                hx, _ = self.cell(x[0])
+                return hx
+
+        x = torch.randn(5, 3, 4)
+        for qengine in supported_qengines:
+            with override_quantized_engine(qengine):
+                model = RNNModel().eval()
+                model.qconfig = torch.quantization.get_default_qconfig(qengine)
+                model = prepare(model)
+                self.assertFalse(hasattr(model.gru, 'activation_post_process'))
+                self.assertFalse(hasattr(model.cell, 'activation_post_process'))
+                model(x)
+                model = convert(model)
+                self.assertEqual(type(model.fc), nnq.Linear)
+                self.assertEqual(type(model.gru), torch.nn.GRU)
+                self.assertEqual(type(model.cell), torch.nn.LSTMCell)
+                model(x)
+
+    def test_embedding(self):
+        r"""Dynamic quantization swaps Embedding and EmbeddingBag for their
+        row-wise quantized versions when they are listed in qconfig_spec
+        """
+        class EmbeddingModel(torch.nn.Module):
+            def __init__(self):
+                super(EmbeddingModel, self).__init__()
+                self.emb = torch.nn.Embedding(20, 8)
+                self.emb_bag = torch.nn.EmbeddingBag(20, 8, mode='mean')
+                self.fc = torch.nn.Linear(8, 4)
+
+            def forward(self, indices, offsets):
+                return self.fc(self.emb(indices).sum(0) + self.emb_bag(indices, offsets))
+
+        indices = torch.randint(0, 20, (6,), dtype=torch.long)
+        offsets = torch.tensor([0, 1, 2, 3, 4, 5], dtype=torch.long)
+        for qconfig, bit_width in [(embedding_8bit_dynamic_qconfig, 8),
+                                   (embedding_4bit_dynamic_qconfig, 4)]:
+            model = EmbeddingModel().eval()
+            quantized = quantize_dynamic(model, {nn.Embedding: qconfig, nn.EmbeddingBag: qconfig})
+            self.assertEqual(type(quantized.emb), nnq.Embedding)
+            self.assertEqual(type(quantized.emb_bag), nnq.EmbeddingBag)
+            self.assertEqual(type(quantized.fc), torch.nn.Linear)
+            self.assertEqual(quantized.emb.bit_width, bit_width)
+            self.assertEqual(quantized.emb_bag.bit_width, bit_width)
+            self.assertEqual(quantized(indices, offsets), model(indices, offsets),
+                             atol=0.5 if bit_width == 4 else 0.05, rtol=0)
+
+        # Embeddings are not quantized unless requested
+        model = quantize_dynamic(EmbeddingModel().eval())
+        self.assertEqual(type(model.emb), torch.nn.Embedding)
+        self.assertEqual(type(model.emb_bag), torch.nn.EmbeddingBag)
+
+        # Only 8-bit and 4-bit row-wise quantization is supported
+        with self.assertRaisesRegex(ValueError, "8-bit and 4-bit row-wise"):
+            quantize_dynamic(EmbeddingModel().eval(), {nn.Embedding: float16_dynamic_qconfig})
+
+        # Embeddings are only quantized dynamically
+        model = EmbeddingModel().eval()
+        model.qconfig = default_qconfig
+        model = prepare(model)
+        self.assertFalse(hasattr(model.emb, 'qconfig'))
+        self.assertFalse(hasattr(model.emb_bag, 'qconfig'))
+        self.assertTrue(hasattr(model.fc, 'activation_post_process'))
+
 
 class TestQuantizationAwareTraining(QuantizationTestCase):
     def test_manual(self):
@@ -1473,6 +1686,60 @@ class TestFusion(QuantizationTestCase):
         self.assertEqual(type(model.classifier[0]), nniq.LinearReLU)
         self.assertEqual(type(model.classifier[1]), nn.Identity)
 
+    def test_fuse_modules_by_tracing(self):
+        model = ModelWithSequentialFusion().eval()
+        modules_to_fuse = find_fusable_modules(model, self.img_data[0][0])
+        self.assertEqual(modules_to_fuse,
+                         [['conv1', 'relu1'],
+                          ['features.0.0', 'features.0.1', 'features.0.2'],
+                          ['features.1.0', 'features.1.1', 'features.1.2'],
+                          ['features.2.0', 'features.2.1', 'features.2.2'],
+                          ['classifier.0', 'classifier.1']])
+        fused = fuse_modules_by_tracing(model, self.img_data[0][0])
+        self.checkModelWithSequentialFused(fused)
+        self.assertEqual(type(model.conv1), nn.Conv2d)
+        self.assertEqual(fused(self.img_data[0][0]), model(self.img_data[0][0]))
+
+    def test_find_fusable_modules_respects_dataflow(self):
+        class ResidualBlock(nn.Module):
+            def __init__(self):
+                super(ResidualBlock, self).__init__()
+                # Registered in a different order than they are called.
+                self.relu = nn.ReLU()
+                self.bn2 = nn.BatchNorm2d(3)
+                self.conv2 = nn.Conv2d(3, 3, 1)
+                self.conv1 = nn.Conv2d(3, 3, 1)
+                self.bn1 = nn.BatchNorm2d(3)
+                self.linear = nn.Linear(3, 3)
+                self.relu2 = nn.ReLU()
+
+            def forward(self, x):
+                out = self.relu(self.bn1(self.conv1(x)))
+                # The output of bn2 is also used by the addition, and relu is
+                # called twice.
+                out = self.bn2(self.conv2(out))
+                y = self.relu(out + x)
+                return self.relu2(self.linear(y.mean([2, 3]))), out
+
+        model = ResidualBlock().eval()
+        x = torch.randn(2, 3, 5, 5)
+        self.assertEqual(find_fusable_modules(model, x),
+                         [['conv1', 'bn1'], ['conv2', 'bn2'], ['linear', 'relu2']])
+        fused = fuse_modules_by_tracing(model, x)
+        self.assertEqual(type(fused.relu), nn.ReLU)
+        for fused_out, ref_out in zip(fused(x), model(x)):
+            self.assertEqual(fused_out, ref_out)
+
+    def checkModelWithSequentialFused(self, model):
+        self.assertEqual(type(model.conv1), nni.ConvReLU2d)
+        self.assertEqual(type(model.relu1), nn.Identity)
+        for i in range(3):
+            self.assertEqual(type(model.features[i][0]), nni.ConvReLU2d)
+            self.assertEqual(type(model.features[i][1]), nn.Identity)
+            self.assertEqual(type(model.features[i][2]), nn.Identity)
+        self.assertEqual(type(model.classifier[0]), nni.LinearReLU)
+        self.assertEqual(type(model.classifier[1]), nn.Identity)
+
     def test_fusion_conv_with_bias(self):
         for qengine in supported_qengines:
             with override_quantized_engine(qengine):
@@ -563,6 +563,52 @@ class TestStaticQuantizedModule(QuantizationTestCase):
                          .format(qY_ref, qY))
 
 
+    @given(num_embeddings=st.integers(10, 50),
+           embedding_dim=st.integers(1, 16).map(lambda x: 2 * x),
+           bit_width=st.sampled_from([8, 4]),
+           mode=st.sampled_from(['sum', 'mean']))
+    def test_embedding_bag_api(self, num_embeddings, embedding_dim, bit_width, mode):
+        """test API functionality for nn.quantized.EmbeddingBag and nn.quantized.Embedding"""
+        float_mod = torch.nn.EmbeddingBag(num_embeddings, embedding_dim, mode=mode)
+        float_mod.qconfig = torch.quantization.embedding_8bit_dynamic_qconfig if bit_width == 8 \
+            else torch.quantization.embedding_4bit_dynamic_qconfig
+        qembedding_bag = nnq.EmbeddingBag.from_float(float_mod)
+        self.assertEqual(qembedding_bag.bit_width, bit_width)
+        self.assertEqual(qembedding_bag.weight(), float_mod.weight.detach(),
+                         atol=float_mod.weight.abs().max().item() * 2 ** (2 - bit_width), rtol=0)
+
+        indices = torch.randint(0, num_embeddings, (12,), dtype=torch.long)
+        offsets = torch.tensor([0, 5, 5, 9], dtype=torch.long)
+        out = qembedding_bag(indices, offsets)
+        ref = torch.nn.functional.embedding_bag(indices, qembedding_bag.weight(), offsets, mode=mode)
+        self.assertEqual(out, ref, atol=1e-4, rtol=1e-4)
+
+        # 2D inputs are bags of fixed length
+        out_2d = qembedding_bag(indices.reshape(3, 4))
+        ref_2d = qembedding_bag(indices, torch.tensor([0, 4, 8], dtype=torch.long))
+        self.assertEqual(out_2d, ref_2d)
+
+        # Serialization through state_dict
+        b = io.BytesIO()
+        torch.save(qembedding_bag.state_dict(), b)
+        b.seek(0)
+        loaded = nnq.EmbeddingBag(num_embeddings, embedding_dim, mode=mode, bit_width=bit_width)
+        loaded.load_state_dict(torch.load(b))
+        self.assertEqual(loaded(indices, offsets), out)
+
+        scripted = torch.jit.script(qembedding_bag)
+        self.assertEqual(scripted(indices, offsets), out)
+
+        # Embedding looks up every index on its own
+        float_embedding = torch.nn.Embedding(num_embeddings, embedding_dim)
+        float_embedding.qconfig = float_mod.qconfig
+        qembedding = nnq.Embedding.from_float(float_embedding)
+        out = qembedding(indices.reshape(3, 4))
+        self.assertEqual(out.shape, (3, 4, embedding_dim))
+        self.assertEqual(out, qembedding.weight()[indices].reshape(3, 4, embedding_dim),
+                         atol=1e-5, rtol=0)
+
+
 class TestDynamicQuantizedModule(QuantizationTestCase):
     @skipIfNoFBGEMM
     @given(
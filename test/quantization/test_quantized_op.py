@@ -2703,6 +2703,73 @@ class TestQuantizedConv(unittest.TestCase):
                 channelwise)
 
 
+class TestQuantizedEmbeddingOps(TestCase):
+    def _get_ops(self, bit_width):
+        if bit_width == 8:
+            return (torch.ops.quantized.embedding_bag_byte_prepack,
+                    torch.ops.quantized.embedding_bag_byte_unpack,
+                    torch.ops.quantized.embedding_bag_byte)
+        return (torch.ops.quantized.embedding_bag_4bit_prepack,
+                torch.ops.quantized.embedding_bag_4bit_unpack,
+                torch.ops.quantized.embedding_bag_4bit)
+
+    @given(num_embeddings=st.integers(10, 100),
+           embedding_dim=st.integers(1, 32).map(lambda x: 2 * x),
+           bit_width=st.sampled_from([8, 4]))
+    def test_embedding_bag_prepack_unpack(self, num_embeddings, embedding_dim, bit_width):
+        prepack, unpack, _ = self._get_ops(bit_width)
+        weights = torch.randn(num_embeddings, embedding_dim)
+        packed = prepack(weights)
+        self.assertEqual(packed.dtype, torch.uint8)
+        # Quantized values followed by a float (8-bit) or half (4-bit) scale and bias
+        expected_cols = embedding_dim + 8 if bit_width == 8 else embedding_dim // 2 + 4
+        self.assertEqual(packed.shape, (num_embeddings, expected_cols))
+        unpacked = unpack(packed)
+        self.assertEqual(unpacked.shape, weights.shape)
+        # Every value is within one quantization step of its row
+        row_min = weights.min(dim=1, keepdim=True)[0]
+        row_max = weights.max(dim=1, keepdim=True)[0]
+        step = (row_max - row_min) / (2 ** bit_width - 1)
+        self.assertTrue(((unpacked - weights).abs() <= step + 1e-3).all())
+
+    @given(num_embeddings=st.integers(10, 100),
+           embedding_dim=st.integers(1, 32).map(lambda x: 2 * x),
+           num_offsets=st.integers(1, 20),
+           bit_width=st.sampled_from([8, 4]),
+           mode=st.sampled_from(['sum', 'mean']),
+           use_per_sample_weights=st.booleans(),
+           include_last_offset=st.booleans())
+    def test_embedding_bag(self, num_embeddings, embedding_dim, num_offsets, bit_width,
+                           mode, use_per_sample_weights, include_last_offset):
+        if mode == 'mean':
+            use_per_sample_weights = False
+        prepack, unpack, embedding_bag = self._get_ops(bit_width)
+        packed = prepack(torch.randn(num_embeddings, embedding_dim))
+        unpacked = unpack(packed)
+
+        num_indices = np.random.randint(1, 100)
+        indices = torch.randint(0, num_embeddings, (num_indices,), dtype=torch.long)
+        offsets = torch.tensor([0] + sorted(np.random.randint(0, num_indices + 1, num_offsets - 1).tolist()),
+                               dtype=torch.long)
+        if include_last_offset:
+            offsets = torch.cat([offsets, torch.tensor([num_indices], dtype=torch.long)])
+        per_sample_weights = torch.rand(num_indices) if use_per_sample_weights else None
+
+        out = embedding_bag(packed, indices, offsets, 0 if mode == 'sum' else 1,
+                            per_sample_weights, include_last_offset)
+        ref = F.embedding_bag(indices, unpacked, offsets, mode=mode,
+                              per_sample_weights=per_sample_weights,
+                              include_last_offset=include_last_offset)
+        self.assertEqual(out, ref, atol=1e-4, rtol=1e-4)
+
+    def test_embedding_bag_out_of_bounds(self):
+        for bit_width in [8, 4]:
+            prepack, _, embedding_bag = self._get_ops(bit_width)
+            packed = prepack(torch.randn(10, 4))
+            with self.assertRaises(RuntimeError):
+                embedding_bag(packed, torch.tensor([1, 10]), torch.tensor([0]))
+
+
 class TestPadding(TestCase):
     @given(batch_size=st.integers(1, 64),
            channels=st.integers(1, 64),
@@ -8,11 +8,16 @@ from torch.quantization import (
     MinMaxDynamicQuantObserver,
     HistogramObserver,
     RecordingObserver,
+    NoopObserver,
+    RowwiseWeightObserver,
+    QConfig,
     FakeQuantize,
     default_debug_qconfig,
+    default_qconfig,
     default_observer,
     default_per_channel_weight_observer,
     get_observer_dict,
+    merge_observers,
     prepare,
 )
 import torch.nn as nn
@@ -198,6 +203,42 @@ class TestObserver(QuantizationTestCase):
             self.assertEqual(qparams[0][i], ref_qparams[i][0])
             self.assertEqual(qparams[1][i], ref_qparams[i][1])
 
+    def test_observer_merge(self):
+        x = torch.tensor([[1.0, -2.0, 3.0], [0.5, 4.0, -1.0]])
+        y = torch.tensor([[-3.0, 1.0, 0.0], [2.0, 6.0, 1.5]])
+        for obs_cls in [MinMaxObserver, PerChannelMinMaxObserver]:
+            obs_x, obs_y, obs_ref = obs_cls(), obs_cls(), obs_cls()
+            obs_x(x)
+            obs_y(y)
+            obs_ref(x)
+            obs_ref(y)
+            obs_x.merge(obs_y)
+            self.assertEqual(obs_x.calculate_qparams(), obs_ref.calculate_qparams())
+
+            # Merging with an empty observer on either side
+            empty = obs_cls()
+            obs_x.merge(obs_cls())
+            empty.merge(obs_x)
+            self.assertEqual(empty.calculate_qparams(), obs_ref.calculate_qparams())
+
+        with self.assertRaises(TypeError):
+            MinMaxObserver().merge(PerChannelMinMaxObserver())
+
+    def test_stateless_observer_merge(self):
+        x, y = torch.randn(2, 3), torch.randn(4)
+        obs_x, obs_y = RecordingObserver(), RecordingObserver()
+        obs_x(x)
+        obs_y(y)
+        obs_x.merge(obs_y)
+        self.assertEqual(len(obs_x.get_tensor_value()), 2)
+        self.assertEqual(obs_x.get_tensor_value()[0], x)
+        self.assertEqual(obs_x.get_tensor_value()[1], y)
+
+        # Observers without statistics merge as no-ops
+        for obs_cls in [NoopObserver, RowwiseWeightObserver]:
+            obs = obs_cls()
+            obs.merge(obs_cls())
+
     @given(qdtype=st.sampled_from((torch.qint8, torch.quint8)),
            qscheme=st.sampled_from((torch.per_channel_affine, torch.per_channel_symmetric)),
            ch_axis=st.sampled_from((0, 1, 2, 3)), reduce_range=st.booleans())
@@ -428,6 +469,170 @@ class TestRecordHistogramObserver(QuantizationTestCase):
         qparams = myobs.calculate_qparams()
         self.assertEqual(qparams[1].item(), 0)
 
+    def _reference_combine_histograms(self, orig_hist, new_hist, upsample_rate, downsample_rate, start_idx, Nbins):
+        # Dense implementation that upsamples to the full fine grid.
+        upsampled_histogram = new_hist.repeat_interleave(upsample_rate)
+        histogram_with_output_range = torch.zeros((Nbins * downsample_rate))
+        histogram_with_output_range[start_idx:Nbins * upsample_rate + start_idx] = upsampled_histogram
+        integral_histogram = torch.cumsum(histogram_with_output_range, 0,
+                                          dtype=torch.double)[downsample_rate - 1 :: downsample_rate]
+        shifted_integral_histogram = torch.zeros((Nbins))
+        shifted_integral_histogram[1:Nbins] = integral_histogram[0:-1]
+        interpolated_histogram = (integral_histogram - shifted_integral_histogram) / upsample_rate
+        return orig_hist + interpolated_histogram.to(torch.float)
+
+    def _reference_param_search(self, obs):
+        # The scalar implementation, evaluating one source bin at a time and
+        # accumulating the error in single precision.
+        def _get_norm(delta_begin, delta_end, density):
+            norm = (
+                delta_end * delta_end * delta_end
+                - delta_begin * delta_begin * delta_begin
+            ) / 3
+            return density * norm
+
+        def _compute_quantization_error(next_start_bin, next_end_bin):
+            bin_width = (obs.max_val.item() - obs.min_val.item()) / obs.bins
+            norm = 0.0
+            dst_bin_width = bin_width * (next_end_bin - next_start_bin + 1) / obs.dst_nbins
+            if dst_bin_width == 0.0:
+                return 0.0
+            for src_bin in range(obs.bins):
+                src_bin_begin = (src_bin - next_start_bin) * bin_width
+                src_bin_end = src_bin_begin + bin_width
+                dst_bin_of_begin = min(
+                    obs.dst_nbins - 1, max(0.0, math.floor(src_bin_begin / dst_bin_width)))
+                dst_bin_of_end = min(
+                    obs.dst_nbins - 1, max(0.0, math.floor(src_bin_end / dst_bin_width)))
+                dst_bin_of_begin_center = dst_bin_of_begin * dst_bin_width + dst_bin_width / 2
+                density = obs.histogram[src_bin] / bin_width
+                if dst_bin_of_begin == dst_bin_of_end:
+                    delta_begin = src_bin_begin - dst_bin_of_begin_center
+                    delta_end = src_bin_end - dst_bin_of_begin_center
+                    norm = norm + _get_norm(delta_begin, delta_end, density)
+                else:
+                    delta_begin = src_bin_begin - dst_bin_of_begin_center
+                    delta_end = dst_bin_width / 2
+                    norm = norm + _get_norm(delta_begin, delta_end, density)
+                    norm = norm + (dst_bin_of_end - dst_bin_of_begin - 1) * _get_norm(
+                        -dst_bin_width / 2, dst_bin_width / 2, density)
+                    dst_bin_of_end_center = dst_bin_of_end * dst_bin_width + dst_bin_width / 2
+                    delta_begin = -dst_bin_width / 2
+                    delta_end = src_bin_end - dst_bin_of_end_center
+                    norm = norm + _get_norm(delta_begin, delta_end, density)
+            return norm
+
+        bin_width = (obs.max_val - obs.min_val) / obs.bins
+        total = sum(obs.histogram)
+        cSum = torch.cumsum(obs.histogram, dim=0)
+        stepsize = 1e-5
+        alpha, beta = 0.0, 1.0
+        start_bin, end_bin = 0, obs.bins - 1
+        norm_min = float("inf")
+        while alpha < beta:
+            next_alpha = alpha + stepsize
+            next_beta = beta - stepsize
+            l, r = start_bin, end_bin
+            while l < end_bin and cSum[l] < next_alpha * total:
+                l = l + 1
+            while r > start_bin and cSum[r] > next_beta * total:
+                r = r - 1
+            next_start_bin, next_end_bin = start_bin, end_bin
+            if (l - start_bin) > (end_bin - r):
+                next_start_bin = l
+                alpha = next_alpha
+            else:
+                next_end_bin = r
+                beta = next_beta
+            if next_start_bin == start_bin and next_end_bin == end_bin:
+                continue
+            norm = _compute_quantization_error(next_start_bin, next_end_bin)
+            if norm > norm_min:
+                break
+            norm_min = norm
+            start_bin, end_bin = next_start_bin, next_end_bin
+        return obs.min_val + bin_width * start_bin, obs.min_val + bin_width * (end_bin + 1)
+
+    def test_histogram_observer_combine_histograms(self):
+        myobs = HistogramObserver(bins=16, upsample_rate=8)
+        torch.manual_seed(0)
+        for downsample_rate, start_idx in [(8, 0), (11, 3), (24, 100), (9, 16)]:
+            orig_hist = torch.rand(16) * 10
+            new_hist = torch.randint(0, 20, (16,)).float()
+            expected = self._reference_combine_histograms(orig_hist, new_hist, 8, downsample_rate, start_idx, 16)
+            actual = myobs._combine_histograms(orig_hist, new_hist, 8, downsample_rate, start_idx, 16)
+            self.assertEqual(actual, expected)
+
+    def test_histogram_observer_param_search(self):
+        torch.manual_seed(0)
+        inputs = [
+            torch.randn(1000),
+            torch.cat([torch.randn(1000), torch.tensor([50.0, -20.0])]),
+            torch.rand(1000).pow(4),
+        ]
+        for x in inputs:
+            myobs = HistogramObserver(bins=64)
+            myobs(x)
+            myobs(x * 1.5 + 0.2)
+            new_min, new_max = myobs._non_linear_param_search()
+            # The bin counts of these inputs are multiples of 1/upsample_rate
+            # and sum exactly in single precision, and the errors of successive
+            # candidates are far apart, so the double and single precision
+            # searches agree
+            ref_min, ref_max = self._reference_param_search(myobs)
+            self.assertEqual(new_min, ref_min)
+            self.assertEqual(new_max, ref_max)
+
+    def test_histogram_observer_merge(self):
+        torch.manual_seed(0)
+        x = torch.randn(1000)
+        y = torch.randn(1000) * 2 + 1
+        obs_x, obs_y, obs_ref = HistogramObserver(), HistogramObserver(), HistogramObserver()
+        obs_x(x)
+        obs_y(y)
+        obs_ref(x)
+        obs_ref(y)
+        obs_x.merge(obs_y)
+        self.assertEqual(obs_x.min_val, obs_ref.min_val)
+        self.assertEqual(obs_x.max_val, obs_ref.max_val)
+        self.assertEqual(obs_x.histogram.sum(), obs_ref.histogram.sum())
+        scale, zero_point = obs_x.calculate_qparams()
+        ref_scale, ref_zero_point = obs_ref.calculate_qparams()
+        self.assertEqual(scale, ref_scale, atol=ref_scale.item() * 0.1, rtol=0)
+
+        empty = HistogramObserver()
+        empty.merge(obs_x)
+        self.assertEqual(empty.histogram, obs_x.histogram)
+
+    def test_merge_observers(self):
+        torch.manual_seed(0)
+        model = AnnotatedSingleLayerLinearModel()
+        model.qconfig = default_qconfig
+        model = prepare(model)
+        shards = [copy.deepcopy(model) for _ in range(3)]
+        ref = copy.deepcopy(model)
+        for shard in shards:
+            data = torch.randn(4, 5)
+            shard(data)
+            ref(data)
+        merge_observers(shards[0], shards[1:])
+        observers, ref_observers = {}, {}
+        get_observer_dict(shards[0], observers)
+        get_observer_dict(ref, ref_observers)
+        for name, obs in observers.items():
+            self.assertEqual(obs.calculate_qparams(), ref_observers[name].calculate_qparams())
+
+        # Models with float16 and debug observers can be merged as well
+        float16_qconfig = QConfig(activation=NoopObserver, weight=NoopObserver)
+        for qconfig in [float16_qconfig, default_debug_qconfig]:
+            model = AnnotatedSingleLayerLinearModel()
+            model.qconfig = qconfig
+            model = prepare(model)
+            shards = [copy.deepcopy(model) for _ in range(2)]
+            for shard in shards:
+                shard(torch.randn(4, 5))
+            merge_observers(shards[0], shards[1:])
+
 class TestFakeQuantizePerTensor(TestCase):
     @given(device=st.sampled_from(['cpu', 'cuda'] if torch.cuda.is_available() else ['cpu']),
            X=hu.tensor(shapes=hu.array_shapes(1, 5,),
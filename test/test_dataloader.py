@@ -940,6 +940,10 @@ except RuntimeError as e:
             DataLoader(self.dataset, num_workers=-1)
         with self.assertRaisesRegex(ValueError, "timeout option should be non-negative"):
             DataLoader(self.dataset, timeout=-1)
+        with self.assertRaisesRegex(ValueError, "prefetch_factor option should be positive"):
+            DataLoader(self.dataset, num_workers=2, prefetch_factor=0)
+        with self.assertRaisesRegex(ValueError, "prefetch_factor option could only be specified in multi-process"):
+            DataLoader(self.dataset, num_workers=0, prefetch_factor=4)
 
         # disable auto-batching
         with self.assertRaisesRegex(ValueError,
@@ -1233,6 +1237,11 @@ except RuntimeError as e:
     def test_seqential_batch_workers(self):
         self._test_sequential(DataLoader(self.dataset, batch_size=2, num_workers=4))
 
+    def test_seqential_batch_workers_prefetch(self):
+        for prefetch_factor in [1, 4]:
+            self._test_sequential(DataLoader(self.dataset, batch_size=2, num_workers=4,
+                                             prefetch_factor=prefetch_factor))
+
     def test_shuffle_workers(self):
         self._test_shuffle(DataLoader(self.dataset, shuffle=True, num_workers=4))
 
@@ -561,6 +561,87 @@ class TestNN(NNTestCase):
         expected_grad = -torch.ones(5, 5).mm(module.weight.data) * 2 * mask
         self.assertEqual(input.grad, expected_grad)
 
+    def test_hooks_registered_after_call(self):
+        # Calls of modules without hooks take a fast path, check that hooks
+        # registered and removed between calls are taken into account.
+        module = nn.Linear(5, 5)
+        input = torch.randn(2, 5, requires_grad=True)
+        expected = module(input)
+        calls = []
+
+        handles = [
+            module.register_forward_pre_hook(lambda m, input: calls.append('pre')),
+            module.register_forward_hook(lambda m, input, output: calls.append('forward')),
+            module.register_backward_hook(lambda m, grad_input, grad_output: calls.append('backward')),
+        ]
+        self.assertEqual(module(input), expected)
+        self.assertEqual(calls, ['pre', 'forward'])
+        module(input).sum().backward()
+        self.assertEqual(calls, ['pre', 'forward', 'pre', 'forward', 'backward'])
+
+        for handle in handles:
+            handle.remove()
+        module(input).sum().backward()
+        self.assertEqual(len(calls), 5)
+
+    def test_global_hooks(self):
+        from torch.nn.modules.module import register_module_forward_pre_hook, \
+            register_module_forward_hook, register_module_backward_hook
+
+        model = nn.Sequential(nn.Linear(5, 5), nn.ReLU())
+        input = torch.randn(2, 5, requires_grad=True)
+        calls = []
+        model[0].register_forward_hook(lambda m, input, output: calls.append(('local', m)))
+        handles = [
+            register_module_forward_pre_hook(lambda m, input: calls.append(('pre', m))),
+            register_module_forward_hook(lambda m, input, output: calls.append(('forward', m))),
+            register_module_backward_hook(lambda m, grad_input, grad_output: calls.append(('backward', m))),
+        ]
+        try:
+            model(input).sum().backward()
+        finally:
+            for handle in handles:
+                handle.remove()
+        self.assertEqual(calls, [
+            ('pre', model), ('pre', model[0]), ('forward', model[0]), ('local', model[0]),
+            ('pre', model[1]), ('forward', model[1]), ('forward', model),
+            # The backward hooks of model and model[1] are both registered on the
+            # grad_fn of the output of ReLU, in the order the modules returned.
+            ('backward', model[1]), ('backward', model), ('backward', model[0]),
+        ])
+
+        del calls[:]
+        model(input)
+        self.assertEqual(calls, [('local', model[0])])
+
+    def test_module_profiler(self):
+        model = nn.Sequential(nn.Linear(5, 5), nn.ReLU())
+        other = nn.Linear(5, 5)
+        input = torch.randn(2, 5, requires_grad=True)
+        profiler = nn.utils.ModuleProfiler(model, record_backward=True)
+        with profiler:
+            for _ in range(3):
+                model(input).sum().backward()
+                other(input)
+        model(input)
+
+        self.assertEqual(list(profiler.stats.keys()), ['Sequential', '0', '1'])
+        for module_stats in profiler.stats.values():
+            self.assertEqual(module_stats.calls, 3)
+            self.assertEqual(module_stats.output_bytes, 3 * 2 * 5 * 4)
+            self.assertGreater(module_stats.forward_time, 0)
+            self.assertGreaterEqual(module_stats.forward_time, module_stats.max_forward_time)
+            self.assertEqual(module_stats.backward_calls, 3)
+        self.assertGreaterEqual(profiler.stats['Sequential'].forward_time, profiler.stats['0'].forward_time)
+        self.assertIn('Sequential', profiler.table(row_limit=1))
+
+        with torch.autograd.profiler.profile() as prof:
+            with profiler:
+                model(input)
+        self.assertIn('nn.Module: 0', [event.name for event in prof.function_events])
+        self.assertEqual(profiler.stats['0'].calls, 4)
+        profiler.reset()
+        self.assertEqual(len(profiler.stats), 0)
 
 
     def test_to(self):
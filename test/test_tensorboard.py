@@ -58,10 +58,10 @@ class BaseTestCase(TestCase):
             return self.skipTest("Skip the test since TensorBoard is not installed")
         self.temp_dirs = []
 
-    def createSummaryWriter(self):
+    def createSummaryWriter(self, **kwargs):
         temp_dir = str(uuid.uuid4())
         self.temp_dirs.append(temp_dir)
-        return SummaryWriter(temp_dir)
+        return SummaryWriter(temp_dir, **kwargs)
 
     def tearDown(self):
         super(BaseTestCase, self).tearDown()
@@ -290,6 +290,71 @@ class TestTensorBoardSummaryWriter(BaseTestCase):
         import shutil
         shutil.rmtree(str(p))
 
+class TestTensorBoardAsyncSummaryWriter(BaseTestCase):
+    def _read_summaries(self, log_dir):
+        from tensorboard.backend.event_processing.event_file_loader import EventFileLoader
+        summaries = {}
+        for name in os.listdir(log_dir):
+            for event in EventFileLoader(os.path.join(log_dir, name)).Load():
+                for value in event.summary.value:
+                    summaries[value.tag] = (event.step, value)
+        return summaries
+
+    def test_async_summaries(self):
+        weight = torch.zeros(10, 10)
+        with self.createSummaryWriter(async_summaries=True) as writer:
+            for step in range(3):
+                writer.add_scalar('loss', torch.tensor(float(step)), step)
+                writer.add_histogram('weight', weight, step)
+                writer.add_image('image', torch.rand(3, 8, 8), step)
+                # The summaries use the values at the time of the add_* call.
+                weight.add_(1)
+            log_dir = writer.get_logdir()
+        summaries = self._read_summaries(log_dir)
+        step, loss = summaries['loss']
+        self.assertEqual(step, 2)
+        self.assertEqual(loss.simple_value, 2.)
+        step, histogram = summaries['weight']
+        self.assertEqual(step, 2)
+        self.assertEqual(histogram.histo.min, 2.)
+        self.assertEqual(histogram.histo.max, 2.)
+        self.assertIn('image', summaries)
+        self.assertEqual(writer.num_dropped_summaries, 0)
+
+    def test_async_summaries_error(self):
+        writer = self.createSummaryWriter(async_summaries=True)
+        writer.add_image('image', torch.rand(2, 3, 4, 5, 6))
+        with self.assertRaises(Exception):
+            writer.flush()
+        writer.add_scalar('loss', 1.)
+        writer.close()
+        self.assertIs(writer.file_writer, None)
+
+    def test_summary_worker_when_full(self):
+        import threading
+        from torch.utils.tensorboard._summary_worker import SummaryWorker
+
+        for when_full, expected in [('drop_newest', ['first']), ('drop_oldest', ['second'])]:
+            started, release = threading.Event(), threading.Event()
+            worker = SummaryWorker(max_pending=1, when_full=when_full)
+            results = []
+
+            def blocking():
+                started.set()
+                release.wait()
+
+            worker.submit(blocking)
+            started.wait()
+            worker.submit(lambda: results.append('first'))
+            worker.submit(lambda: results.append('second'))
+            release.set()
+            worker.close()
+            self.assertEqual(results, expected)
+            self.assertEqual(worker.num_dropped, 1)
+
+        with self.assertRaises(ValueError):
+            SummaryWorker(when_full='ignore')
+
 class TestTensorBoardEmbedding(BaseTestCase):
     def test_embedding(self):
         w = self.createSummaryWriter()
@@ -410,6 +475,30 @@ class TestTensorBoardSummary(BaseTestCase):
     def test_histogram_doane(self):
         self.assertTrue(compare_proto(summary.histogram('dummy', tensor_N(shape=(1024,)), bins='doane', max_bins=5), self))
 
+    def test_histogram_tensor(self):
+        # Histograms of tensors are computed with torch ops, check that they
+        # match the numpy implementation.
+        for values, bins in [(torch.randn(1000), np.arange(-3, 3.25, 0.25)),
+                             (torch.randint(0, 100, (1000,)), 10),
+                             (torch.full((10,), 2.), 5)]:
+            expected = summary.histogram('dummy', make_np(values), bins).value[0].histo
+            actual = summary.histogram('dummy', values, bins).value[0].histo
+            self.assertEqual(list(actual.bucket), list(expected.bucket))
+            self.assertEqual(list(actual.bucket_limit), list(expected.bucket_limit))
+            self.assertEqual(actual.num, expected.num)
+            self.assertEqual(actual.min, expected.min)
+            self.assertEqual(actual.max, expected.max)
+            self.assertAlmostEqual(actual.sum, expected.sum, places=3)
+            self.assertAlmostEqual(actual.sum_squares, expected.sum_squares, places=2)
+
+    def test_histogram_max_samples(self):
+        values = torch.arange(1000.)
+        histo = summary.histogram('dummy', values, 10, max_samples=100).value[0].histo
+        self.assertEqual(histo.num, 100)
+        self.assertEqual(sum(histo.bucket), 100)
+        histo = summary.histogram('dummy', make_np(values), 10, max_samples=100).value[0].histo
+        self.assertEqual(histo.num, 100)
+
     def test_custom_scalars(self):
         layout = {
             'Taiwan': {
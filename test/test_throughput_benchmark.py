@@ -35,6 +35,12 @@ class TwoLayerNetModule(torch.nn.Module):
         return y_pred
 
 class TestThroughputBenchmark(TestCase):
+    def make_benchmark(self, Module):
+        module = Module(10, 5, 15)
+        bench = ThroughputBenchmark(module)
+        bench.add_input(torch.randn(8, 10), torch.randn(8, 10))
+        return bench
+
     def linear_test(self, Module, profiler_output_path=""):
         D_in = 10
         H = 5
@@ -80,6 +86,36 @@ class TestThroughputBenchmark(TestCase):
         with tempfile.NamedTemporaryFile(delete=False) as f:
             self.linear_test(TwoLayerNetModule, profiler_output_path=f.name)
 
+    def test_latency_percentiles(self):
+        bench = self.make_benchmark(TwoLayerNet)
+        stats = bench.benchmark(num_calling_threads=2, num_warmup_iters=10, num_iters=200)
+        self.assertEqual(len(stats.latencies_ms), 200)
+        self.assertTrue(all(latency > 0 for latency in stats.latencies_ms))
+        self.assertLessEqual(stats.latency_p50_ms, stats.latency_p99_ms)
+        self.assertLessEqual(stats.latency_p99_ms, stats.latency_p999_ms)
+        self.assertLessEqual(stats.latency_p999_ms, max(stats.latencies_ms))
+        self.assertEqual(stats.latency_percentile_ms(0), min(stats.latencies_ms))
+        self.assertIn("p99", str(stats))
+
+    def test_open_loop(self):
+        bench = self.make_benchmark(TwoLayerNet)
+        for poisson_arrivals in [False, True]:
+            stats = bench.benchmark(num_calling_threads=2, num_warmup_iters=10, num_iters=100,
+                                    target_qps=1000, poisson_arrivals=poisson_arrivals)
+            self.assertEqual(len(stats.latencies_ms), 100)
+            # Requests are spread over about 0.1s, and served as they arrive
+            self.assertGreater(stats.total_time_seconds, 0.05)
+            self.assertLess(stats.iters_per_second, 2000)
+            self.assertIn("Target iterations per second", str(stats))
+
+    def test_sweep(self):
+        bench = self.make_benchmark(TwoLayerNetModule)
+        num_threads = torch.get_num_threads()
+        results = bench.sweep(num_calling_threads=[1, 2], num_intra_op_threads=[1],
+                              num_warmup_iters=1, num_iters=20)
+        self.assertEqual([stats.benchmark_config.num_calling_threads for stats in results], [1, 2])
+        self.assertEqual(torch.get_num_threads(), num_threads)
+
 
 if __name__ == '__main__':
     run_tests()
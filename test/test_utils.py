@@ -10,8 +10,10 @@ import torch
 import torch.nn as nn
 import torch.utils.data
 import torch.cuda
-from torch.utils.checkpoint import checkpoint, checkpoint_sequential
+from torch.utils.checkpoint import checkpoint, checkpoint_sequential, plan_checkpointing, \
+    profile_modules, remove_checkpointing, checkpoint_modules
 import torch.hub as hub
+import torch.utils.benchmark as benchmark_utils
 from torch.autograd._functions.utils import check_onnx_broadcast
 from torch.onnx.symbolic_opset9 import _prepare_onnx_paddings
 from torch.testing._internal.common_utils import skipIfRocm, load_tests, retry, IS_SANDCASTLE
@@ -268,6 +270,212 @@ class TestCheckpoint(TestCase):
         out.sum().backward()
 
 
+    def _count_calls(self, modules):
+        counts = [0] * len(modules)
+
+        def hook(i):
+            def count(module, input, output):
+                counts[i] += 1
+            return count
+
+        for i, module in enumerate(modules):
+            module.register_forward_hook(hook(i))
+        return counts
+
+    def _check_gradients_unchanged(self, model, input, plan):
+        model.zero_grad()
+        model(input).sum().backward()
+        expected = [p.grad.clone() for p in model.parameters()]
+        model.zero_grad()
+        plan.apply(model)
+        model(input).sum().backward()
+        for p, grad in zip(model.parameters(), expected):
+            self.assertEqual(p.grad, grad)
+
+    def test_plan_checkpointing(self):
+        model = nn.Sequential(*[
+            nn.Sequential(nn.Linear(20, 20), nn.Tanh(), nn.Linear(20, 20), nn.Tanh())
+            for _ in range(4)])
+        input = torch.randn(8, 20, requires_grad=True)
+        activation_bytes = 8 * 20 * 4
+
+        profile = profile_modules(model, input)
+        self.assertEqual(profile['0.0'].output_bytes, activation_bytes)
+        self.assertEqual(profile['0'].leaf_output_bytes, 4 * activation_bytes)
+        self.assertEqual(profile[''].leaf_output_bytes, 16 * activation_bytes)
+        self.assertTrue(all(stat.calls == 1 and stat.checkpointable for stat in profile.values()))
+
+        plan = plan_checkpointing(model, input, 16 * activation_bytes, profile=profile)
+        self.assertEqual(plan.modules, [])
+        # Every block saves the activations of its first three modules.
+        plan = plan_checkpointing(model, input, 10 * activation_bytes, profile=profile)
+        self.assertEqual(len(plan.modules), 2)
+        self.assertEqual(plan.saved_bytes, 6 * activation_bytes)
+        with self.assertWarnsRegex(UserWarning, "don't fit in the memory budget"):
+            plan = plan_checkpointing(model, input, 0, profile=profile)
+        self.assertEqual(plan.modules, ['0', '1', '2', '3'])
+
+        self._check_gradients_unchanged(model, input, plan)
+        counts = self._count_calls([model[0][0]])
+        model(input).sum().backward()
+        self.assertEqual(counts, [2])
+
+        remove_checkpointing(model)
+        self.assertNotIn('forward', model[0].__dict__)
+        model(input).sum().backward()
+        self.assertEqual(counts, [3])
+
+    def test_plan_checkpointing_keep(self):
+        model = nn.Sequential(*[
+            nn.Sequential(nn.Linear(20, 20), nn.ReLU(), nn.Tanh(), nn.Linear(20, 20))
+            for _ in range(2)])
+        input = torch.randn(8, 20, requires_grad=True)
+
+        # Only the output of ReLU is not kept.
+        plan = plan_checkpointing(model, input, 6 * 8 * 20 * 4, keep=nn.Linear)
+        self.assertEqual(plan.modules, ['0', '1'])
+        self.assertEqual(plan.saved_bytes, 2 * 8 * 20 * 4)
+
+        self._check_gradients_unchanged(model, input, plan)
+        counts = self._count_calls(list(model[0]))
+        model(input).sum().backward()
+        self.assertEqual(counts, [1, 2, 2, 1])
+
+
+    def _check_offload(self, device):
+        model = nn.Sequential(*[
+            nn.Sequential(nn.Linear(20, 20), nn.ReLU(), nn.Dropout(0.5), nn.Linear(20, 20))
+            for _ in range(4)]).to(device)
+        input = torch.randn(8, 20, device=device, requires_grad=True)
+
+        torch.manual_seed(0)
+        model(input).sum().backward()
+        expected = [p.grad.clone() for p in model.parameters()] + [input.grad.clone()]
+        model.zero_grad()
+        input.grad = None
+
+        checkpoint_modules(model, ['0', '1'])
+        checkpoint_modules(model, ['2', '3'], offload=True)
+        counts = self._count_calls([model[0][0], model[3][0]])
+        torch.manual_seed(0)
+        model(input).sum().backward()
+        self.assertEqual(counts, [2, 2])
+        for grad, expected_grad in zip([p.grad for p in model.parameters()] + [input.grad], expected):
+            self.assertEqual(grad, expected_grad)
+
+        model.zero_grad()
+        input.grad = None
+        remove_checkpointing(model)
+        torch.manual_seed(0)
+        output = checkpoint_sequential(model, 4, input, offload=True)
+        output.sum().backward()
+        for grad, expected_grad in zip([p.grad for p in model.parameters()] + [input.grad], expected):
+            self.assertEqual(grad, expected_grad)
+
+    def test_checkpoint_offload(self):
+        self._check_offload('cpu')
+
+    @unittest.skipIf(not HAS_CUDA, 'No CUDA')
+    def test_checkpoint_offload_cuda(self):
+        self._check_offload('cuda')
+
+    def _check_offload_inplace(self, device):
+        a = torch.randn(5, device=device, requires_grad=True)
+        b = a * 2
+        output = checkpoint(lambda x: x.exp(), b, offload=True)
+        b.add_(1)
+        with self.assertRaisesRegex(RuntimeError, "modified by an inplace operation"):
+            output.sum().backward()
+
+    def test_checkpoint_offload_inplace(self):
+        self._check_offload_inplace('cpu')
+
+    @unittest.skipIf(not HAS_CUDA, 'No CUDA')
+    def test_checkpoint_offload_inplace_cuda(self):
+        self._check_offload_inplace('cuda')
+
+    def test_checkpoint_offload_twice(self):
+        a = torch.randn(5, requires_grad=True)
+        output = checkpoint(lambda x: x.exp(), a, offload=True)
+        output.sum().backward(retain_graph=True)
+        self.assertEqual(a.grad, a.exp())
+        with self.assertRaisesRegex(RuntimeError, "backward through the graph a second time"):
+            output.sum().backward()
+
+
+class TestBenchmarkUtils(TestCase):
+    def test_timer(self):
+        timer = benchmark_utils.Timer('x.add(1)', setup='x = torch.ones(10)', label='add',
+                                      num_threads=1)
+        m = timer.timeit(100)
+        self.assertEqual(m.number_per_run, 100)
+        self.assertEqual(len(m.raw_times), 1)
+        self.assertGreater(m.median, 0)
+
+        m = timer.blocked_autorange(min_run_time=0.05)
+        self.assertGreaterEqual(sum(m.raw_times), 0.05)
+        # Blocks are sized to last about min_block_time, so there are more
+        # than one iteration per block for such a cheap statement.
+        self.assertGreater(m.number_per_run, 1)
+        self.assertEqual(m.task_spec.label, 'add')
+
+    def test_timer_num_threads(self):
+        num_threads = torch.get_num_threads()
+        observed = []
+        globals = {'observed': observed}
+        timer = benchmark_utils.Timer('observed.append(torch.get_num_threads())',
+                                      globals=globals, num_threads=2)
+        timer.timeit(1)
+        self.assertEqual(set(observed), {2})
+        self.assertEqual(torch.get_num_threads(), num_threads)
+        self.assertNotIn('torch', globals)
+
+    def test_adaptive_autorange(self):
+        timer = benchmark_utils.Timer(lambda: None)
+        m = timer.adaptive_autorange(threshold=0.5, max_run_time=1)
+        self.assertGreaterEqual(len(m.raw_times), 4)
+
+    def test_measurement(self):
+        spec = benchmark_utils.TaskSpec('pass', 'pass', label='a')
+        m = benchmark_utils.Measurement(10, [1., 2., 3., 4., 5.], spec)
+        self.assertEqual(m.times, [0.1, 0.2, 0.3, 0.4, 0.5])
+        self.assertAlmostEqual(m.median, 0.3)
+        self.assertAlmostEqual(m.iqr, 0.2)
+        self.assertAlmostEqual(m.noise, 2. / 3)
+        self.assertTrue(m.is_noisy)
+        self.assertIn('Median: 300.00 ms', repr(m))
+
+        merged = benchmark_utils.Measurement.merge(
+            [m, benchmark_utils.Measurement(5, [0.5, 1.], spec)])
+        self.assertEqual(len(merged), 1)
+        self.assertEqual(len(merged[0].times), 7)
+        self.assertEqual(len(m.raw_times), 5)
+
+    def test_significant_difference(self):
+        spec = benchmark_utils.TaskSpec('pass', 'pass')
+        fast = benchmark_utils.Measurement(1, [1., 1.1, 0.9, 1.05, 0.95, 1.02, 0.98, 1.01], spec)
+        slow = benchmark_utils.Measurement(1, [t * 1.5 for t in fast.raw_times], spec)
+        same = benchmark_utils.Measurement(1, list(reversed(fast.raw_times)), spec)
+        self.assertTrue(fast.significantly_differs(slow))
+        self.assertFalse(fast.significantly_differs(same))
+
+    def test_compare(self):
+        times = [1e-3, 1.1e-3, 0.9e-3, 1.05e-3, 0.95e-3, 1.02e-3, 0.98e-3, 1.01e-3]
+        results = []
+        for env, factor in [('before', 1.), ('after', 2.)]:
+            for description in ['float', 'double']:
+                spec = benchmark_utils.TaskSpec('pass', 'pass', label='op', sub_label='small',
+                                                description=description, env=env)
+                results.append(benchmark_utils.Measurement(
+                    1, [t * factor for t in times], spec))
+        table = str(benchmark_utils.Compare(results))
+        self.assertIn('[ op ]', table)
+        self.assertIn('float', table)
+        self.assertIn('double', table)
+        self.assertIn('Times are in milliseconds (ms).', table)
+        self.assertIn('[+100%*]', table)
+
+
 class TestDataLoader(TestCase):
     def setUp(self):
         self.dataset = torch.randn(5, 3, 3, 2)
@@ -334,6 +334,7 @@ PyObject* rpc_init(PyObject* /* unused */) {
   // shutdown(), python objects returned from rpc python call can not be
   // resolved.
   auto future = shared_ptr_class_<FutureIValue>(module, "Future")
+                    .def(py::init<>())
                     .def(
                         "wait",
                         [&](FutureIValue& fut) {
@@ -349,6 +350,55 @@ PyObject* rpc_init(PyObject* /* unused */) {
                         R"(
 Wait on future to complete and return the object it completed with.
 If the future completes with an error, an exception is thrown.
+              )")
+                    .def(
+                        "done",
+                        &FutureIValue::completed,
+                        R"(
+Return ``True`` if the future has completed, either with a value or an error.
+              )")
+                    .def(
+                        "set_result",
+                        [](FutureIValue& fut, const py::object& value) {
+                          fut.markCompleted(torch::jit::toIValue(
+                              value, PyObjectType::get()));
+                        },
+                        R"(
+Mark the future as completed with ``value``, running all callbacks attached
+to it. Use this to complete a future created by the user, e.g. one returned
+from a function decorated with
+:meth:`~torch.distributed.rpc.functions.async_execution`.
+              )")
+                    .def(
+                        "then",
+                        [](const std::shared_ptr<FutureIValue>& fut,
+                           py::function cb) {
+                          auto child = std::make_shared<FutureIValue>();
+                          // The callback may be destroyed on an RPC thread,
+                          // so release it while holding the GIL.
+                          std::shared_ptr<py::function> pyCb(
+                              new py::function(std::move(cb)),
+                              [](py::function* f) {
+                                pybind11::gil_scoped_acquire ag;
+                                delete f;
+                              });
+                          fut->addCallback([fut, child, pyCb]() {
+                            pybind11::gil_scoped_acquire ag;
+                            try {
+                              auto value = (*pyCb)(fut);
+                              child->markCompleted(torch::jit::toIValue(
+                                  value, PyObjectType::get()));
+                            } catch (const std::exception& e) {
+                              child->setErrorIfNeeded(e.what());
+                            }
+                          });
+                          return child;
+                        },
+                        R"(
+Append ``callback`` to the future. It is called with this future as its only
+argument once it completes, and the returned future is completed with the
+value ``callback`` returns, or with an error if ``callback`` raises. Use
+``fut.wait()`` inside the callback to retrieve the value.
               )");
 
   shared_ptr_class_<ProcessGroupRpcBackendOptions>(
@@ -506,7 +506,9 @@ void ProcessGroupAgent::enqueueSend(SendWork work) {
 
 bool ProcessGroupAgent::handleRecv(RecvWork& work) {
   torch::Tensor& payload = work.payload_;
-  auto data = wireDeserialize(payload.storage().data(), payload.numel());
+  // Tensors in the message alias the received buffer instead of being copied
+  // out of it.
+  auto data = wireDeserialize(payload);
   Message message(
       std::move(data.first), std::move(data.second), work.type_, work.id_);
   if (message.isRequest()) {
@@ -172,14 +172,47 @@ void RequestCallbackImpl::processRpc(
       auto& upc = static_cast<UnpickledPythonCall&>(rpc);
       auto& pythonRpcHandler = PythonRpcHandler::getInstance();
       std::shared_ptr<SerializedPyObj> serializedPyObj = nullptr;
+      std::shared_ptr<FutureIValue> pyFuture = nullptr;
       {
         pybind11::gil_scoped_acquire ag;
-        serializedPyObj =
-            std::make_shared<SerializedPyObj>(pythonRpcHandler.serialize(
-                pythonRpcHandler.runPythonUdf(std::move(upc).movePythonUdf())));
+        auto result =
+            pythonRpcHandler.runPythonUdf(std::move(upc).movePythonUdf());
+        if (py::isinstance<FutureIValue>(result)) {
+          // The UDF returned a Future: release this thread right away and
+          // send the response once the Future completes.
+          pyFuture = result.cast<std::shared_ptr<FutureIValue>>();
+        } else {
+          serializedPyObj = std::make_shared<SerializedPyObj>(
+              pythonRpcHandler.serialize(result));
+        }
+      }
+      if (!pyFuture) {
+        markComplete(
+            std::move(PythonResp(std::move(*serializedPyObj))).toMessage());
+        return;
       }
-      markComplete(
-          std::move(PythonResp(std::move(*serializedPyObj))).toMessage());
+      pyFuture->addCallback([responseFuture, messageId, pyFuture]() {
+        if (pyFuture->hasError()) {
+          responseFuture->setError(pyFuture->error()->what());
+          return;
+        }
+        try {
+          auto& pythonRpcHandler = PythonRpcHandler::getInstance();
+          std::shared_ptr<SerializedPyObj> serializedPyObj = nullptr;
+          {
+            pybind11::gil_scoped_acquire ag;
+            serializedPyObj =
+                std::make_shared<SerializedPyObj>(pythonRpcHandler.serialize(
+                    torch::jit::toPyObject(pyFuture->constValue())));
+          }
+          Message m =
+              std::move(PythonResp(std::move(*serializedPyObj))).toMessage();
+          m.setId(messageId);
+          responseFuture->markCompleted(std::move(m));
+        } catch (const std::exception& e) {
+          responseFuture->setError(e.what());
+        }
+      });
       return;
     }
     case MessageType::SCRIPT_REMOTE_CALL: {
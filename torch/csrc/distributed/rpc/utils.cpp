@@ -16,6 +16,8 @@
 #include <torch/csrc/jit/serialization/pickler.h>
 #include <torch/csrc/jit/serialization/unpickler.h>
 
+#include <functional>
+
 namespace torch {
 namespace distributed {
 namespace rpc {
@@ -155,6 +157,9 @@ namespace {
 //    - "payload" - the payload bits
 //    - "meta"    - metadata for the unpickler
 //    - "0" ...   - tensor sections for the unpickler
+//    - "pad0" ...- padding placed in front of every tensor section so that it
+//                  starts at a multiple of kWireAlignment from the beginning
+//                  of the message. Padding sections are never read back.
 //
 // Note that per the header comments, the format is subject to change,
 // and is best used for rpcs, rather than persistent disk storage.
@@ -212,6 +217,72 @@ parseWireSections(const void* data, size_t data_size) {
 
 static const char* kMeta = "meta";
 static const char* kPayload = "payload";
+static const char* kPad = "pad";
+
+// Tensor sections are aligned to this many bytes relative to the start of the
+// serialized message, which matches the alignment of the CPU allocator. When
+// the receive buffer is itself aligned, tensors can then alias it directly.
+constexpr size_t kWireAlignment = 64;
+// Padding sizes are always written with this many digits, so that the header
+// length does not depend on the padding it describes.
+constexpr size_t kPadSizeDigits = 2;
+static_assert(kWireAlignment <= 100, "padding must fit in kPadSizeDigits");
+
+std::pair<std::vector<char>, std::vector<at::Tensor>> wireDeserializeImpl(
+    const void* data,
+    size_t data_size,
+    const std::function<at::DataPtr(const char*, size_t)>& readSection) {
+  auto sections = parseWireSections(data, data_size);
+
+  std::vector<char> payload;
+  auto payloadIt = sections.find(kPayload);
+  if (payloadIt != sections.end() && payloadIt->second.second != 0) {
+    payload.assign(
+        payloadIt->second.first,
+        payloadIt->second.first + payloadIt->second.second);
+  }
+
+  std::vector<at::Tensor> tensors;
+  auto metaIt = sections.find(kMeta);
+  if (metaIt != sections.end()) {
+    const auto& metaData = metaIt->second;
+    size_t metaDataPos = 0;
+    auto metaDataReadFunc = [&](char* buf, size_t n) -> size_t {
+      if (metaDataPos >= metaData.second || n == 0) {
+        return 0;
+      }
+      size_t toCopy = std::min(metaDataPos + n, metaData.second) - metaDataPos;
+      memcpy(buf, metaData.first + metaDataPos, toCopy);
+      metaDataPos += toCopy;
+      return toCopy;
+    };
+    auto sectionReadFunc = [&](const std::string& ename) -> at::DataPtr {
+      auto it = sections.find(ename);
+      if (it == sections.end()) {
+        throw std::runtime_error("Couldn't find entity " + ename);
+      }
+      return readSection(it->second.first, it->second.second);
+    };
+
+    // No need to pass typeResolver here, as it always processes string and
+    // tensors only
+    torch::jit::Unpickler unpickler(
+        metaDataReadFunc, nullptr, nullptr, sectionReadFunc, {});
+    auto ival = unpickler.parse_ivalue();
+    for (auto&& t : ival.toTensorList()) {
+      tensors.emplace_back(std::move(t));
+    }
+  }
+  return {std::move(payload), std::move(tensors)};
+}
+
+at::DataPtr copySection(const char* data, size_t size) {
+  auto dptr = at::getCPUAllocator()->allocate(size);
+  if (size != 0) {
+    memcpy(dptr.get(), data, size);
+  }
+  return dptr;
+}
 }; // namespace
 
 c10::List<at::Tensor> cloneSparseTensors(
@@ -254,13 +325,14 @@ std::string wireSerialize(
     std::string name;
     const char* data;
     size_t size;
+    bool isPad;
   };
   std::vector<Ent> entries;
   std::string metaEntry;
   std::vector<jit::WriteableTensorData> tensorData;
 
   if (!payload.empty()) {
-    entries.push_back({kPayload, payload.data(), payload.size()});
+    entries.push_back({kPayload, payload.data(), payload.size(), false});
   }
 
   if (!tensors.empty()) {
@@ -273,30 +345,53 @@ std::string wireSerialize(
     pickler.stop();
     // tensorData is in function scope so that the data() pointers stay valid.
     tensorData = pickler.tensorData();
-    entries.push_back({kMeta, metaEntry.data(), metaEntry.size()});
+    entries.push_back({kMeta, metaEntry.data(), metaEntry.size(), false});
     for (size_t i = 0; i < tensorData.size(); i++) {
+      entries.push_back(
+          {kPad + c10::to_string(i), nullptr, 0, /* isPad */ true});
       entries.push_back({c10::to_string(i),
                          tensorData[i].data(),
-                         tensorData[i].sizeInBytes()});
+                         tensorData[i].sizeInBytes(),
+                         false});
     }
   }
 
+  // Padding sizes are fixed-width, so the header length is known before the
+  // padding itself is computed.
+  size_t headerSize = 1;
+  for (const auto& e : entries) {
+    headerSize += e.name.size() + 2 +
+        (e.isPad ? kPadSizeDigits : c10::to_string(e.size).size());
+  }
+  size_t offset = headerSize;
+  for (auto& e : entries) {
+    if (e.isPad) {
+      e.size = (kWireAlignment - offset % kWireAlignment) % kWireAlignment;
+    }
+    offset += e.size;
+  }
+
   std::string header;
-  size_t tot = 0;
+  header.reserve(headerSize);
   for (const auto& e : entries) {
-    tot += e.size;
-    header.append(e.name)
-        .append(" ")
-        .append(c10::to_string(e.size))
-        .append("\n");
+    std::string size = c10::to_string(e.size);
+    if (e.isPad) {
+      size.insert(0, kPadSizeDigits - size.size(), '0');
+    }
+    header.append(e.name).append(" ").append(size).append("\n");
   }
   header.push_back('\n');
+  TORCH_INTERNAL_ASSERT(header.size() == headerSize);
 
   std::string out;
-  out.reserve(header.size() + tot);
+  out.reserve(offset);
   out.append(header);
   for (const auto& e : entries) {
-    out.append(e.data, e.size);
+    if (e.isPad) {
+      out.append(e.size, '\0');
+    } else {
+      out.append(e.data, e.size);
+    }
   }
   return out;
 }
@@ -304,53 +399,29 @@ std::string wireSerialize(
 std::pair<std::vector<char>, std::vector<at::Tensor>> wireDeserialize(
     const void* data,
     size_t data_size) {
-  auto sections = parseWireSections(data, data_size);
-
-  std::vector<char> payload;
-  auto payloadIt = sections.find(kPayload);
-  if (payloadIt != sections.end() && payloadIt->second.second != 0) {
-    payload.assign(
-        payloadIt->second.first,
-        payloadIt->second.first + payloadIt->second.second);
-  }
-
-  std::vector<at::Tensor> tensors;
-  auto metaIt = sections.find(kMeta);
-  if (metaIt != sections.end()) {
-    const auto& metaData = metaIt->second;
-    size_t metaDataPos = 0;
-    auto metaDataReadFunc = [&](char* buf, size_t n) -> size_t {
-      if (metaDataPos >= metaData.second || n == 0) {
-        return 0;
-      }
-      size_t toCopy = std::min(metaDataPos + n, metaData.second) - metaDataPos;
-      memcpy(buf, metaData.first + metaDataPos, toCopy);
-      metaDataPos += toCopy;
-      return toCopy;
-    };
-    auto sectionReadFunc = [&](const std::string& ename) -> at::DataPtr {
-      auto it = sections.find(ename);
-      if (it == sections.end()) {
-        throw std::runtime_error("Couldn't find entity " + ename);
-      }
-      const auto& idat = it->second;
-      auto dptr = at::getCPUAllocator()->allocate(idat.second);
-      if (idat.second != 0) {
-        memcpy(dptr.get(), idat.first, idat.second);
-      }
-      return dptr;
-    };
+  return wireDeserializeImpl(data, data_size, copySection);
+}
 
-    // No need to pass typeResolver here, as it always processes string and
-    // tensors only
-    torch::jit::Unpickler unpickler(
-        metaDataReadFunc, nullptr, nullptr, sectionReadFunc, {});
-    auto ival = unpickler.parse_ivalue();
-    for (auto&& t : ival.toTensorList()) {
-      tensors.emplace_back(std::move(t));
-    }
-  }
-  return {std::move(payload), std::move(tensors)};
+std::pair<std::vector<char>, std::vector<at::Tensor>> wireDeserialize(
+    const at::Tensor& buffer) {
+  TORCH_CHECK(
+      buffer.device().is_cpu() && buffer.is_contiguous(),
+      "wireDeserialize expects a contiguous CPU buffer");
+  auto aliasSection = [&buffer](const char* data, size_t size) -> at::DataPtr {
+    if (size == 0 ||
+        reinterpret_cast<uintptr_t>(data) % kWireAlignment != 0) {
+      return copySection(data, size);
+    }
+    // The section stays valid for as long as the tensor holding the received
+    // bytes is alive, so keep a reference to it in the DataPtr context.
+    return at::DataPtr(
+        const_cast<char*>(data),
+        new at::Tensor(buffer),
+        [](void* ctx) { delete static_cast<at::Tensor*>(ctx); },
+        at::Device(at::DeviceType::CPU));
+  };
+  return wireDeserializeImpl(
+      buffer.data_ptr(), buffer.numel() * buffer.element_size(), aliasSection);
 }
 
 TensorPipeEntry tensorpipeSerialize(const Message& rpcMessage) {
@@ -40,6 +40,12 @@ TORCH_API std::pair<std::vector<char>, std::vector<at::Tensor>> wireDeserialize(
     const void* data,
     size_t data_size);
 
+// Same as above, but tensor sections that are suitably aligned within
+// ``buffer`` are not copied: the returned tensors alias its memory and keep
+// ``buffer`` alive. Sections that are not aligned fall back to a copy.
+TORCH_API std::pair<std::vector<char>, std::vector<at::Tensor>> wireDeserialize(
+    const at::Tensor& buffer);
+
 // TensorPipeEntry represents serialized tensorpipe message,
 // plus reserved tensor datas to keep memory lifetime.
 struct TensorPipeEntry {
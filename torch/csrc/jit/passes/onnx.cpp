@@ -291,8 +291,18 @@ void BlockToONNX(
 
     WithInsertPoint insert_point_guard(ctx.block);
     WithCurrentScope scope_guard(*ctx.block->owningGraph(), n->scope());
+    // The environment is converted to a Python dict on every call, which
+    // takes time linear in the number of nodes converted so far. Only the
+    // symbolics of nodes with blocks (prim::Loop and prim::If) use it, so pass
+    // an empty one to all the other nodes.
+    static const std::unordered_map<Value*, Value*> empty_env;
+    const auto& symbolic_env = n->blocks().empty() ? empty_env : env;
     py::object raw_output = onnx.attr("_run_symbolic_function")(
-        ctx.block->owningGraph(), n, py_inputs, env, operator_export_type);
+        ctx.block->owningGraph(),
+        n,
+        py_inputs,
+        symbolic_env,
+        operator_export_type);
 
     // TODO: Assert it's an ATen identifier???
     // (Sometimes it's not...)
@@ -17,11 +17,16 @@ void initThroughputBenchmarkBindings(PyObject* module) {
       .def_readwrite("num_worker_threads", &BenchmarkConfig::num_worker_threads)
       .def_readwrite("num_warmup_iters", &BenchmarkConfig::num_warmup_iters)
       .def_readwrite("num_iters", &BenchmarkConfig::num_iters)
-      .def_readwrite("profiler_output_path", &BenchmarkConfig::profiler_output_path);
+      .def_readwrite("profiler_output_path", &BenchmarkConfig::profiler_output_path)
+      .def_readwrite("target_qps", &BenchmarkConfig::target_qps)
+      .def_readwrite("poisson_arrivals", &BenchmarkConfig::poisson_arrivals)
+      .def_readwrite("num_intra_op_threads", &BenchmarkConfig::num_intra_op_threads);
 
   py::class_<BenchmarkExecutionStats>(m, "BenchmarkExecutionStats")
       .def_readonly("latency_avg_ms", &BenchmarkExecutionStats::latency_avg_ms)
-      .def_readonly("num_iters", &BenchmarkExecutionStats::num_iters);
+      .def_readonly("num_iters", &BenchmarkExecutionStats::num_iters)
+      .def_readonly("total_time_ms", &BenchmarkExecutionStats::total_time_ms)
+      .def_readonly("latencies_ms", &BenchmarkExecutionStats::latencies_ms);
 
   py::class_<ThroughputBenchmark>(m, "ThroughputBenchmark", py::dynamic_attr())
       .def(py::init<jit::Module>())
@@ -1,5 +1,6 @@
 #pragma once
 
+#include <chrono>
 #include <random>
 #include <thread>
 
@@ -20,6 +21,7 @@ BenchmarkExecutionStats BenchmarkHelper<Input, Output, Model>::benchmark(
   TORCH_CHECK(
       config.num_worker_threads == 1,
       "Only parallelization by callers is supported");
+  TORCH_CHECK(config.num_iters > 0, "num_iters must be positive");
 
   LOG(INFO) << at::get_parallel_info();
 
@@ -48,6 +50,36 @@ BenchmarkExecutionStats BenchmarkHelper<Input, Output, Model>::benchmark(
     }
   }
 
+  using Clock = std::chrono::high_resolution_clock;
+  using TimePoint = std::chrono::time_point<Clock>;
+  TimePoint start_time;
+
+  // In the open-loop mode request i arrives at start_time + arrivals[i],
+  // independently of how fast the previous requests are served
+  const bool open_loop = config.target_qps > 0;
+  std::vector<Clock::duration> arrivals;
+  if (open_loop) {
+    std::random_device seeder;
+    std::mt19937 engine(seeder());
+    std::exponential_distribution<double> interarrival(config.target_qps);
+    double arrival_s = 0;
+    arrivals.reserve(config.num_iters);
+    for (int64_t i = 0; i < config.num_iters; ++i) {
+      arrivals.push_back(std::chrono::duration_cast<Clock::duration>(
+          std::chrono::duration<double>(arrival_s)));
+      arrival_s += config.poisson_arrivals ? interarrival(engine)
+                                           : 1.0 / config.target_qps;
+    }
+  }
+  std::vector<float> latencies_ms(config.num_iters);
+
+  const int previous_num_threads = at::get_num_threads();
+  const bool set_num_threads = config.num_intra_op_threads > 0 &&
+      config.num_intra_op_threads != previous_num_threads;
+  if (set_num_threads) {
+    at::set_num_threads(config.num_intra_op_threads);
+  }
+
   std::mutex m;
   std::condition_variable worker_main_cv;
   std::condition_variable main_worker_cv;
@@ -61,6 +93,8 @@ BenchmarkExecutionStats BenchmarkHelper<Input, Output, Model>::benchmark(
   for (auto thread_id = 0; thread_id < config.num_calling_threads;
        ++thread_id) {
     callers.emplace_back([&, thread_id]() {
+      // Make the intra-op parallelism of this thread match the global setting
+      at::init_num_threads();
       // We use conditional variable as a barrier to make sure each thread
       // performs required warmeup iterations before we start measuring
       for (auto j = 0; j < config.num_warmup_iters; ++j) {
@@ -76,9 +110,24 @@ BenchmarkExecutionStats BenchmarkHelper<Input, Output, Model>::benchmark(
         }
       }
       LOG(INFO) << "Starting forward thread " << thread_id;
-      while (num_attempted_iters.fetch_add(1) < config.num_iters) {
+      int64_t iter;
+      while ((iter = num_attempted_iters.fetch_add(1)) < config.num_iters) {
+        TimePoint request_time;
+        if (open_loop) {
+          // Requests are taken in order of arrival by the first free thread.
+          // A late request has been queueing since its arrival
+          request_time = start_time + arrivals[iter];
+          std::this_thread::sleep_until(request_time);
+        } else {
+          request_time = Clock::now();
+        }
         runOnce(std::move(thread_inputs[thread_id][input_iters[thread_id]]));
         ++input_iters[thread_id];
+        latencies_ms[iter] =
+            std::chrono::duration_cast<std::chrono::nanoseconds>(
+                Clock::now() - request_time)
+                .count() /
+            1000.0 / 1000.0;
       }
 
       {
@@ -92,10 +141,6 @@ BenchmarkExecutionStats BenchmarkHelper<Input, Output, Model>::benchmark(
     });
   }
 
-  using Clock = std::chrono::high_resolution_clock;
-  using TimePoint = std::chrono::time_point<Clock>;
-  TimePoint start_time;
-
   std::unique_ptr<torch::autograd::profiler::RecordProfile> profiler_guard;
   {
     std::unique_lock<std::mutex> lock(m);
@@ -128,16 +173,31 @@ BenchmarkExecutionStats BenchmarkHelper<Input, Output, Model>::benchmark(
                             end_time - start_time)
                             .count() /
       1000.0 / 1000.0;
-  // We use config.num_iters instead of num_attempted_iters as it is
-  // repsesatative of the real work done. Last attempted iteration on each
-  // calling threads doesn't represent the real work (i.e. running the model)
-  stats.latency_avg_ms =
-      total_time_ms * config.num_calling_threads / config.num_iters;
+  if (open_loop) {
+    // Threads are idle between requests, so the average latency has to be
+    // computed from the latencies of the requests
+    double latency_sum_ms = 0;
+    for (auto latency_ms : latencies_ms) {
+      latency_sum_ms += latency_ms;
+    }
+    stats.latency_avg_ms = latency_sum_ms / config.num_iters;
+  } else {
+    // We use config.num_iters instead of num_attempted_iters as it is
+    // repsesatative of the real work done. Last attempted iteration on each
+    // calling threads doesn't represent the real work (i.e. running the model)
+    stats.latency_avg_ms =
+        total_time_ms * config.num_calling_threads / config.num_iters;
+  }
   stats.num_iters = config.num_iters;
+  stats.total_time_ms = total_time_ms;
+  stats.latencies_ms = std::move(latencies_ms);
 
   for (auto& t : callers) {
     t.join();
   }
+  if (set_num_threads) {
+    at::set_num_threads(previous_num_threads);
+  }
   return stats;
 }
 
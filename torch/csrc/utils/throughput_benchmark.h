@@ -23,6 +23,12 @@ namespace throughput_benchmark {
 struct BenchmarkExecutionStats {
   float latency_avg_ms{-1};
   int64_t num_iters{-1};
+  // Wall time of the main benchmark loop
+  float total_time_ms{-1};
+  // Latency of every iteration. In the open-loop mode this is measured from
+  // the scheduled arrival of the request, so it includes the time the request
+  // waited for a free calling thread
+  std::vector<float> latencies_ms;
 };
 
 std::ostream& operator<<(std::ostream& os, const BenchmarkExecutionStats& value);
@@ -57,6 +63,19 @@ struct BenchmarkConfig {
   // before the main benchmark loop (but after the warmup):
   // RecordProfile guard(profiler_output_path);
   std::string profiler_output_path{""};
+  // If positive, requests arrive at this rate (requests per second) whether or
+  // not the previous requests are finished, and are served by the calling
+  // threads in order of arrival (open loop). Otherwise every calling thread
+  // issues its next request as soon as the previous one is finished (closed
+  // loop)
+  double target_qps{0};
+  // In the open-loop mode, draw the times between requests from an
+  // exponential distribution (Poisson arrivals) instead of spacing them
+  // evenly
+  bool poisson_arrivals{false};
+  // If positive, the number of intra-op threads (at::set_num_threads) used
+  // during the benchmark. The previous setting is restored afterwards
+  int num_intra_op_threads{0};
 };
 
 namespace detail {
@@ -1,3 +1,5 @@
+import os
+import pickle
 import torch
 import warnings
 from torch._six import string_classes
@@ -244,6 +246,57 @@ def _check_tensor_list(param, param_name):
                            "to be of type List[torch.Tensor].".format(param_name))
 
 
+def _object_device(group):
+    """
+    Helper that returns the device that serialized objects have to be placed
+    on to be exchanged through the given group's backend.
+
+    """
+    if get_backend(group) == Backend.NCCL:
+        return torch.device("cuda", torch.cuda.current_device())
+    return torch.device("cpu")
+
+
+def _object_to_tensor(obj):
+    """
+    Helper that pickles ``obj`` into a uint8 tensor and returns it along with
+    its length.
+
+    """
+    buf = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+    byte_tensor = torch.ByteTensor(torch.ByteStorage.from_buffer(buf))
+    return byte_tensor, byte_tensor.numel()
+
+
+def _tensor_to_object(tensor, size):
+    """
+    Helper that unpickles the first ``size`` bytes of a uint8 tensor.
+
+    """
+    buf = tensor[:size].cpu().numpy().tobytes()
+    return pickle.loads(buf)
+
+
+def _pad_object_tensor(obj, group, device):
+    """
+    Helper that pickles ``obj``, all-gathers the pickled sizes across
+    ``group`` and returns the local byte tensor padded to the largest size
+    together with the list of per-rank sizes.
+
+    """
+    input_tensor, local_size = _object_to_tensor(obj)
+    group_size = _get_group_size(group)
+    local_size = torch.tensor([local_size], dtype=torch.long, device=device)
+    object_sizes = [torch.zeros(1, dtype=torch.long, device=device)
+                    for _ in range(group_size)]
+    all_gather(object_sizes, local_size, group=group)
+    object_sizes = [int(size.item()) for size in object_sizes]
+
+    padded = torch.zeros(max(object_sizes), dtype=torch.uint8, device=device)
+    padded[:input_tensor.numel()] = input_tensor
+    return padded, object_sizes
+
+
 def is_mpi_available():
     """
     Checks if the MPI backend is available.
@@ -850,6 +903,63 @@ def broadcast(tensor,
         work.wait()
 
 
+def broadcast_object_list(object_list, src, group=group.WORLD):
+    """
+    Broadcasts picklable objects in ``object_list`` to the whole group.
+
+    All objects are pickled into a single byte buffer on ``src``, so the
+    operation costs two collectives (one for the object sizes, one for the
+    payload) regardless of the number of objects.
+
+    Arguments:
+        object_list (List[Any]): List of input objects to broadcast. Each
+            object must be picklable. Only objects on the ``src`` rank will be
+            broadcast, but each rank must provide lists of equal sizes. On
+            return, non-``src`` ranks hold the received objects in place.
+        src (int): Source rank from which to broadcast ``object_list``.
+        group (ProcessGroup, optional): The process group to work on
+
+    Returns:
+        None. If rank is part of the group, ``object_list`` will contain the
+        broadcasted objects from ``src`` rank.
+
+    .. note:: Objects are unpickled on the receiving ranks, which will execute
+        arbitrary code embedded in the pickle. Only use this function with
+        data you trust.
+
+    """
+    if not isinstance(object_list, list):
+        raise RuntimeError("Invalid function argument. Expected parameter "
+                           "`object_list` to be of type list.")
+    if _rank_not_in_group(group):
+        return
+
+    device = _object_device(group)
+    my_rank = get_rank()
+    if my_rank == src:
+        tensors = [_object_to_tensor(obj)[0] for obj in object_list]
+        object_sizes = torch.tensor([t.numel() for t in tensors],
+                                    dtype=torch.long, device=device)
+    else:
+        object_sizes = torch.zeros(len(object_list), dtype=torch.long,
+                                   device=device)
+    broadcast(object_sizes, src=src, group=group)
+
+    if my_rank == src:
+        object_tensor = torch.cat(
+            tensors + [torch.empty(0, dtype=torch.uint8)]).to(device)
+    else:
+        total_size = int(object_sizes.sum().item())
+        object_tensor = torch.empty(total_size, dtype=torch.uint8, device=device)
+    broadcast(object_tensor, src=src, group=group)
+
+    if my_rank != src:
+        offset = 0
+        for i, size in enumerate(object_sizes.tolist()):
+            object_list[i] = _tensor_to_object(object_tensor[offset:], size)
+            offset += size
+
+
 def all_reduce_multigpu(tensor_list,
                         op=ReduceOp.SUM,
                         group=group.WORLD,
@@ -1191,6 +1301,51 @@ def all_gather(tensor_list,
     else:
         work.wait()
 
+
+def all_gather_object(object_list, obj, group=group.WORLD):
+    """
+    Gathers picklable objects from the whole group into a list.
+
+    Each rank pickles ``obj`` into a byte tensor. The sizes are exchanged in
+    one collective and the payloads, padded to the largest size, in a second
+    one, independent of how large or nested the objects are.
+
+    Arguments:
+        object_list (list[Any]): Output list. It should be correctly sized as
+            the size of the group for this collective and will contain the
+            output.
+        obj (Any): Picklable Python object to be broadcast from current process.
+        group (ProcessGroup, optional): The process group to work on
+
+    Returns:
+        None. If the calling rank is part of this group, the output of the
+        collective will be populated into the input ``object_list``.
+
+    .. note:: Objects are unpickled on every rank, which will execute arbitrary
+        code embedded in the pickle. Only use this function with data you
+        trust.
+
+    """
+    if _rank_not_in_group(group):
+        return
+
+    group_size = _get_group_size(group)
+    if not isinstance(object_list, list) or len(object_list) != group_size:
+        raise RuntimeError("Invalid function argument. Expected parameter "
+                           "`object_list` to be a list of size {}."
+                           .format(group_size))
+
+    device = _object_device(group)
+    input_tensor, object_sizes = _pad_object_tensor(obj, group, device)
+    max_size = input_tensor.numel()
+    output_tensors = [torch.empty(max_size, dtype=torch.uint8, device=device)
+                      for _ in range(group_size)]
+    all_gather(output_tensors, input_tensor, group=group)
+
+    for i, (tensor, size) in enumerate(zip(output_tensors, object_sizes)):
+        object_list[i] = _tensor_to_object(tensor, size)
+
+
 def all_gather_coalesced(output_tensor_lists,
                          input_tensor_list,
                          group=group.WORLD,
@@ -1323,6 +1478,63 @@ def gather(tensor,
         work.wait()
 
 
+def gather_object(obj, object_gather_list=None, dst=0, group=group.WORLD):
+    """
+    Gathers picklable objects from the whole group in a single process.
+
+    Object sizes are first all-gathered so that every rank can pad its
+    payload to the same length, then the payloads are gathered on ``dst`` in
+    a single collective.
+
+    Arguments:
+        obj (Any): Input object. Must be picklable.
+        object_gather_list (list[Any], optional): Output list. On the ``dst``
+            rank, it should be correctly sized as the size of the group for
+            this collective and will contain the output. Must be ``None`` on
+            non-dst ranks. (default is ``None``)
+        dst (int, optional): Destination rank (default is 0)
+        group (ProcessGroup, optional): The process group to work on
+
+    Returns:
+        None. On the ``dst`` rank, ``object_gather_list`` will contain the
+        output of the collective.
+
+    .. note:: Objects are unpickled on the ``dst`` rank, which will execute
+        arbitrary code embedded in the pickle. Only use this function with
+        data you trust.
+
+    """
+    if _rank_not_in_group(group):
+        return
+
+    group_size = _get_group_size(group)
+    my_rank = get_rank()
+    if dst == my_rank:
+        if not isinstance(object_gather_list, list) or \
+           len(object_gather_list) != group_size:
+            raise ValueError("Argument ``object_gather_list`` must be a list "
+                             "of size {} on destination rank.".format(group_size))
+    elif object_gather_list is not None:
+        raise ValueError("Argument ``object_gather_list`` must NOT be "
+                         "specified on non-destination ranks.")
+
+    device = _object_device(group)
+    input_tensor, object_sizes = _pad_object_tensor(obj, group, device)
+    max_size = input_tensor.numel()
+    if dst == my_rank:
+        output_tensors = [
+            torch.empty(max_size, dtype=torch.uint8, device=device)
+            for _ in range(group_size)
+        ]
+    else:
+        output_tensors = None
+    gather(input_tensor, gather_list=output_tensors, dst=dst, group=group)
+
+    if dst == my_rank:
+        for i, (tensor, size) in enumerate(zip(output_tensors, object_sizes)):
+            object_gather_list[i] = _tensor_to_object(tensor, size)
+
+
 def scatter(tensor,
             scatter_list=None,
             src=0,
@@ -1792,3 +2004,112 @@ def new_group(ranks=None, timeout=default_pg_timeout, backend=None):
     }
 
     return pg
+
+
+class HierarchicalGroup(object):
+    """
+    Handle returned by :func:`new_hierarchical_group`.
+
+    It bundles the intra-node process group this process belongs to and the
+    inter-node process group connecting the node leaders (the lowest global
+    rank on every node). On processes that are not node leaders,
+    ``inter_group`` is ``GroupMember.NON_GROUP_MEMBER``.
+
+    """
+    def __init__(self, intra_group, inter_group, leader_rank, local_world_size):
+        self.intra_group = intra_group
+        self.inter_group = inter_group
+        self.leader_rank = leader_rank
+        self.local_world_size = local_world_size
+
+    def is_leader(self):
+        return get_rank() == self.leader_rank
+
+
+def new_hierarchical_group(local_world_size=None,
+                           timeout=default_pg_timeout,
+                           backend=None):
+    """
+    Creates the intra-node and inter-node groups used by hierarchical
+    collectives such as :func:`hierarchical_all_reduce`.
+
+    Global ranks are assumed to be laid out node by node, as done by
+    ``torch.distributed.launch``: ranks ``[n * local_world_size,
+    (n + 1) * local_world_size)`` live on node ``n``. Like :func:`new_group`,
+    this function must be entered by all processes of the default group.
+
+    Arguments:
+        local_world_size (int, optional): Number of processes per node. By
+            default it is read from the ``LOCAL_WORLD_SIZE`` environment
+            variable set by ``torch.distributed.launch``. Passing a smaller
+            value simulates several nodes on one machine.
+        timeout (timedelta, optional): Timeout for operations executed against
+            the created process groups. See :func:`new_group`.
+        backend (str or Backend, optional): The backend to use for the
+            created process groups. See :func:`new_group`.
+
+    Returns:
+        A :class:`HierarchicalGroup` handle.
+    """
+    _check_default_pg()
+
+    if local_world_size is None:
+        if "LOCAL_WORLD_SIZE" not in os.environ:
+            raise ValueError("local_world_size must be given when the "
+                             "LOCAL_WORLD_SIZE environment variable is not set")
+        local_world_size = int(os.environ["LOCAL_WORLD_SIZE"])
+
+    global_rank = _default_pg.rank()
+    global_world_size = _default_pg.size()
+    if local_world_size <= 0 or global_world_size % local_world_size != 0:
+        raise ValueError("The world size ({}) must be a multiple of "
+                         "local_world_size ({})"
+                         .format(global_world_size, local_world_size))
+
+    num_nodes = global_world_size // local_world_size
+    node = global_rank // local_world_size
+    intra_group = None
+    for n in range(num_nodes):
+        ranks = list(range(n * local_world_size, (n + 1) * local_world_size))
+        pg = new_group(ranks, timeout=timeout, backend=backend)
+        if n == node:
+            intra_group = pg
+
+    leaders = [n * local_world_size for n in range(num_nodes)]
+    inter_group = new_group(leaders, timeout=timeout, backend=backend)
+
+    return HierarchicalGroup(intra_group,
+                             inter_group,
+                             node * local_world_size,
+                             local_world_size)
+
+
+def hierarchical_all_reduce(tensor,
+                            hierarchical_group,
+                            op=ReduceOp.SUM):
+    """
+    Reduces the tensor data across all machines like :func:`all_reduce`, but
+    in three stages: a reduce onto the node leader within every node, an
+    all-reduce across the node leaders and a broadcast back within every
+    node. Only the node leaders take part in inter-node communication.
+
+    Arguments:
+        tensor (Tensor): Input and output of the collective. The function
+            operates in-place.
+        hierarchical_group (HierarchicalGroup): Groups created by
+            :func:`new_hierarchical_group`.
+        op (optional): One of the values from
+            ``torch.distributed.ReduceOp``
+            enum.  Specifies an operation used for element-wise reductions.
+
+    Returns:
+        None
+
+    """
+    _check_single_tensor(tensor, "tensor")
+
+    leader = hierarchical_group.leader_rank
+    reduce(tensor, leader, op=op, group=hierarchical_group.intra_group)
+    if hierarchical_group.is_leader():
+        all_reduce(tensor, op=op, group=hierarchical_group.inter_group)
+    broadcast(tensor, leader, group=hierarchical_group.intra_group)
@@ -129,6 +129,11 @@ utility
 ``args.local_rank`` with ``os.environ['LOCAL_RANK']``; the launcher
 will not pass ``--local_rank`` when you specify this flag.
 
+6. The number of processes spawned on each node is exported to the
+subprocesses as ``LOCAL_WORLD_SIZE``. It is used by
+:func:`torch.distributed.new_hierarchical_group` to build intra-node and
+inter-node groups.
+
 .. warning::
 
     ``local_rank`` is NOT globally unique: it is only unique per process
@@ -228,6 +233,7 @@ def main():
         dist_rank = args.nproc_per_node * args.node_rank + local_rank
         current_env["RANK"] = str(dist_rank)
         current_env["LOCAL_RANK"] = str(local_rank)
+        current_env["LOCAL_WORLD_SIZE"] = str(args.nproc_per_node)
 
         # spawn the processes
         with_python = not args.no_python
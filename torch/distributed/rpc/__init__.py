@@ -16,7 +16,7 @@ if is_available() and not torch._C._rpc_init():
 
 
 if is_available():
-    from . import api, backend_registry
+    from . import api, backend_registry, functions
     from .api import *  # noqa: F401
     import torch.distributed.autograd as dist_autograd
 
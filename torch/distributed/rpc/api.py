@@ -31,6 +31,8 @@ from .internal import (
     RPCExecMode,
     _internal_rpc_pickler,
     _build_rpc_profiling_key,
+    _handle_exception,
+    _run_batched_calls,
 )
 
 from .constants import UNSET_RPC_TIMEOUT
@@ -688,3 +690,74 @@ def rpc_async(to, func, args=None, kwargs=None, timeout=UNSET_RPC_TIMEOUT):
         >>> rpc.shutdown()
     """
     return _invoke_rpc(to, func, RPCExecMode.ASYNC, args, kwargs, timeout)
+
+
+class _BatchedCallFuture(object):
+    r"""
+    Future of a single call sent through :meth:`rpc_async_batch`. All calls of
+    a batch share the future of the message that carried them.
+    """
+
+    def __init__(self, batch_fut, index):
+        self._batch_fut = batch_fut
+        self._index = index
+
+    def wait(self):
+        result = self._batch_fut.wait()[self._index]
+        _handle_exception(result)
+        return result
+
+
+@_require_initialized
+def rpc_async_batch(to, calls, timeout=UNSET_RPC_TIMEOUT):
+    r"""
+    Make several non-blocking RPC calls to worker ``to`` using a single RPC
+    message. The callee runs the calls one after the other on the same
+    thread, which saves the per-message overhead when sending many small
+    requests to the same worker.
+
+    Arguments:
+        to (str or WorkerInfo): id or name of the destination worker.
+        calls (list): a list of ``(func, args, kwargs)`` tuples, where ``args``
+                      and ``kwargs`` may be omitted or ``None``. ``func`` has
+                      to be a Python callable; TorchScript functions are not
+                      supported.
+        timeout (float, optional): timeout in seconds to use for the whole
+                                   batch. See :meth:`rpc_async`.
+
+    Returns:
+        A list of Future-like objects, one per call, whose ``wait()`` returns
+        the result of the corresponding call or raises its exception.
+
+    Example::
+        >>> # On worker 0:
+        >>> import torch
+        >>> import torch.distributed.rpc as rpc
+        >>> rpc.init_rpc("worker0", rank=0, world_size=2)
+        >>> futs = rpc.rpc_async_batch(
+        >>>     "worker1",
+        >>>     [(torch.add, (torch.ones(2), 3)), (min, (1, 2)), (max, (1, 2))]
+        >>> )
+        >>> results = [fut.wait() for fut in futs]
+        >>> rpc.shutdown()
+
+        >>> # On worker 1:
+        >>> import torch.distributed.rpc as rpc
+        >>> rpc.init_rpc("worker1", rank=1, world_size=2)
+        >>> rpc.shutdown()
+    """
+    python_udfs = []
+    for call in calls:
+        func, args, kwargs = (tuple(call) + (None, None))[:3]
+        if not callable(func):
+            raise TypeError("function should be callable.")
+        if isinstance(func, torch.jit.ScriptFunction):
+            raise TypeError(
+                "rpc_async_batch does not support TorchScript functions."
+            )
+        python_udfs.append(PythonUDF(func, args if args else (), kwargs if kwargs else {}))
+
+    fut = _invoke_rpc(
+        to, _run_batched_calls, RPCExecMode.ASYNC, args=(python_udfs,), rpc_timeout=timeout
+    )
+    return [_BatchedCallFuture(fut, i) for i in range(len(python_udfs))]
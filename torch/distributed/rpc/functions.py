@@ -0,0 +1,211 @@
+import functools
+import threading
+import time
+
+from . import Future
+
+
+class _PendingCall(object):
+    __slots__ = ["args", "result", "error", "done"]
+
+    def __init__(self, args):
+        self.args = args
+        self.result = None
+        self.error = None
+        self.done = False
+
+
+class _Batcher(object):
+    r"""
+    Collects concurrent invocations of a batched function. The first caller
+    that finds no open batch becomes its leader: it waits until the batch is
+    full or ``max_wait_ms`` has elapsed, runs the function once on the whole
+    batch and hands every other caller its own result.
+    """
+
+    def __init__(self, fn, max_batch_size, max_wait_ms):
+        self.fn = fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.cv = threading.Condition()
+        self.pending = None
+
+    def __call__(self, *args, **kwargs):
+        if kwargs:
+            raise TypeError(
+                "Functions decorated with @rpc.functions.batch only accept "
+                "positional arguments, got keyword arguments {}".format(
+                    list(kwargs.keys())
+                )
+            )
+        call = _PendingCall(args)
+        with self.cv:
+            is_leader = self.pending is None
+            if is_leader:
+                batch = self.pending = [call]
+            else:
+                self.pending.append(call)
+            if len(self.pending) >= self.max_batch_size:
+                # Close the full batch and wake up its leader.
+                self.pending = None
+                self.cv.notify_all()
+
+            if is_leader:
+                deadline = time.time() + self.max_wait
+                while len(batch) < self.max_batch_size:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        break
+                    self.cv.wait(remaining)
+                if self.pending is batch:
+                    self.pending = None
+            else:
+                while not call.done:
+                    self.cv.wait()
+
+        if is_leader:
+            self._run(batch)
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def _run(self, batch):
+        result, error = None, None
+        try:
+            num_args = len(batch[0].args)
+            if any(len(call.args) != num_args for call in batch):
+                raise TypeError(
+                    "All calls to a batched function must pass the same "
+                    "number of positional arguments"
+                )
+            # Transpose the calls so that every positional parameter of the
+            # function receives the list of values passed by all callers.
+            batched_args = [[call.args[i] for call in batch] for i in range(num_args)]
+            result = list(self.fn(*batched_args))
+            if len(result) != len(batch):
+                raise RuntimeError(
+                    "Batched function {} returned {} results for a batch of "
+                    "{} calls".format(self.fn.__name__, len(result), len(batch))
+                )
+        except Exception as e:
+            error = e
+
+        with self.cv:
+            for i, call in enumerate(batch):
+                if error is not None:
+                    call.error = error
+                else:
+                    call.result = result[i]
+                call.done = True
+            self.cv.notify_all()
+
+
+def batch(max_batch_size=32, max_wait_ms=1.0):
+    r"""
+    A decorator for functions invoked through RPC that coalesces concurrent
+    calls into a single invocation.
+
+    The decorated function is written for a batch: each of its positional
+    parameters receives the list of the values that the individual callers
+    passed for it, and it must return a sequence with one result per caller.
+    Callers keep using the decorated function as if it took a single set of
+    arguments; each call blocks until the batch it joined has run and then
+    returns its own result. If the function raises, every call in the batch
+    raises the same exception.
+
+    A batch runs once it holds ``max_batch_size`` calls or ``max_wait_ms``
+    milliseconds after its first call arrived, whichever comes first. Only
+    calls that are executing concurrently can be batched together, so the
+    achievable batch size is bounded by the number of threads the RPC agent
+    uses to run requests.
+
+    Arguments:
+        max_batch_size (int): maximum number of calls in one batch.
+        max_wait_ms (float): maximum time in milliseconds the first call of a
+                             batch waits for more calls to arrive.
+
+    Example::
+        >>> # On the server:
+        >>> import torch
+        >>> import torch.distributed.rpc as rpc
+        >>>
+        >>> @rpc.functions.batch(max_batch_size=16, max_wait_ms=2)
+        >>> def lookup(ids):
+        >>>     # ``ids`` holds one tensor per concurrent caller.
+        >>>     out = embedding(torch.cat(ids))
+        >>>     return out.split([len(i) for i in ids])
+        >>>
+        >>> # On the clients:
+        >>> rows = rpc.rpc_sync("server", lookup, args=(torch.tensor([3, 7]),))
+    """
+    if max_batch_size < 1:
+        raise ValueError(
+            "max_batch_size must be positive, got {}".format(max_batch_size)
+        )
+    if max_wait_ms < 0:
+        raise ValueError(
+            "max_wait_ms must be non-negative, got {}".format(max_wait_ms)
+        )
+
+    def decorator(fn):
+        batcher = _Batcher(fn, max_batch_size, max_wait_ms)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            return batcher(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def async_execution(fn):
+    r"""
+    A decorator for functions that return a :class:`~torch.distributed.rpc.Future`
+    instead of a value when run through RPC (e.g. :meth:`~torch.distributed.rpc.rpc_sync`
+    or :meth:`~torch.distributed.rpc.rpc_async`).
+
+    The callee runs the function on an RPC thread as usual, but releases that
+    thread as soon as the function returns its Future. The response is sent
+    to the caller once the Future completes, with the value it completed
+    with. This lets a callee wait on nested RPCs or I/O without blocking one
+    of the agent's threads per pending request. The Future can come from a
+    nested :meth:`~torch.distributed.rpc.rpc_async`, be chained with
+    ``Future.then()``, or be created by the function and completed later with
+    ``Future.set_result()``.
+
+    Example::
+        >>> # On all workers:
+        >>> import torch
+        >>> import torch.distributed.rpc as rpc
+        >>>
+        >>> @rpc.functions.async_execution
+        >>> def async_add_chained(to, x, y, z):
+        >>>     # This function runs on "worker1" and returns immediately when
+        >>>     # the nested RPC to "worker2" is sent.
+        >>>     return rpc.rpc_async(to, torch.add, args=(x, y)).then(
+        >>>         lambda fut: fut.wait() + z
+        >>>     )
+        >>>
+        >>> # On worker0:
+        >>> ret = rpc.rpc_sync(
+        >>>     "worker1",
+        >>>     async_add_chained,
+        >>>     args=("worker2", torch.ones(2), 1, 1)
+        >>> )
+        >>> print(ret)  # prints tensor([3., 3.])
+    """
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        ret = fn(*args, **kwargs)
+        if not isinstance(ret, Future):
+            raise TypeError(
+                "Functions decorated with @rpc.functions.async_execution must "
+                "return a torch.distributed.rpc.Future, but {} returned {}".format(
+                    fn.__name__, type(ret).__name__
+                )
+            )
+        return ret
+
+    return wrapper
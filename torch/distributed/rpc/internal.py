@@ -153,6 +153,16 @@ def _run_function(python_udf):
     return result
 
 
+def _run_batched_calls(python_udfs):
+    r"""
+    Runs a list of Python UDFs sent as one message by ``rpc_async_batch`` and
+    returns the list of their return values. Each exception is wrapped in a
+    ``RemoteException`` in place of the corresponding return value, so that
+    one failing call does not fail the others.
+    """
+    return [_run_function(python_udf) for python_udf in python_udfs]
+
+
 def _handle_exception(result):
     if isinstance(result, RemoteException):
         raise result.exception_type(result.msg)
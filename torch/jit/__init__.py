@@ -243,6 +243,76 @@ def export_opnames(m):
     """
     return torch._C._export_opnames(m._c)
 
+def freeze(mod, optimize=True):
+    r"""
+    Freezing a :class:`ScriptModule` will clone it and attempt to inline the cloned
+    module's submodules, parameters, and attributes as constants in the TorchScript IR Graph.
+    Only `forward` is preserved, and attributes that are modified within it
+    are kept as attributes. Frozen modules are meant for inference: they run
+    without looking up attributes and serialize without unused parameters.
+
+    Freezing requires the module to be in eval mode. A module in training mode
+    is cloned and the clone is switched to eval mode before freezing, so that
+    ``self.training`` is folded to ``False`` and the code paths only taken in
+    training are removed. The module passed in is never modified.
+
+    Freezing applies generic optimizations that speed up inference on any
+    backend: constant propagation over the inlined attributes, dead code
+    elimination, and, when ``optimize`` is set, folding of ``Conv2d`` followed by
+    ``BatchNorm2d`` into a single convolution and fusion of the ``addmm`` and
+    ``matmul`` followed by ``add`` patterns of linear layers into ``aten::linear``.
+
+    Arguments:
+        mod (:class:`ScriptModule`): a module to be frozen
+        optimize (bool): if ``True``, fold Conv-BatchNorm and Linear-add patterns
+            in addition to inlining attributes. Default: ``True``
+
+    Returns:
+        Frozen :class:`ScriptModule`.
+
+    Example (Freezing a simple module with a Parameter):
+
+    .. testcode::
+        import torch
+        class MyModule(torch.nn.Module):
+            def __init__(self, N, M):
+                super(MyModule, self).__init__()
+                self.weight = torch.nn.Parameter(torch.rand(N, M))
+                self.linear = torch.nn.Linear(N, M)
+
+            def forward(self, input):
+                output = self.weight.mm(input)
+                output = self.linear(output)
+                return output
+
+        scripted_module = torch.jit.script(MyModule(2, 3).eval())
+        frozen_module = torch.jit.freeze(scripted_module)
+        # parameters have been removed and inlined into the Graph as constants
+        assert len(list(frozen_module.named_parameters())) == 0
+        # See the compiled graph as Python code
+        print(frozen_module.code)
+    """
+    if not isinstance(mod, ScriptModule):
+        raise RuntimeError(
+            "Freezing expects a ScriptModule as input. "
+            "Please use torch.jit.script or torch.jit.trace to script your 'nn.Module'."
+        )
+
+    if mod.training:
+        mod = mod.copy()
+        mod.eval()
+
+    cpp_module = mod._c
+    if optimize:
+        # Folding returns a clone, so the graph of its forward can be rewritten
+        # in place. Linear patterns are fused before freezing, while the weight
+        # transposes they match are not folded into constants yet.
+        cpp_module = torch._C._jit_pass_fold_convbn(cpp_module)
+        graph = cpp_module._get_method('forward').graph
+        torch._C._jit_pass_inline(graph)
+        torch._C._jit_pass_fuse_linear(graph)
+    return torch.jit._recursive.wrap_cpp_module(torch._C._freeze_module(cpp_module))
+
 def _get_trace_graph(f, args=(), kwargs=None, strict=True, _force_outplace=False,
                      return_inputs=False, _return_inputs_states=False):
     """
@@ -1284,6 +1354,9 @@ def script(obj, optimize=None, _frames_up=0, _rcb=None):
         return obj
 
     if isinstance(obj, torch.nn.Module):
+        script_cache = torch.jit._script_cache.get_script_cache()
+        if script_cache is not None:
+            return script_cache.script(obj)
         return torch.jit._recursive.create_script_module(obj, torch.jit._recursive.infer_methods_to_compile)
 
     qualified_name = _qualified_name(obj)
@@ -2186,5 +2259,9 @@ function and does not have any attributes or Parameters.
 """
 set_module(ScriptFunction, "torch.jit")
 
+import torch.jit._script_cache
+from torch.jit._script_cache import enable_script_cache, disable_script_cache  # noqa: F401
+from torch.jit._bucketing import BucketedTracedModule, trace_bucketed, load_bucketed  # noqa: F401
+
 if not torch._C._jit_init():
     raise RuntimeError("JIT initialization failed")
@@ -0,0 +1,228 @@
+"""
+Tracing with one graph per bucket of input sizes.
+
+``torch.jit.trace`` records the operations run for one example input, so the
+resulting graph is specialized to control flow that depends on the shapes of
+that input. :class:`BucketedTracedModule` traces a module once per bucket of
+input sizes along one dimension and dispatches every call to the graph of its
+bucket.
+"""
+
+import bisect
+import collections
+import json
+
+import torch
+
+_METADATA_FILE = 'bucketing.json'
+
+
+def _pad_to(x, dim, size, value):
+    pad_shape = list(x.shape)
+    pad_shape[dim] = size - x.size(dim)
+    return torch.cat([x, x.new_full(pad_shape, value)], dim)
+
+
+class _FunctionModule(torch.nn.Module):
+    r"""Calls a function, so that tracing it gives a module rather than a
+    ``ScriptFunction``, which can't be saved as a submodule."""
+
+    def __init__(self, fn):
+        super(_FunctionModule, self).__init__()
+        self.fn = fn
+
+    def forward(self, *args):
+        return self.fn(*args)
+
+
+class BucketedTracedModule(torch.nn.Module):
+    r"""
+    Traces ``mod`` once per bucket of input sizes and dispatches calls to the
+    traced graph of their bucket.
+
+    The bucket of a call is the smallest boundary that is at least the size of
+    its input ``arg_index`` along dimension ``dim``. Graphs are traced lazily by
+    the first call that falls into their bucket, or ahead of time from
+    ``example_inputs``, and at most ``max_cached`` graphs are kept, evicting
+    the least recently used one. Calls larger than the largest boundary raise
+    an error.
+
+    With ``pad=True`` the input is padded with ``pad_value`` along ``dim`` to
+    the boundary of its bucket before calling the graph, which makes every
+    graph see a single shape. Outputs are returned as computed on the padded
+    input. Without padding, calls of a bucket reuse the graph traced for the
+    first input of that bucket, so all sizes of a bucket must take the same
+    shape-dependent control flow.
+
+    Use :meth:`save` and :func:`torch.jit.load_bucketed` to serialize the traced
+    graphs and the bucketing configuration as a single file.
+
+    Arguments:
+        mod (``nn.Module`` or callable): the module or function to trace.
+        boundaries (list of int, optional): upper bounds of the buckets. Can be
+            omitted if ``example_inputs`` is given.
+        example_inputs (dict, optional): maps bucket boundaries to a tuple of
+            example inputs used to trace the graph of the bucket immediately.
+        dim (int): dimension of the input that selects the bucket. Default: 1
+        arg_index (int): index of the positional argument that selects the
+            bucket. Default: 0
+        pad (bool): whether to pad the input to the boundary of its bucket.
+            Default: ``False``
+        pad_value (float): value used for padding. Default: 0
+        max_cached (int, optional): maximum number of traced graphs to keep.
+            Default: no limit
+        **trace_kwargs: other arguments passed to :func:`torch.jit.trace`.
+
+    Example::
+
+        >>> model = MySequenceModel()
+        >>> bucketed = torch.jit.trace_bucketed(model, boundaries=[16, 32, 64, 128], pad=True)
+        >>> out = bucketed(torch.randint(0, 100, (8, 20)))  # traced for length 32
+        >>> bucketed.save('model.pt')
+        >>> loaded = torch.jit.load_bucketed('model.pt')
+    """
+
+    def __init__(self, mod, boundaries=None, example_inputs=None, dim=1, arg_index=0,
+                 pad=False, pad_value=0, max_cached=None, **trace_kwargs):
+        super(BucketedTracedModule, self).__init__()
+        if boundaries is None:
+            if not example_inputs:
+                raise ValueError("Either boundaries or example_inputs must be given")
+            boundaries = example_inputs.keys()
+        boundaries = sorted(set(int(b) for b in boundaries))
+        if not boundaries or boundaries[0] <= 0:
+            raise ValueError("Bucket boundaries must be positive, got {}".format(boundaries))
+        if max_cached is not None and max_cached <= 0:
+            raise ValueError("max_cached must be positive, got {}".format(max_cached))
+        if isinstance(mod, torch.nn.Module):
+            self.module = mod
+        else:
+            self._fn = mod
+        self.boundaries = boundaries
+        self.dim = dim
+        self.arg_index = arg_index
+        self.pad = pad
+        self.pad_value = pad_value
+        self.max_cached = max_cached
+        self.trace_kwargs = trace_kwargs
+        self._traced = collections.OrderedDict()
+
+        for boundary, inputs in (example_inputs or {}).items():
+            if boundary not in self.boundaries:
+                raise ValueError("Example inputs given for {}, which is not a bucket "
+                                 "boundary".format(boundary))
+            if not isinstance(inputs, tuple):
+                inputs = (inputs,)
+            self._get_traced(boundary, inputs)
+
+    def _traceable(self):
+        if 'module' in self._modules:
+            return self.module
+        return getattr(self, '_fn', None)
+
+    def bucket_for(self, size):
+        r"""Returns the boundary of the bucket of inputs of size ``size``."""
+        index = bisect.bisect_left(self.boundaries, size)
+        if index == len(self.boundaries):
+            raise RuntimeError(
+                "Input of size {} along dimension {} is larger than the largest bucket "
+                "boundary {}".format(size, self.dim, self.boundaries[-1]))
+        return self.boundaries[index]
+
+    def traced_buckets(self):
+        r"""Returns the boundaries of the buckets that have a traced graph,
+        from the least to the most recently used one."""
+        return list(self._traced.keys())
+
+    def graph_for_bucket(self, boundary):
+        r"""Returns the traced module of the bucket with boundary ``boundary``."""
+        return self._traced[boundary]
+
+    def _get_traced(self, boundary, args):
+        traced = self._traced.get(boundary)
+        if traced is not None:
+            self._traced.move_to_end(boundary)
+            return traced
+        fn = self._traceable()
+        if fn is None:
+            raise RuntimeError(
+                "No graph was traced for the bucket of boundary {} and the original "
+                "module is not available to trace it".format(boundary))
+        if not isinstance(fn, torch.nn.Module):
+            fn = _FunctionModule(fn)
+        traced = torch.jit.trace(fn, args, **self.trace_kwargs)
+        self._traced[boundary] = traced
+        if self.max_cached is not None and len(self._traced) > self.max_cached:
+            self._traced.popitem(last=False)
+        return traced
+
+    def forward(self, *args):
+        x = args[self.arg_index]
+        size = x.size(self.dim)
+        boundary = self.bucket_for(size)
+        if self.pad and size < boundary:
+            args = list(args)
+            args[self.arg_index] = _pad_to(x, self.dim, boundary, self.pad_value)
+            args = tuple(args)
+        return self._get_traced(boundary, args)(*args)
+
+    def save(self, f):
+        r"""
+        Saves the traced graphs and the bucketing configuration to ``f`` as a
+        single TorchScript archive, which can be loaded with
+        :func:`torch.jit.load_bucketed`. The archive is a regular TorchScript
+        module with one submodule ``bucket_<boundary>`` per traced graph.
+
+        Arguments:
+            f: a file-like object or a string containing a file name
+        """
+        container = torch.nn.Module()
+        for boundary, traced in self._traced.items():
+            container.add_module('bucket_{}'.format(boundary), traced)
+        metadata = {
+            'boundaries': self.boundaries,
+            'traced': list(self._traced.keys()),
+            'dim': self.dim,
+            'arg_index': self.arg_index,
+            'pad': self.pad,
+            'pad_value': self.pad_value,
+            'max_cached': self.max_cached,
+        }
+        torch.jit.save(torch.jit.script(container), f,
+                       _extra_files={_METADATA_FILE: json.dumps(metadata)})
+
+    def extra_repr(self):
+        return 'boundaries={}, dim={}, arg_index={}, pad={}, traced={}'.format(
+            self.boundaries, self.dim, self.arg_index, self.pad, self.traced_buckets())
+
+
+def trace_bucketed(mod, boundaries=None, example_inputs=None, **kwargs):
+    r"""
+    Returns a :class:`BucketedTracedModule` that traces ``mod`` once per bucket
+    of input sizes, see :class:`BucketedTracedModule` for the arguments.
+    """
+    return BucketedTracedModule(mod, boundaries, example_inputs, **kwargs)
+
+
+def load_bucketed(f, map_location=None):
+    r"""
+    Loads a :class:`BucketedTracedModule` saved with
+    :meth:`BucketedTracedModule.save`. Only the buckets that were traced when
+    saving have a graph; calls in other buckets raise an error since the
+    original module is not available to trace them.
+
+    Arguments:
+        f: a file-like object or a string containing a file name
+        map_location: see :func:`torch.jit.load`
+    """
+    extra_files = {_METADATA_FILE: ''}
+    container = torch.jit.load(f, map_location, _extra_files=extra_files)
+    if not extra_files[_METADATA_FILE]:
+        raise RuntimeError("The file does not contain a bucketed traced module")
+    metadata = json.loads(extra_files[_METADATA_FILE])
+    bucketed = BucketedTracedModule(
+        None, metadata['boundaries'], dim=metadata['dim'], arg_index=metadata['arg_index'],
+        pad=metadata['pad'], pad_value=metadata['pad_value'], max_cached=metadata['max_cached'])
+    for boundary in metadata['traced']:
+        bucketed._traced[boundary] = getattr(container, 'bucket_{}'.format(boundary))
+    return bucketed
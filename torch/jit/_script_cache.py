@@ -0,0 +1,348 @@
+"""
+An opt-in on-disk cache of the code compiled by ``torch.jit.script`` for
+``nn.Module`` instances.
+
+Scripting a module infers the concrete types of all of its submodules, then
+parses and compiles every method. For large models this dominates process
+start up, and it is repeated every time although the code did not change. The
+cache stores the compiled module types of a scripted module on disk and, when
+the same module hierarchy is scripted again, loads them instead of compiling.
+
+An entry is keyed by the torch version, the contents of the source files that
+define the module classes of the hierarchy, and the structure of the module:
+the names and types of its attributes, parameters and buffers and the values
+of its non-tensor attributes, which may be baked into the compiled code.
+Entries only hold the compiled types: tensor attributes are saved empty, and
+the script module returned on a hit is built from the attributes of the module
+being scripted, exactly like a freshly compiled one.
+
+Entries are written to a temporary file and atomically renamed into place, so
+many processes can share a cache directory. Reading an entry updates its
+modification time, and the least recently used entries are removed once the
+cache grows beyond its maximum size.
+
+.. note::
+    Functions defined outside of the files of the module classes and compiled
+    recursively are not part of the key, so changes to them are not detected.
+    Clear the cache directory after changing such helpers. Module hierarchies
+    that contain already scripted modules are compiled without the cache.
+"""
+
+import functools
+import hashlib
+import inspect
+import os
+import tempfile
+import warnings
+
+import torch
+import torch._jit_internal as _jit_internal
+
+_ENTRY_SUFFIX = '.pt'
+_DEFAULT_MAX_SIZE = 1 << 30
+_SIMPLE_TYPES = (bool, int, float, str, type(None), torch.dtype, torch.device, torch.layout)
+
+
+class ScriptCache(object):
+    r"""
+    A directory holding compiled module types, see :func:`enable_script_cache`.
+
+    Arguments:
+        cache_dir (str): directory of the cache, created if it does not exist.
+        max_size (int): maximum total size in bytes of the cache entries.
+    """
+
+    def __init__(self, cache_dir, max_size=_DEFAULT_MAX_SIZE):
+        if max_size <= 0:
+            raise ValueError("max_size must be positive, got {}".format(max_size))
+        self.cache_dir = os.path.abspath(os.path.expanduser(cache_dir))
+        self.max_size = max_size
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # Hashes of source files, keyed by path and modification time.
+        self._source_hashes = {}
+
+    def script(self, nn_module):
+        r"""
+        Scripts ``nn_module`` like ``torch.jit.script``, loading its compiled
+        types from the cache if possible and storing them otherwise.
+        """
+        key = None
+        # Already scripted submodules are used as they are by torch.jit.script,
+        # their code isn't described by the source of their classes.
+        if not _contains_script_module(nn_module):
+            try:
+                key = self._key(nn_module)
+            except Exception as e:
+                warnings.warn("Not using the TorchScript cache for {}: {}".format(
+                    type(nn_module).__name__, e))
+
+        if key is not None:
+            script_module = self._load(key, nn_module)
+            if script_module is not None:
+                return script_module
+
+        script_module = torch.jit._recursive.create_script_module(
+            nn_module, torch.jit._recursive.infer_methods_to_compile)
+        if key is not None:
+            self._store(key, script_module)
+        return script_module
+
+    def clear(self):
+        r"""Removes all the entries of the cache."""
+        for path, _, _ in self._entries():
+            _remove(path)
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, key + _ENTRY_SUFFIX)
+
+    def _entries(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(_ENTRY_SUFFIX):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                # Removed by another process in the meantime.
+                continue
+            entries.append((path, stat.st_mtime, stat.st_size))
+        return entries
+
+    def _load(self, key, nn_module):
+        path = self._entry_path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            cached = torch.jit.load(path)
+            script_module = _instantiate(nn_module, cached._c)
+        except Exception as e:
+            warnings.warn("Ignoring invalid TorchScript cache entry {}: {}".format(path, e))
+            _remove(path)
+            return None
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        return script_module
+
+    def _store(self, key, script_module):
+        path = self._entry_path(key)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        os.close(fd)
+        try:
+            _make_skeleton(script_module).save(tmp_path)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            # E.g. modules calling @torch.jit.ignore'd functions can't be saved.
+            _remove(tmp_path)
+            warnings.warn("Could not store {} in the TorchScript cache: {}".format(
+                script_module.original_name, e))
+            return
+        self._evict()
+
+    def _evict(self):
+        entries = self._entries()
+        total_size = sum(size for _, _, size in entries)
+        for path, _, size in sorted(entries, key=lambda entry: entry[1]):
+            if total_size <= self.max_size:
+                break
+            _remove(path)
+            total_size -= size
+
+    def _key(self, nn_module):
+        hasher = hashlib.sha256()
+        hasher.update(torch.__version__.encode())
+        hasher.update(str(getattr(torch.version, 'git_version', None)).encode())
+        self._hash_module(nn_module, hasher)
+        return hasher.hexdigest()
+
+    def _hash_module(self, nn_module, hasher):
+        cls = type(nn_module)
+        hasher.update('{}.{}'.format(cls.__module__, cls.__qualname__).encode())
+        for base in inspect.getmro(cls):
+            if issubclass(base, torch.nn.Module) and base is not torch.nn.Module:
+                hasher.update(self._source_hash(base).encode())
+
+        for name, value in sorted(vars(nn_module).items()):
+            if name in ('_parameters', '_buffers', '_modules') or name.endswith('_hooks'):
+                continue
+            hasher.update(name.encode())
+            hasher.update(_describe_value(value).encode())
+        for kind in ('_parameters', '_buffers'):
+            for name, value in nn_module.__dict__[kind].items():
+                hasher.update('{}:{}:{}'.format(kind, name, _describe_value(value)).encode())
+        for name, submodule in nn_module._modules.items():
+            hasher.update('module:{}'.format(name).encode())
+            if submodule is None:
+                hasher.update(b'None')
+            else:
+                self._hash_module(submodule, hasher)
+
+    def _source_hash(self, cls):
+        path = inspect.getsourcefile(cls)
+        if path is None:
+            raise RuntimeError("the source of {} is not available".format(cls.__qualname__))
+        mtime = os.stat(path).st_mtime
+        cache_key = (path, mtime)
+        if cache_key not in self._source_hashes:
+            with open(path, 'rb') as f:
+                self._source_hashes[cache_key] = hashlib.sha256(f.read()).hexdigest()
+        return self._source_hashes[cache_key]
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _describe_value(value):
+    r"""
+    Describes ``value`` for the cache key: values that can be compiled as
+    constants or that determine the inferred type of an attribute are included,
+    tensors are described by their type only.
+    """
+    if isinstance(value, torch.jit.Attribute):
+        return 'Attribute({}, {})'.format(value.type, _describe_value(value.value))
+    if isinstance(value, torch.nn.Parameter):
+        return 'Parameter({}, {})'.format(value.dtype, value.dim())
+    if isinstance(value, torch.Tensor):
+        return 'Tensor({}, {})'.format(value.dtype, value.dim())
+    if isinstance(value, _SIMPLE_TYPES):
+        return repr(value)
+    if isinstance(value, (list, tuple)):
+        return '{}[{}]'.format(type(value).__name__, ', '.join(_describe_value(v) for v in value))
+    if isinstance(value, dict):
+        return 'dict[{}]'.format(', '.join(
+            '{}: {}'.format(_describe_value(k), _describe_value(v)) for k, v in value.items()))
+    if inspect.isfunction(value) or inspect.ismethod(value) or inspect.isbuiltin(value):
+        return 'function {}'.format(_qualified_name_or_repr(value))
+    return 'object {}.{}'.format(type(value).__module__, type(value).__qualname__)
+
+
+def _qualified_name_or_repr(fn):
+    return '{}.{}'.format(getattr(fn, '__module__', None), getattr(fn, '__qualname__', repr(fn)))
+
+
+def _contains_script_module(nn_module):
+    return any(isinstance(m, torch.jit.ScriptModule) for m in nn_module.modules())
+
+
+def _make_skeleton(script_module):
+    r"""
+    Returns a copy of the freshly compiled ``script_module`` of the same types
+    whose tensor attributes are empty, so that saving it only stores the
+    compiled code.
+    """
+    cpp_module = script_module._c
+    skeleton = torch._C._create_module_with_type(cpp_module._type())
+    concrete_type = script_module._concrete_type
+    for name, _ in concrete_type.get_attributes().items():
+        value = cpp_module.getattr(name)
+        if isinstance(value, torch.Tensor):
+            value = torch.empty(0, dtype=value.dtype)
+        skeleton.setattr(name, value)
+    for name, _ in concrete_type.get_modules():
+        skeleton.setattr(name, _make_skeleton(script_module._modules[name]))
+    return skeleton
+
+
+def _instantiate(nn_module, cached_module):
+    r"""
+    Creates a ScriptModule for ``nn_module`` using the compiled types of
+    ``cached_module``, mirroring ``torch.jit._recursive.create_script_module_impl``.
+    """
+    jit_type = cached_module._type()
+    # The slots of the compiled type are those of the concrete type of the
+    # module, the cached type only knows their names once loaded.
+    concrete_type = torch.jit._recursive.concrete_type_store.get_or_create_concrete_type(nn_module)
+    # The compiled methods belong to the compilation unit created by
+    # torch.jit.load, which types only reference weakly. A copy of the cached
+    # module keeps it alive, unlike a module created in the Python one.
+    cpp_module = cached_module._clone_instance()
+    cached_submodules = dict(torch._C.ModuleDict(cached_module).items())
+
+    def init_fn(script_module):
+        for name, _ in concrete_type.get_attributes().items():
+            orig_value = getattr(nn_module, name)
+            orig_value = orig_value.value if isinstance(orig_value, torch.jit.Attribute) else orig_value
+            cpp_module.setattr(name, orig_value)
+
+        for name, _ in concrete_type.get_modules():
+            scripted = _instantiate(getattr(nn_module, name), cached_submodules[name])
+            cpp_module.setattr(name, scripted)
+            script_module._modules[name] = scripted
+
+        for name in dir(nn_module):
+            item = getattr(nn_module, name, None)
+            if not inspect.ismethod(item):
+                continue
+            if _jit_internal.is_ignored_fn(item):
+                unbound_function = getattr(type(nn_module), name)
+                bound_method = unbound_function.__get__(script_module)
+                setattr(script_module, name, bound_method)
+
+        # Like a loaded module, the concrete type matches the cached JIT type,
+        # constants are copied so that they stay accessible from Python.
+        script_module._concrete_type = torch._C.ConcreteModuleType.from_jit_type(jit_type)
+        for name, value in concrete_type.get_constants().items():
+            setattr(script_module, name, value)
+
+    script_module = torch.jit.RecursiveScriptModule._construct(cpp_module, init_fn)
+
+    for name in cpp_module._method_names():
+        original_method = getattr(type(nn_module), name, None)
+        if original_method is None:
+            continue
+        script_method = functools.wraps(original_method)(cpp_module._get_method(name))
+        script_module.__dict__[name] = script_method
+
+    for name in dir(nn_module):
+        item = getattr(nn_module, name, None)
+        if _jit_internal.get_torchscript_modifier(item) is _jit_internal.FunctionModifiers.COPY_TO_SCRIPT_WRAPPER:
+            torch.jit._recursive.add_python_attr_to_scripted_model(script_module, nn_module, name)
+
+    return script_module
+
+
+_script_cache = None
+if os.environ.get('PYTORCH_JIT_SCRIPT_CACHE_DIR'):
+    _script_cache = ScriptCache(os.environ['PYTORCH_JIT_SCRIPT_CACHE_DIR'])
+
+
+def enable_script_cache(cache_dir, max_size=_DEFAULT_MAX_SIZE):
+    r"""
+    Enables the on-disk cache of ``torch.jit.script`` for ``nn.Module`` instances.
+
+    When the same module hierarchy is scripted again, in this process or a
+    later one, its compiled code is loaded from ``cache_dir`` instead of being
+    compiled. The cache can also be enabled by setting the
+    ``PYTORCH_JIT_SCRIPT_CACHE_DIR`` environment variable to the cache directory.
+
+    Arguments:
+        cache_dir (str): directory of the cache, created if it does not exist.
+            It can be shared by concurrent processes.
+        max_size (int): maximum total size in bytes of the cache entries, the
+            least recently used entries are removed beyond it. Default: 1 GiB
+
+    Example::
+
+        >>> torch.jit.enable_script_cache('/tmp/torchscript_cache')
+        >>> scripted = torch.jit.script(MyModule())  # compiles and stores MyModule
+        >>> scripted = torch.jit.script(MyModule())  # loads MyModule from the cache
+    """
+    global _script_cache
+    _script_cache = ScriptCache(cache_dir, max_size)
+
+
+def disable_script_cache():
+    r"""Disables the cache enabled by :func:`enable_script_cache`."""
+    global _script_cache
+    _script_cache = None
+
+
+def get_script_cache():
+    r"""Returns the active :class:`ScriptCache`, or ``None`` if it is disabled."""
+    return _script_cache
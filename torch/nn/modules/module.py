@@ -24,6 +24,94 @@ class ModuleAttributeError(AttributeError):
     fixes this issue."""
 
 
+# Hooks called for every module, before the hooks registered on the module.
+_global_backward_hooks = OrderedDict()
+_global_forward_pre_hooks = OrderedDict()
+_global_forward_hooks = OrderedDict()
+
+
+def register_module_forward_pre_hook(hook):
+    r"""Registers a forward pre-hook common to all modules.
+
+    .. warning ::
+
+        This adds global state to the `nn.module` module and it is only
+        intended for debugging and profiling purposes.
+
+    The hook will be called every time before :func:`forward` of any module is
+    invoked, before the hooks registered with
+    :meth:`~torch.nn.Module.register_forward_pre_hook`. It should have the
+    following signature::
+
+        hook(module, input) -> None or modified input
+
+    See :meth:`~torch.nn.Module.register_forward_pre_hook` for the arguments.
+
+    Returns:
+        :class:`torch.utils.hooks.RemovableHandle`:
+            a handle that can be used to remove the added hook by calling
+            ``handle.remove()``
+    """
+    handle = hooks.RemovableHandle(_global_forward_pre_hooks)
+    _global_forward_pre_hooks[handle.id] = hook
+    return handle
+
+
+def register_module_forward_hook(hook):
+    r"""Registers a forward hook common to all modules.
+
+    .. warning ::
+
+        This adds global state to the `nn.module` module and it is only
+        intended for debugging and profiling purposes.
+
+    The hook will be called every time after :func:`forward` of any module has
+    computed an output, before the hooks registered with
+    :meth:`~torch.nn.Module.register_forward_hook`. It should have the
+    following signature::
+
+        hook(module, input, output) -> None or modified output
+
+    See :meth:`~torch.nn.Module.register_forward_hook` for the arguments.
+
+    Returns:
+        :class:`torch.utils.hooks.RemovableHandle`:
+            a handle that can be used to remove the added hook by calling
+            ``handle.remove()``
+    """
+    handle = hooks.RemovableHandle(_global_forward_hooks)
+    _global_forward_hooks[handle.id] = hook
+    return handle
+
+
+def register_module_backward_hook(hook):
+    r"""Registers a backward hook common to all modules.
+
+    .. warning ::
+
+        This adds global state to the `nn.module` module and it is only
+        intended for debugging and profiling purposes.
+
+    The hook will be called every time the gradients with respect to the
+    inputs of any module are computed, before the hooks registered with
+    :meth:`~torch.nn.Module.register_backward_hook`. It should have the
+    following signature::
+
+        hook(module, grad_input, grad_output) -> Tensor or None
+
+    See :meth:`~torch.nn.Module.register_backward_hook` for the arguments and
+    its limitations.
+
+    Returns:
+        :class:`torch.utils.hooks.RemovableHandle`:
+            a handle that can be used to remove the added hook by calling
+            ``handle.remove()``
+    """
+    handle = hooks.RemovableHandle(_global_backward_hooks)
+    _global_backward_hooks[handle.id] = hook
+    return handle
+
+
 def _addindent(s_, numSpaces):
     s = s_.split('\n')
     # don't do anything for single-line stuff
@@ -562,7 +650,15 @@ class Module(object):
         return result
 
     def __call__(self, *input, **kwargs):
-        for hook in self._forward_pre_hooks.values():
+        # Fast path for the common case of a module without hooks that is not
+        # being traced, which does exactly what the code below would do.
+        if not (self._forward_pre_hooks or self._forward_hooks or self._backward_hooks or
+                _global_forward_pre_hooks or _global_forward_hooks or _global_backward_hooks or
+                torch._C._get_tracing_state()):
+            return self.forward(*input, **kwargs)
+        for hook in itertools.chain(
+                _global_forward_pre_hooks.values(),
+                self._forward_pre_hooks.values()):
             result = hook(self, input)
             if result is not None:
                 if not isinstance(result, tuple):
@@ -572,11 +668,13 @@ class Module(object):
             result = self._slow_forward(*input, **kwargs)
         else:
             result = self.forward(*input, **kwargs)
-        for hook in self._forward_hooks.values():
+        for hook in itertools.chain(
+                _global_forward_hooks.values(),
+                self._forward_hooks.values()):
             hook_result = hook(self, input, result)
             if hook_result is not None:
                 result = hook_result
-        if len(self._backward_hooks) > 0:
+        if _global_backward_hooks or self._backward_hooks:
             var = result
             while not isinstance(var, torch.Tensor):
                 if isinstance(var, dict):
@@ -585,7 +683,9 @@ class Module(object):
                     var = var[0]
             grad_fn = var.grad_fn
             if grad_fn is not None:
-                for hook in self._backward_hooks.values():
+                for hook in itertools.chain(
+                        _global_backward_hooks.values(),
+                        self._backward_hooks.values()):
                     wrapper = functools.partial(hook, self)
                     functools.update_wrapper(wrapper, hook)
                     grad_fn.register_hook(wrapper)
@@ -602,16 +702,19 @@ class Module(object):
             self._load_state_dict_pre_hooks = OrderedDict()
 
     def __getattr__(self, name):
-        if '_parameters' in self.__dict__:
-            _parameters = self.__dict__['_parameters']
+        # Called for every access to a parameter, buffer or submodule, so
+        # look up self.__dict__ once.
+        self_dict = self.__dict__
+        if '_parameters' in self_dict:
+            _parameters = self_dict['_parameters']
             if name in _parameters:
                 return _parameters[name]
-        if '_buffers' in self.__dict__:
-            _buffers = self.__dict__['_buffers']
+        if '_buffers' in self_dict:
+            _buffers = self_dict['_buffers']
             if name in _buffers:
                 return _buffers[name]
-        if '_modules' in self.__dict__:
-            modules = self.__dict__['_modules']
+        if '_modules' in self_dict:
+            modules = self_dict['_modules']
             if name in modules:
                 return modules[name]
         raise ModuleAttributeError("'{}' object has no attribute '{}'".format(
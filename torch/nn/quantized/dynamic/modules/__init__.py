@@ -1,8 +1,12 @@
 
 from .linear import Linear
-from .rnn import LSTM
+from .rnn import LSTM, GRU, LSTMCell, RNNCell, GRUCell
 
 __all__ = [
     'Linear',
     'LSTM',
+    'GRU',
+    'LSTMCell',
+    'RNNCell',
+    'GRUCell',
 ]
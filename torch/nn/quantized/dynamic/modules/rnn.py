@@ -52,6 +52,8 @@ class RNNBase(torch.nn.Module):
 
         if mode == 'LSTM':
             gate_size = 4 * hidden_size
+        elif mode == 'GRU':
+            gate_size = 3 * hidden_size
         else:
             raise ValueError("Unrecognized RNN mode: " + mode)
 
@@ -185,7 +187,8 @@ class RNNBase(torch.nn.Module):
 
     @classmethod
     def from_float(cls, mod):
-        assert type(mod) == torch.nn.LSTM, 'nn.quantized.dynamic.RNNBase.from_float only works for nn.LSTM'
+        assert type(mod) in (torch.nn.LSTM, torch.nn.GRU), \
+            'nn.quantized.dynamic.RNNBase.from_float only works for nn.LSTM and nn.GRU'
         assert hasattr(
             mod, 'qconfig'), 'Input float module must have qconfig defined'
 
@@ -206,8 +209,11 @@ class RNNBase(torch.nn.Module):
         if mod.mode == 'LSTM':
             qRNNBase = LSTM(mod.input_size, mod.hidden_size, mod.num_layers,
                             mod.bias, mod.batch_first, mod.dropout, mod.bidirectional, dtype)
+        elif mod.mode == 'GRU':
+            qRNNBase = GRU(mod.input_size, mod.hidden_size, mod.num_layers,
+                           mod.bias, mod.batch_first, mod.dropout, mod.bidirectional, dtype)
         else:
-            raise NotImplementedError('Only LSTM is supported for QuantizedRNN for now')
+            raise NotImplementedError('Only LSTM and GRU are supported for QuantizedRNN for now')
 
         num_directions = 2 if mod.bidirectional else 1
 
@@ -354,3 +360,353 @@ class LSTM(RNNBase):
     @classmethod
     def from_float(cls, mod):
         return super(LSTM, cls).from_float(mod)
+
+
+class GRU(RNNBase):
+
+    _FLOAT_MODULE = nn.GRU
+
+    __overloads__ = {'forward': ['forward_packed', 'forward_tensor']}
+
+    def __init__(self, *args, **kwargs):
+        super(GRU, self).__init__('GRU', *args, **kwargs)
+
+    def _get_name(self):
+        return 'DynamicQuantizedGRU'
+
+    def forward_impl(self, input, hx, batch_sizes, max_batch_size, sorted_indices):
+        # type: (Tensor, Optional[Tensor], Optional[Tensor], int, Optional[Tensor]) -> Tuple[Tensor, Tensor]
+        if hx is None:
+            num_directions = 2 if self.bidirectional else 1
+            hx = torch.zeros(self.num_layers * num_directions,
+                             max_batch_size, self.hidden_size,
+                             dtype=input.dtype, device=input.device)
+        else:
+            # Each batch of the hidden state should match the input sequence that
+            # the user believes he/she is passing in.
+            hx = self.permute_hidden(hx, sorted_indices)
+
+        self.check_forward_args(input, hx, batch_sizes)
+
+        if batch_sizes is None:
+            result = torch.quantized_gru(input, hx, self._all_params, self.bias, self.num_layers,
+                                         float(self.dropout), self.training, self.bidirectional,
+                                         self.batch_first)
+        else:
+            result = torch.quantized_gru(input, batch_sizes, hx, self._all_params, self.bias,
+                                         self.num_layers, float(self.dropout), self.training,
+                                         self.bidirectional)
+        output = result[0]
+        hidden = result[1]
+
+        return output, hidden
+
+    @torch.jit.export
+    def forward_tensor(self, input, hx=None):
+        # type: (Tensor, Optional[Tensor]) -> Tuple[Tensor, Tensor]
+        batch_sizes = None
+        max_batch_size = input.size(0) if self.batch_first else input.size(1)
+        sorted_indices = None
+        unsorted_indices = None
+
+        output, hidden = self.forward_impl(
+            input, hx, batch_sizes, max_batch_size, sorted_indices)
+
+        return output, self.permute_hidden(hidden, unsorted_indices)
+
+    @torch.jit.export
+    def forward_packed(self, input, hx=None):
+        # type: (PackedSequence, Optional[Tensor]) -> Tuple[PackedSequence, Tensor]
+        input, batch_sizes, sorted_indices, unsorted_indices = input
+        max_batch_size = batch_sizes[0]
+        max_batch_size = int(max_batch_size)
+
+        output, hidden = self.forward_impl(
+            input, hx, batch_sizes, max_batch_size, sorted_indices)
+
+        output = PackedSequence(output, batch_sizes,
+                                sorted_indices, unsorted_indices)
+        return output, self.permute_hidden(hidden, unsorted_indices)
+
+    @torch.jit.ignore
+    def forward(self, input, hx=None):
+        if isinstance(input, PackedSequence):
+            return self.forward_packed(input, hx)
+        else:
+            return self.forward_tensor(input, hx)
+
+    @classmethod
+    def from_float(cls, mod):
+        return super(GRU, cls).from_float(mod)
+
+
+class RNNCellBase(torch.nn.Module):
+    __constants__ = ['input_size', 'hidden_size', 'bias']
+
+    def __init__(self, input_size, hidden_size, bias=True, num_chunks=4, dtype=torch.qint8):
+        super(RNNCellBase, self).__init__()
+        if dtype != torch.qint8:
+            raise ValueError('Dynamic quantized RNN cells only support qint8, got {}'.format(dtype))
+        self.input_size = input_size
+        self.hidden_size = hidden_size
+        self.bias = bias
+        self.dtype = dtype
+        if bias:
+            self.bias_ih = torch.randn(num_chunks * hidden_size).to(dtype=torch.float)
+            self.bias_hh = torch.randn(num_chunks * hidden_size).to(dtype=torch.float)
+        else:
+            self.bias_ih = None
+            self.bias_hh = None
+
+        weight_ih = torch.randn(num_chunks * hidden_size, input_size).to(torch.float)
+        weight_hh = torch.randn(num_chunks * hidden_size, hidden_size).to(torch.float)
+        self._packed_weight_ih = torch.ops.quantized.linear_prepack(
+            torch.quantize_per_tensor(weight_ih, scale=0.1, zero_point=0, dtype=torch.qint8), self.bias_ih)
+        self._packed_weight_hh = torch.ops.quantized.linear_prepack(
+            torch.quantize_per_tensor(weight_hh, scale=0.1, zero_point=0, dtype=torch.qint8), self.bias_hh)
+
+    def _get_name(self):
+        return 'DynamicQuantizedRNNBase'
+
+    def extra_repr(self):
+        s = '{input_size}, {hidden_size}'
+        if 'bias' in self.__dict__ and self.bias is not True:
+            s += ', bias={bias}'
+        if 'nonlinearity' in self.__dict__ and self.nonlinearity != "tanh":
+            s += ', nonlinearity={nonlinearity}'
+        return s.format(**self.__dict__)
+
+    def check_forward_input(self, input):
+        if input.size(1) != self.input_size:
+            raise RuntimeError(
+                "input has inconsistent input_size: got {}, expected {}".format(
+                    input.size(1), self.input_size))
+
+    def check_forward_hidden(self, input, hx, hidden_label=''):
+        # type: (Tensor, Tensor, str) -> None
+        if input.size(0) != hx.size(0):
+            raise RuntimeError(
+                "Input batch size {} doesn't match hidden{} batch size {}".format(
+                    input.size(0), hidden_label, hx.size(0)))
+
+        if hx.size(1) != self.hidden_size:
+            raise RuntimeError(
+                "hidden{} has inconsistent hidden_size: got {}, expected {}".format(
+                    hidden_label, hx.size(1), self.hidden_size))
+
+    def _bias_or_zeros(self, bias):
+        # type: (Optional[Tensor]) -> Tensor
+        # The biases are part of the packed weights, the cell ops only need
+        # them for their signature.
+        if bias is None:
+            return torch.zeros(0, dtype=torch.float)
+        return bias
+
+    @classmethod
+    def from_float(cls, mod):
+        assert type(mod) in (torch.nn.LSTMCell, torch.nn.GRUCell, torch.nn.RNNCell), \
+            'nn.quantized.dynamic.RNNCellBase.from_float only works for nn.LSTMCell, nn.GRUCell and nn.RNNCell'
+        assert hasattr(
+            mod, 'qconfig'), 'Input float module must have qconfig defined'
+
+        if mod.qconfig is not None and mod.qconfig.weight is not None:
+            weight_observer_method = mod.qconfig.weight
+        else:
+            # We have the circular import issues if we import the qconfig in the beginning of this file:
+            # https://github.com/pytorch/pytorch/pull/24231. The current workaround is to postpone the
+            # import until we need it.
+            from torch.quantization.qconfig import default_dynamic_qconfig
+            weight_observer_method = default_dynamic_qconfig.weight
+
+        dtype = weight_observer_method().dtype
+        if dtype != torch.qint8:
+            raise RuntimeError('Unsupported dtype for dynamic RNN cell quantization: {}'.format(dtype))
+
+        if type(mod) == torch.nn.LSTMCell:
+            qRNNCellBase = LSTMCell(mod.input_size, mod.hidden_size, bias=mod.bias, dtype=dtype)
+        elif type(mod) == torch.nn.GRUCell:
+            qRNNCellBase = GRUCell(mod.input_size, mod.hidden_size, bias=mod.bias, dtype=dtype)
+        else:
+            qRNNCellBase = RNNCell(mod.input_size, mod.hidden_size, bias=mod.bias,
+                                   nonlinearity=mod.nonlinearity, dtype=dtype)
+
+        def quantize_and_pack(w, b):
+            weight_observer = weight_observer_method()
+            weight_observer(w)
+            wt_scale, wt_zp = weight_observer.calculate_qparams()
+            qweight = torch.quantize_per_tensor(
+                w.float(), float(wt_scale), int(wt_zp), torch.qint8)
+            return torch.ops.quantized.linear_prepack(qweight, b)
+
+        bias_ih = mod.bias_ih.detach() if mod.bias else None
+        bias_hh = mod.bias_hh.detach() if mod.bias else None
+        qRNNCellBase._packed_weight_ih = quantize_and_pack(mod.weight_ih, bias_ih)
+        qRNNCellBase._packed_weight_hh = quantize_and_pack(mod.weight_hh, bias_hh)
+        qRNNCellBase.bias_ih = bias_ih
+        qRNNCellBase.bias_hh = bias_hh
+        return qRNNCellBase
+
+    def _weight_bias(self):
+        # Returns a dict of weights and biases
+        weight_bias_dict = {'weight': {}, 'bias': {}}
+        w1, b1 = torch.ops.quantized.linear_unpack(self._packed_weight_ih)
+        w2, b2 = torch.ops.quantized.linear_unpack(self._packed_weight_hh)
+        weight_bias_dict['weight']['weight_ih'] = w1
+        weight_bias_dict['weight']['weight_hh'] = w2
+        weight_bias_dict['bias']['bias_ih'] = b1
+        weight_bias_dict['bias']['bias_hh'] = b2
+        return weight_bias_dict
+
+    def get_weight(self):
+        return self._weight_bias()['weight']
+
+    def get_bias(self):
+        return self._weight_bias()['bias']
+
+    def _save_to_state_dict(self, destination, prefix, keep_vars):
+        super(RNNCellBase, self)._save_to_state_dict(destination, prefix, keep_vars)
+        weight_bias = self._weight_bias()
+        destination[prefix + 'weight_ih'] = weight_bias['weight']['weight_ih']
+        destination[prefix + 'weight_hh'] = weight_bias['weight']['weight_hh']
+        destination[prefix + 'bias_ih'] = weight_bias['bias']['bias_ih']
+        destination[prefix + 'bias_hh'] = weight_bias['bias']['bias_hh']
+
+    def _load_from_state_dict(self, state_dict, prefix, local_metadata, strict,
+                              missing_keys, unexpected_keys, error_msgs):
+        bias_ih = state_dict.pop(prefix + 'bias_ih')
+        bias_hh = state_dict.pop(prefix + 'bias_hh')
+        self._packed_weight_ih = torch.ops.quantized.linear_prepack(
+            state_dict.pop(prefix + 'weight_ih'), bias_ih)
+        self._packed_weight_hh = torch.ops.quantized.linear_prepack(
+            state_dict.pop(prefix + 'weight_hh'), bias_hh)
+        self.bias_ih = bias_ih
+        self.bias_hh = bias_hh
+        super(RNNCellBase, self)._load_from_state_dict(state_dict, prefix, local_metadata, False,
+                                                       missing_keys, unexpected_keys, error_msgs)
+
+
+class RNNCell(RNNCellBase):
+    r"""An Elman RNN cell with tanh or ReLU non-linearity.
+    A dynamic quantized RNNCell module with floating point tensor as inputs and outputs.
+    Weights are quantized to 8 bits. We adopt the same interface as `torch.nn.RNNCell`,
+    please see https://pytorch.org/docs/stable/nn.html#torch.nn.RNNCell for documentation.
+
+    Examples::
+
+        >>> rnn = nn.quantized.dynamic.RNNCell(10, 20)
+        >>> input = torch.randn(6, 3, 10)
+        >>> hx = torch.randn(3, 20)
+        >>> output = []
+        >>> for i in range(6):
+                hx = rnn(input[i], hx)
+                output.append(hx)
+    """
+    __constants__ = ['input_size', 'hidden_size', 'bias', 'nonlinearity']
+
+    def __init__(self, input_size, hidden_size, bias=True, nonlinearity="tanh", dtype=torch.qint8):
+        super(RNNCell, self).__init__(input_size, hidden_size, bias, num_chunks=1, dtype=dtype)
+        if nonlinearity not in ("tanh", "relu"):
+            raise RuntimeError("Unknown nonlinearity: {}".format(nonlinearity))
+        self.nonlinearity = nonlinearity
+
+    def _get_name(self):
+        return 'DynamicQuantizedRNNCell'
+
+    def forward(self, input, hx=None):
+        # type: (Tensor, Optional[Tensor]) -> Tensor
+        self.check_forward_input(input)
+        if hx is None:
+            hx = torch.zeros(input.size(0), self.hidden_size, dtype=input.dtype, device=input.device)
+        self.check_forward_hidden(input, hx, '')
+        if self.nonlinearity == "tanh":
+            ret = torch.ops.quantized.quantized_rnn_tanh_cell_dynamic(
+                input, hx, self._packed_weight_ih, self._packed_weight_hh,
+                self._bias_or_zeros(self.bias_ih), self._bias_or_zeros(self.bias_hh))
+        else:
+            ret = torch.ops.quantized.quantized_rnn_relu_cell_dynamic(
+                input, hx, self._packed_weight_ih, self._packed_weight_hh,
+                self._bias_or_zeros(self.bias_ih), self._bias_or_zeros(self.bias_hh))
+        return ret
+
+    @classmethod
+    def from_float(cls, mod):
+        return super(RNNCell, cls).from_float(mod)
+
+
+class LSTMCell(RNNCellBase):
+    r"""A long short-term memory (LSTM) cell.
+    A dynamic quantized LSTMCell module with floating point tensor as inputs and outputs.
+    Weights are quantized to 8 bits. We adopt the same interface as `torch.nn.LSTMCell`,
+    please see https://pytorch.org/docs/stable/nn.html#torch.nn.LSTMCell for documentation.
+
+    Examples::
+
+        >>> rnn = nn.quantized.dynamic.LSTMCell(10, 20)
+        >>> input = torch.randn(6, 3, 10)
+        >>> hx = torch.randn(3, 20)
+        >>> cx = torch.randn(3, 20)
+        >>> output = []
+        >>> for i in range(6):
+                hx, cx = rnn(input[i], (hx, cx))
+                output.append(hx)
+    """
+
+    def __init__(self, input_size, hidden_size, bias=True, dtype=torch.qint8):
+        super(LSTMCell, self).__init__(input_size, hidden_size, bias, num_chunks=4, dtype=dtype)
+
+    def _get_name(self):
+        return 'DynamicQuantizedLSTMCell'
+
+    def forward(self, input, hx=None):
+        # type: (Tensor, Optional[Tuple[Tensor, Tensor]]) -> Tuple[Tensor, Tensor]
+        self.check_forward_input(input)
+        if hx is None:
+            zeros = torch.zeros(input.size(0), self.hidden_size, dtype=input.dtype, device=input.device)
+            hx = (zeros, zeros)
+        self.check_forward_hidden(input, hx[0], '[0]')
+        self.check_forward_hidden(input, hx[1], '[1]')
+        return torch.ops.quantized.quantized_lstm_cell_dynamic(
+            input, hx, self._packed_weight_ih, self._packed_weight_hh,
+            self._bias_or_zeros(self.bias_ih), self._bias_or_zeros(self.bias_hh))
+
+    @classmethod
+    def from_float(cls, mod):
+        return super(LSTMCell, cls).from_float(mod)
+
+
+class GRUCell(RNNCellBase):
+    r"""A gated recurrent unit (GRU) cell
+    A dynamic quantized GRUCell module with floating point tensor as inputs and outputs.
+    Weights are quantized to 8 bits. We adopt the same interface as `torch.nn.GRUCell`,
+    please see https://pytorch.org/docs/stable/nn.html#torch.nn.GRUCell for documentation.
+
+    Examples::
+
+        >>> rnn = nn.quantized.dynamic.GRUCell(10, 20)
+        >>> input = torch.randn(6, 3, 10)
+        >>> hx = torch.randn(3, 20)
+        >>> output = []
+        >>> for i in range(6):
+                hx = rnn(input[i], hx)
+                output.append(hx)
+    """
+
+    def __init__(self, input_size, hidden_size, bias=True, dtype=torch.qint8):
+        super(GRUCell, self).__init__(input_size, hidden_size, bias, num_chunks=3, dtype=dtype)
+
+    def _get_name(self):
+        return 'DynamicQuantizedGRUCell'
+
+    def forward(self, input, hx=None):
+        # type: (Tensor, Optional[Tensor]) -> Tensor
+        self.check_forward_input(input)
+        if hx is None:
+            hx = torch.zeros(input.size(0), self.hidden_size, dtype=input.dtype, device=input.device)
+        self.check_forward_hidden(input, hx, '')
+        return torch.ops.quantized.quantized_gru_cell_dynamic(
+            input, hx, self._packed_weight_ih, self._packed_weight_hh,
+            self._bias_or_zeros(self.bias_ih), self._bias_or_zeros(self.bias_hh))
+
+    @classmethod
+    def from_float(cls, mod):
+        return super(GRUCell, cls).from_float(mod)
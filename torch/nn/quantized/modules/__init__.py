@@ -6,6 +6,7 @@ from .activation import ReLU, ReLU6, Hardswish
 from .batchnorm import BatchNorm2d, BatchNorm3d
 from .normalization import LayerNorm
 from .conv import Conv1d, Conv2d, Conv3d
+from .embedding_ops import Embedding, EmbeddingBag
 from .linear import Linear
 
 from .functional_modules import FloatFunctional, QFunctional
@@ -84,6 +85,8 @@ __all__ = [
     'Conv2d',
     'Conv3d',
     'DeQuantize',
+    'Embedding',
+    'EmbeddingBag',
     'Linear',
     'MaxPool2d',
     'Quantize',
@@ -0,0 +1,191 @@
+from __future__ import absolute_import, division, print_function, unicode_literals
+import torch
+from torch import Tensor  # noqa: F401
+from torch._jit_internal import Optional  # noqa: F401
+
+_MODES = {'sum': 0, 'mean': 1}
+_BIT_WIDTHS = (8, 4)
+
+
+def _pack_embedding_weight(weight, bit_width):
+    if bit_width == 8:
+        return torch.ops.quantized.embedding_bag_byte_prepack(weight)
+    elif bit_width == 4:
+        return torch.ops.quantized.embedding_bag_4bit_prepack(weight)
+    raise ValueError('Unsupported bit_width {} for quantized embeddings, '
+                     'expected one of {}'.format(bit_width, _BIT_WIDTHS))
+
+
+def _get_bit_width(mod):
+    r"""Reads the bit width from the weight observer of ``mod.qconfig``,
+    defaulting to 8 bits for 8-bit observers that do not specify one."""
+    from torch.quantization.observer import RowwiseWeightObserver
+    if mod.qconfig is not None and mod.qconfig.weight is not None:
+        weight_observer = mod.qconfig.weight()
+        if isinstance(weight_observer, RowwiseWeightObserver):
+            return weight_observer.bit_width
+        if weight_observer.dtype not in (torch.quint8, torch.qint8):
+            raise ValueError('Quantized embeddings only support 8-bit and 4-bit row-wise '
+                             'quantization, got a weight observer with dtype {}'.format(
+                                 weight_observer.dtype))
+    return 8
+
+
+class EmbeddingBag(torch.nn.Module):
+    r"""
+    A quantized EmbeddingBag module with quantized weights and float inputs
+    and outputs. We adopt the same interface as `torch.nn.EmbeddingBag`,
+    please see https://pytorch.org/docs/stable/nn.html#torch.nn.EmbeddingBag
+    for documentation.
+
+    Every row of the embedding table is quantized with its own scale and
+    bias to 8 bits, or to 4 bits with two values packed per byte, which
+    makes the table about 4x or 8x smaller than in float. Only the ``sum``
+    and ``mean`` modes are supported.
+
+    Attributes:
+        bit_width (int): number of bits per quantized value, 8 or 4.
+
+    Examples::
+
+        >>> m = nn.quantized.EmbeddingBag(10, 16, mode='sum', bit_width=4)
+        >>> indices = torch.tensor([1, 2, 4, 5, 4, 3, 2, 9])
+        >>> offsets = torch.tensor([0, 4])
+        >>> output = m(indices, offsets)
+        >>> print(output.size())
+        torch.Size([2, 16])
+    """
+
+    def __init__(self, num_embeddings, embedding_dim, mode='sum',
+                 include_last_offset=False, bit_width=8, _weight=None):
+        super(EmbeddingBag, self).__init__()
+        if mode not in _MODES:
+            raise ValueError('Quantized EmbeddingBag only supports the modes '
+                             '{}, got {}'.format(list(_MODES.keys()), mode))
+        self.num_embeddings = num_embeddings
+        self.embedding_dim = embedding_dim
+        self.mode = mode
+        self.include_last_offset = include_last_offset
+        self.bit_width = bit_width
+        if _weight is None:
+            _weight = torch.randn(num_embeddings, embedding_dim)
+        self.set_weight(_weight)
+
+    def set_weight(self, w):
+        r"""Quantizes and packs the float embedding table ``w``."""
+        assert list(w.shape) == [self.num_embeddings, self.embedding_dim], \
+            'Shape of weight does not match num_embeddings and embedding_dim'
+        self.register_buffer('_packed_weight',
+                             _pack_embedding_weight(w.detach().float().contiguous(), self.bit_width))
+
+    def weight(self):
+        r"""Returns the dequantized embedding table."""
+        if self.bit_width == 8:
+            return torch.ops.quantized.embedding_bag_byte_unpack(self._packed_weight)
+        return torch.ops.quantized.embedding_bag_4bit_unpack(self._packed_weight)
+
+    def forward(self, input, offsets=None, per_sample_weights=None):
+        # type: (Tensor, Optional[Tensor], Optional[Tensor]) -> Tensor
+        include_last_offset = self.include_last_offset
+        if input.dim() == 2:
+            if offsets is not None:
+                raise ValueError('offsets must be None when input is 2D')
+            # Every row of a 2D input is a bag of fixed length.
+            offsets = torch.arange(0, input.numel(), input.size(1),
+                                   dtype=torch.long, device=input.device)
+            input = input.reshape(-1)
+            if per_sample_weights is not None:
+                per_sample_weights = per_sample_weights.reshape(-1)
+            include_last_offset = False
+        elif offsets is None:
+            raise ValueError('offsets has to be a 1D Tensor but got None')
+
+        mode = 0 if self.mode == 'sum' else 1
+        if self.bit_width == 8:
+            return torch.ops.quantized.embedding_bag_byte(
+                self._packed_weight, input, offsets, mode, per_sample_weights, include_last_offset)
+        return torch.ops.quantized.embedding_bag_4bit(
+            self._packed_weight, input, offsets, mode, per_sample_weights, include_last_offset)
+
+    def _get_name(self):
+        return 'QuantizedEmbeddingBag'
+
+    def extra_repr(self):
+        return 'num_embeddings={}, embedding_dim={}, mode={}, bit_width={}'.format(
+            self.num_embeddings, self.embedding_dim, self.mode, self.bit_width)
+
+    @classmethod
+    def from_float(cls, mod):
+        r"""Create a quantized embedding bag module from a float module
+
+        Args:
+            mod (Module): a float module, either produced by torch.quantization
+                          utilities or provided by the user
+        """
+        assert type(mod) == torch.nn.EmbeddingBag, \
+            'nn.quantized.EmbeddingBag.from_float only works for nn.EmbeddingBag'
+        assert hasattr(mod, 'qconfig'), 'Input float module must have qconfig defined'
+        assert mod.mode in _MODES, \
+            'nn.quantized.EmbeddingBag does not support mode {}'.format(mod.mode)
+        assert mod.max_norm is None, 'nn.quantized.EmbeddingBag does not support max_norm'
+        return cls(mod.num_embeddings, mod.embedding_dim, mode=mod.mode,
+                   include_last_offset=mod.include_last_offset,
+                   bit_width=_get_bit_width(mod), _weight=mod.weight)
+
+
+class Embedding(EmbeddingBag):
+    r"""
+    A quantized Embedding module with quantized weights and float outputs.
+    We adopt the same interface as `torch.nn.Embedding`, please see
+    https://pytorch.org/docs/stable/nn.html#torch.nn.Embedding for
+    documentation.
+
+    Every row of the embedding table is quantized with its own scale and
+    bias to 8 or 4 bits, see :class:`~torch.nn.quantized.EmbeddingBag`.
+
+    Examples::
+
+        >>> m = nn.quantized.Embedding(10, 16)
+        >>> indices = torch.tensor([[1, 2, 4, 5], [4, 3, 2, 9]])
+        >>> output = m(indices)
+        >>> print(output.size())
+        torch.Size([2, 4, 16])
+    """
+
+    def __init__(self, num_embeddings, embedding_dim, bit_width=8, _weight=None):
+        super(Embedding, self).__init__(num_embeddings, embedding_dim, mode='sum',
+                                        bit_width=bit_width, _weight=_weight)
+
+    def forward(self, input):
+        # Every index is looked up as a bag of its own.
+        flat_input = input.reshape(-1)
+        offsets = torch.arange(flat_input.numel(), dtype=torch.long, device=input.device)
+        if self.bit_width == 8:
+            output = torch.ops.quantized.embedding_bag_byte(
+                self._packed_weight, flat_input, offsets, 0, None, False)
+        else:
+            output = torch.ops.quantized.embedding_bag_4bit(
+                self._packed_weight, flat_input, offsets, 0, None, False)
+        return output.reshape(list(input.size()) + [self.embedding_dim])
+
+    def _get_name(self):
+        return 'QuantizedEmbedding'
+
+    def extra_repr(self):
+        return 'num_embeddings={}, embedding_dim={}, bit_width={}'.format(
+            self.num_embeddings, self.embedding_dim, self.bit_width)
+
+    @classmethod
+    def from_float(cls, mod):
+        r"""Create a quantized embedding module from a float module
+
+        Args:
+            mod (Module): a float module, either produced by torch.quantization
+                          utilities or provided by the user
+        """
+        assert type(mod) == torch.nn.Embedding, \
+            'nn.quantized.Embedding.from_float only works for nn.Embedding'
+        assert hasattr(mod, 'qconfig'), 'Input float module must have qconfig defined'
+        assert mod.max_norm is None, 'nn.quantized.Embedding does not support max_norm'
+        return cls(mod.num_embeddings, mod.embedding_dim,
+                   bit_width=_get_bit_width(mod), _weight=mod.weight)
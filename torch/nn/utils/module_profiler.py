@@ -0,0 +1,234 @@
+import threading
+import time
+from collections import OrderedDict
+
+import torch
+from torch.nn.modules.module import register_module_forward_pre_hook, register_module_forward_hook
+
+
+class ModuleStats(object):
+    r"""Statistics of the calls of the modules of one name, see :class:`ModuleProfiler`.
+
+    Attributes:
+        calls (int): number of forward calls.
+        forward_time (float): total forward time in seconds.
+        max_forward_time (float): longest forward time in seconds.
+        output_bytes (int): total size in bytes of the tensors returned by
+            the calls, which are the activations of the module.
+        backward_calls (int): number of backward passes through the module.
+        backward_time (float): total backward time in seconds.
+    """
+    __slots__ = ['calls', 'forward_time', 'max_forward_time', 'output_bytes',
+                 'backward_calls', 'backward_time']
+
+    def __init__(self):
+        self.calls = 0
+        self.forward_time = 0.
+        self.max_forward_time = 0.
+        self.output_bytes = 0
+        self.backward_calls = 0
+        self.backward_time = 0.
+
+    def __repr__(self):
+        return '{}({})'.format(type(self).__name__, ', '.join(
+            '{}={}'.format(name, getattr(self, name)) for name in self.__slots__))
+
+
+def _tensors(value):
+    if isinstance(value, torch.Tensor):
+        return [value]
+    if isinstance(value, (list, tuple)):
+        return [t for v in value for t in _tensors(v)]
+    if isinstance(value, dict):
+        return [t for v in value.values() for t in _tensors(v)]
+    return []
+
+
+class ModuleProfiler(object):
+    r"""Records the forward time and the output size of modules, aggregated
+    by module name, using global module hooks.
+
+    While the profiler is enabled, every call of a module of :attr:`root` is
+    timed and the sizes of the tensors it returns are recorded. The names are
+    the qualified names of :meth:`~torch.nn.Module.named_modules`, the root
+    module itself is named after its class. Without :attr:`root`, all modules
+    are recorded and named after their class.
+
+    The overhead is a few microseconds per module call, so it can be kept
+    enabled in production. Modules called while the profiler is disabled
+    take the hook-free fast path of :meth:`~torch.nn.Module.__call__`.
+
+    Arguments:
+        root (Module, optional): the model whose modules are recorded.
+        synchronize (bool): synchronize CUDA before taking each time, which
+            gives the device time of the modules instead of the time spent
+            launching their kernels, at the cost of serializing execution.
+            Default: ``False``
+        record_backward (bool): also record the time between the gradient of
+            the outputs of a module and the gradient of its inputs being
+            computed. Default: ``False``
+        record_function (bool): when the autograd profiler is enabled, also
+            emit a range named ``nn.Module: <name>`` for every module call, like
+            :class:`torch.autograd.profiler.record_function`. Default: ``True``
+
+    Example::
+
+        >>> profiler = ModuleProfiler(model)
+        >>> with profiler:
+        >>>     for step, batch in enumerate(loader):
+        >>>         model(batch)
+        >>>         if step % 100 == 0:
+        >>>             profiler.add_to_tensorboard(writer, step)
+        >>>             profiler.reset()
+        >>> print(profiler.table())
+    """
+
+    def __init__(self, root=None, synchronize=False, record_backward=False, record_function=True):
+        self.synchronize = synchronize
+        self.record_backward = record_backward
+        self.record_function = record_function
+        self.names = None
+        if root is not None:
+            self.names = {module: name for name, module in root.named_modules()}
+            self.names[root] = type(root).__name__
+        self.stats = OrderedDict()
+        self._handles = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def enable(self):
+        r"""Starts recording."""
+        if not self._handles:
+            self._handles = [register_module_forward_pre_hook(self._forward_pre_hook),
+                             register_module_forward_hook(self._forward_hook)]
+
+    def disable(self):
+        r"""Stops recording, the statistics are kept."""
+        for handle in self._handles:
+            handle.remove()
+        self._handles = []
+
+    def reset(self):
+        r"""Clears the statistics."""
+        with self._lock:
+            self.stats = OrderedDict()
+
+    def __enter__(self):
+        self.enable()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.disable()
+
+    def _name(self, module):
+        if self.names is None:
+            return type(module).__name__
+        return self.names.get(module)
+
+    def _stats(self, name):
+        stats = self.stats.get(name)
+        if stats is None:
+            with self._lock:
+                stats = self.stats.setdefault(name, ModuleStats())
+        return stats
+
+    def _time(self):
+        if self.synchronize and torch.cuda.is_available() and torch.cuda.is_initialized():
+            torch.cuda.synchronize()
+        return time.perf_counter()
+
+    def _running(self):
+        running = getattr(self._local, 'running', None)
+        if running is None:
+            running = self._local.running = []
+        return running
+
+    def _forward_pre_hook(self, module, input):
+        name = self._name(module)
+        if name is None:
+            return
+        handle = None
+        if self.record_function and torch.autograd._profiler_enabled():
+            handle = torch.ops.profiler._record_function_enter('nn.Module: ' + name)
+        self._running().append((module, handle, self._time()))
+
+    def _forward_hook(self, module, input, output):
+        name = self._name(module)
+        if name is None:
+            return
+        end = self._time()
+        running = self._running()
+        # Drop the calls that raised an exception, their forward hooks never ran.
+        while running and running[-1][0] is not module:
+            running.pop()
+        if not running:
+            return
+        _, handle, start = running.pop()
+        if handle is not None:
+            torch.ops.profiler._record_function_exit(handle)
+
+        stats = self._stats(name)
+        outputs = _tensors(output)
+        stats.calls += 1
+        stats.forward_time += end - start
+        stats.max_forward_time = max(stats.max_forward_time, end - start)
+        stats.output_bytes += sum(t.numel() * t.element_size() for t in outputs)
+        if self.record_backward and torch.is_grad_enabled():
+            self._record_backward(stats, _tensors(input), outputs)
+
+    def _record_backward(self, stats, inputs, outputs):
+        inputs = [t for t in inputs if t.requires_grad]
+        outputs = [t for t in outputs if t.requires_grad]
+        if not inputs or not outputs:
+            return
+        # The backward of the module starts when the gradient of one of its
+        # outputs is computed, and ends when those of all its inputs are.
+        state = {'start': None, 'pending': len(inputs)}
+
+        def output_hook(grad):
+            if state['start'] is None:
+                state['start'] = self._time()
+
+        def input_hook(grad):
+            state['pending'] -= 1
+            if state['pending'] == 0 and state['start'] is not None:
+                stats.backward_calls += 1
+                stats.backward_time += self._time() - state['start']
+
+        for t in outputs:
+            t.register_hook(output_hook)
+        for t in inputs:
+            t.register_hook(input_hook)
+
+    def table(self, sort_by='forward_time', row_limit=None):
+        r"""Returns the statistics as a table, sorted by decreasing
+        :attr:`sort_by`, an attribute of :class:`ModuleStats`."""
+        rows = sorted(self.stats.items(), key=lambda item: getattr(item[1], sort_by), reverse=True)
+        if row_limit is not None:
+            rows = rows[:row_limit]
+        name_width = max([len('Name')] + [len(name) for name, _ in rows])
+        header = '{:<{}}  {:>8}  {:>14}  {:>14}  {:>16}  {:>14}'.format(
+            'Name', name_width, 'Calls', 'Forward (ms)', 'Avg fwd (ms)', 'Output (bytes)', 'Backward (ms)')
+        lines = [header, '-' * len(header)]
+        for name, stats in rows:
+            lines.append('{:<{}}  {:>8}  {:>14.3f}  {:>14.3f}  {:>16}  {:>14.3f}'.format(
+                name, name_width, stats.calls, stats.forward_time * 1e3,
+                stats.forward_time * 1e3 / max(stats.calls, 1), stats.output_bytes,
+                stats.backward_time * 1e3))
+        return '\n'.join(lines)
+
+    def add_to_tensorboard(self, writer, global_step=None, tag='modules'):
+        r"""Adds the average forward time in milliseconds and the average
+        output size in bytes of every module as scalars to the
+        :class:`~torch.utils.tensorboard.SummaryWriter` :attr:`writer`, with
+        the average backward time if it was recorded."""
+        for name, stats in list(self.stats.items()):
+            if not stats.calls:
+                continue
+            writer.add_scalar('{}/forward_ms/{}'.format(tag, name),
+                              stats.forward_time * 1e3 / stats.calls, global_step)
+            writer.add_scalar('{}/output_bytes/{}'.format(tag, name),
+                              stats.output_bytes / stats.calls, global_step)
+            if stats.backward_calls:
+                writer.add_scalar('{}/backward_ms/{}'.format(tag, name),
+                                  stats.backward_time * 1e3 / stats.backward_calls, global_step)
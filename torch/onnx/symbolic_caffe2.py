@@ -5,6 +5,8 @@ import importlib
 from inspect import getmembers, isfunction
 
 def register_quantized_ops(domain, version):
+    if (domain, version) in sym_registry._registered_opset_modules:
+        return
     # Register all the non-quantized ops
     sym_registry.register_version('', version)
     # Register all quantized ops
@@ -19,6 +21,7 @@ def register_quantized_ops(domain, version):
             if op[0] in aten_q_ops:
                 sym_registry.register_op(op[0], op[1], '', version)
             sym_registry.register_op(op[0], op[1], domain, version)
+    sym_registry._registered_opset_modules.add((domain, version))
 
 def _permute_helper(g, input, axes):
     quant_args = {
@@ -10,6 +10,11 @@ from inspect import getmembers, isfunction
 # The map's entries are as follows : _registry[(domain, version)][op_name] = op_symbolic
 _registry = {}
 
+# The (domain, version) pairs for which the symbolic functions of all the
+# opset modules have been registered. Registration walks all the functions of
+# these modules, so it is only done once per pair.
+_registered_opset_modules = set()
+
 _symbolic_versions = {}
 from torch.onnx.symbolic_helper import _onnx_stable_opsets
 for opset_version in _onnx_stable_opsets:
@@ -21,7 +26,9 @@ def register_version(domain, version):
     if not is_registered_version(domain, version):
         global _registry
         _registry[(domain, version)] = {}
-    register_ops_in_version(domain, version)
+    if (domain, version) not in _registered_opset_modules:
+        register_ops_in_version(domain, version)
+        _registered_opset_modules.add((domain, version))
 
 
 def register_ops_helper(domain, version, iter_version):
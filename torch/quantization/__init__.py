@@ -3,7 +3,7 @@ from .quantize import *
 from .observer import *
 from .qconfig import *
 from .fake_quantize import *
-from .fuse_modules import fuse_modules
+from .fuse_modules import fuse_modules, find_fusable_modules, fuse_modules_by_tracing
 from .stubs import *
 
 def default_eval_fn(model, calib_data):
@@ -23,15 +23,18 @@ _all__ = [
     # Sub functions for `prepare` and `swap_module`
     'propagate_qconfig_', 'add_quant_dequant', 'add_observer_', 'swap_module',
     'default_eval_fn', 'get_observer_dict',
+    # Merging observer statistics for sharded or distributed calibration
+    'merge_observers', 'all_reduce_observers',
     # Observers
     'ObserverBase', 'WeightObserver', 'observer', 'default_observer',
     'default_weight_observer',
     # QConfig
     'QConfig', 'default_qconfig', 'default_dynamic_qconfig', 'float16_dynamic_qconfig',
+    'embedding_8bit_dynamic_qconfig', 'embedding_4bit_dynamic_qconfig',
     # QAT utilities
     'default_qat_qconfig', 'prepare_qat', 'quantize_qat',
     # module transformations
-    'fuse_modules',
+    'fuse_modules', 'find_fusable_modules', 'fuse_modules_by_tracing',
     # Dynamic quantization utilities
     'quantize_dynamic',
 ]
@@ -1,11 +1,19 @@
 from __future__ import absolute_import, division, print_function, unicode_literals
 
+import copy
+
 import torch
 import torch.nn as nn
 import torch.nn.quantized as nnq
-from torch.quantization import prepare
+from torch.quantization import prepare, convert, default_qconfig
 
-from .default_mappings import DEFAULT_NUMERIC_SUITE_COMPARE_MODEL_OUTPUT_WHITE_LIST
+from .default_mappings import (
+    DEFAULT_MODULE_MAPPING,
+    DEFAULT_NUMERIC_SUITE_COMPARE_MODEL_OUTPUT_WHITE_LIST,
+)
+from .fuse_modules import _get_module, _set_module
+from .quantize import _remove_qconfig
+from .stubs import DeQuantStub, QuantStub, QuantWrapper
 
 
 def _find_match(str_list, key_str, postfix):
@@ -382,3 +390,188 @@ def compare_model_outputs(
     q_model(data)
     act_compare_dict = get_matching_activations(float_model, q_model, Logger)
     return act_compare_dict
+
+
+def compute_error(x, y):
+    r"""Compute the relative error ``||x - y|| / ||x||`` of ``y`` with respect
+    to the reference ``x``. Quantized tensors are dequantized first.
+    """
+    if x.is_quantized:
+        x = x.dequantize()
+    if y.is_quantized:
+        y = y.dequantize()
+    norm = x.norm()
+    if norm == 0:
+        return (x - y).norm().item()
+    return ((x - y).norm() / norm).item()
+
+
+def _flatten_outputs(output):
+    if isinstance(output, torch.Tensor):
+        return [output]
+    if isinstance(output, (list, tuple)):
+        return [t for o in output for t in _flatten_outputs(o)]
+    if isinstance(output, dict):
+        return [t for o in output.values() for t in _flatten_outputs(o)]
+    return []
+
+
+def _run_model(model, data):
+    with torch.no_grad():
+        outputs = [_flatten_outputs(model(x)) for x in data]
+    # Concatenate the flattened outputs of all inputs at every output position.
+    return [torch.cat([o[i].dequantize().reshape(-1) if o[i].is_quantized
+                       else o[i].reshape(-1) for o in outputs])
+            for i in range(len(outputs[0]))]
+
+
+def _compute_output_error(ref_outputs, outputs):
+    return max(compute_error(ref, out) for ref, out in zip(ref_outputs, outputs))
+
+
+def _get_default_candidates(model):
+    r"""Returns the names of the outermost submodules of ``model`` that have a
+    quantized counterpart and parameters, e.g. convolutions and linear layers,
+    including fused ones.
+    """
+    candidates = []
+    for name, mod in model.named_modules():
+        if not name or any(name.startswith(c + '.') for c in candidates):
+            continue
+        if type(mod) in (QuantStub, DeQuantStub) or type(mod) not in DEFAULT_MODULE_MAPPING:
+            continue
+        if any(True for _ in mod.parameters()):
+            candidates.append(name)
+    return candidates
+
+
+def _candidate_names(candidate):
+    return [candidate] if isinstance(candidate, str) else list(candidate)
+
+
+def quantize_layers(model, qconfig_dict, data, inplace=False):
+    r"""Quantize only the submodules of ``model`` named in ``qconfig_dict``.
+
+    Every named submodule is wrapped in a `QuantWrapper` with its qconfig, so
+    its input is quantized and its output dequantized, and the rest of the
+    model stays in floating point. `QuantStub` and `DeQuantStub` modules of the
+    model are replaced with `nn.Identity` since the model is not quantized as a
+    whole. The quantized modules are calibrated by running ``data``.
+
+    Example usage:
+        qconfig_dict = plan_mixed_precision(float_model, data, error_budget=0.05)
+        qmodel = quantize_layers(float_model, qconfig_dict, data)
+
+    Args:
+        model: float model in eval mode
+        qconfig_dict: dict from qualified submodule names to the qconfig used
+            to quantize them
+        data: list of inputs used to calibrate the quantized modules
+        inplace: carry out model transformations in-place, the original module
+            is mutated
+
+    Return:
+        the partially quantized model
+    """
+    if not inplace:
+        model = copy.deepcopy(model)
+    _remove_qconfig(model)
+    for name, mod in list(model.named_modules()):
+        if type(mod) in (QuantStub, DeQuantStub):
+            _set_module(model, name, nn.Identity())
+    for name, qconfig in qconfig_dict.items():
+        mod = _get_module(model, name)
+        mod.qconfig = qconfig
+        _set_module(model, name, QuantWrapper(mod))
+    prepare(model, inplace=True)
+    with torch.no_grad():
+        for x in data:
+            model(x)
+    convert(model, inplace=True)
+    return model
+
+
+def get_layer_sensitivity(model, data, candidates=None, qconfig=default_qconfig):
+    r"""Rank the submodules of ``model`` by how much quantizing them alone
+    changes the output of the model.
+
+    Every candidate is quantized on its own with `quantize_layers`, calibrated
+    and evaluated on ``data``, and its sensitivity is the `compute_error` of
+    the outputs of the model with respect to the float model, taking the
+    maximum over the outputs of the model if it has several.
+
+    Example usage:
+        for candidate, error in get_layer_sensitivity(float_model, data):
+            print(candidate, error)
+
+    Args:
+        model: float model in eval mode
+        data: list of inputs used to calibrate and evaluate the model
+        candidates: list of qualified submodule names, or of lists of names
+            that are quantized together as a group. By default all the
+            outermost submodules with parameters that have a quantized
+            counterpart, e.g. convolutions and linear layers, are candidates
+        qconfig: qconfig used to quantize the candidates
+
+    Return:
+        list of tuples ``(candidate, error)`` sorted from the most to the least
+        sensitive candidate
+    """
+    if candidates is None:
+        candidates = _get_default_candidates(model)
+    ref_outputs = _run_model(model, data)
+    sensitivity = []
+    for candidate in candidates:
+        qconfig_dict = {name: qconfig for name in _candidate_names(candidate)}
+        qmodel = quantize_layers(model, qconfig_dict, data)
+        error = _compute_output_error(ref_outputs, _run_model(qmodel, data))
+        sensitivity.append((candidate, error))
+    return sorted(sensitivity, key=lambda item: item[1], reverse=True)
+
+
+def plan_mixed_precision(model, data, error_budget, candidates=None,
+                         qconfig=default_qconfig, sensitivity=None):
+    r"""Choose the submodules of ``model`` to quantize so that the output error
+    of the model stays within ``error_budget``, leaving the others in floating
+    point.
+
+    The candidates are ranked with `get_layer_sensitivity` and added from the
+    least to the most sensitive one. Since quantization errors of different
+    layers do not simply add up, the error of the model with every tentative
+    set of quantized candidates is measured again, and a candidate that would
+    exceed the budget is skipped and left in floating point. This keeps as
+    many candidates as possible quantized, which is what gives the latency
+    gain, and costs two quantized evaluations of ``data`` per candidate.
+
+    Example usage:
+        qconfig_dict = plan_mixed_precision(float_model, data, error_budget=0.05)
+        qmodel = quantize_layers(float_model, qconfig_dict, data)
+
+    Args:
+        model: float model in eval mode
+        data: list of inputs used to calibrate and evaluate the model
+        error_budget: maximum `compute_error` of the outputs of the quantized
+            model with respect to the float model
+        candidates: candidates to quantize, see `get_layer_sensitivity`
+        qconfig: qconfig used to quantize the candidates
+        sensitivity: result of `get_layer_sensitivity` for the same model, data
+            and qconfig, computed if not given
+
+    Return:
+        qconfig_dict: dict from the qualified names of the submodules to quantize
+        to ``qconfig``, which can be passed to `quantize_layers`
+    """
+    if sensitivity is None:
+        sensitivity = get_layer_sensitivity(model, data, candidates, qconfig)
+    ref_outputs = _run_model(model, data)
+    qconfig_dict = {}
+    for candidate, error in reversed(sensitivity):
+        if error > error_budget:
+            # Quantizing the candidate alone already exceeds the budget.
+            continue
+        trial_dict = dict(qconfig_dict)
+        trial_dict.update((name, qconfig) for name in _candidate_names(candidate))
+        qmodel = quantize_layers(model, trial_dict, data)
+        if _compute_output_error(ref_outputs, _run_model(qmodel, data)) <= error_budget:
+            qconfig_dict = trial_dict
+    return qconfig_dict
@@ -58,6 +58,12 @@ DEFAULT_QAT_MODULE_MAPPING = {
 DEFAULT_DYNAMIC_MODULE_MAPPING = {
     nn.Linear: nnqd.Linear,
     nn.LSTM: nnqd.LSTM,
+    nn.GRU: nnqd.GRU,
+    nn.LSTMCell: nnqd.LSTMCell,
+    nn.RNNCell: nnqd.RNNCell,
+    nn.GRUCell: nnqd.GRUCell,
+    nn.Embedding: nnq.Embedding,
+    nn.EmbeddingBag: nnq.EmbeddingBag,
 }
 
 # Whitelist for propagating the qconfig
@@ -68,12 +74,28 @@ _INCLUDE_QCONFIG_PROPAGATE_LIST = {
     nn.Sequential,
 }
 
+# Modules that are only quantized dynamically, static prepare must not attach
+# a qconfig to them
+_DYNAMIC_ONLY_QCONFIG_PROPAGATE_LIST = {
+    nn.GRU,
+    nn.LSTMCell,
+    nn.RNNCell,
+    nn.GRUCell,
+    nn.Embedding,
+    nn.EmbeddingBag,
+}
+
 DEFAULT_QCONFIG_PROPAGATE_WHITE_LIST = (
     (set(DEFAULT_MODULE_MAPPING.keys()) |
      set(DEFAULT_QAT_MODULE_MAPPING.keys()) |
      set(DEFAULT_DYNAMIC_MODULE_MAPPING.keys()) |
      _INCLUDE_QCONFIG_PROPAGATE_LIST) -
-    _EXCLUDE_QCONFIG_PROPAGATE_LIST
+    _EXCLUDE_QCONFIG_PROPAGATE_LIST -
+    _DYNAMIC_ONLY_QCONFIG_PROPAGATE_LIST
+)
+
+DEFAULT_DYNAMIC_QCONFIG_PROPAGATE_WHITE_LIST = (
+    DEFAULT_QCONFIG_PROPAGATE_WHITE_LIST | _DYNAMIC_ONLY_QCONFIG_PROPAGATE_LIST
 )
 
 DEFAULT_NUMERIC_SUITE_COMPARE_MODEL_OUTPUT_WHITE_LIST = (
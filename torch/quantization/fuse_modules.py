@@ -61,6 +61,18 @@ def fuse_conv_bn_relu(conv, bn, relu):
             else torch_fused.ConvReLU2d(
                 torch.nn.utils.fusion.fuse_conv_bn_eval(conv, bn), relu)
 
+_OP_LIST_TO_FUSER_METHOD = {
+    (torch.nn.Conv2d, torch.nn.BatchNorm2d): fuse_conv_bn,
+    (torch.nn.Conv2d, torch.nn.BatchNorm2d, torch.nn.ReLU): fuse_conv_bn_relu,
+    (torch.nn.Conv3d, torch.nn.BatchNorm3d): fuse_conv_bn,
+    (torch.nn.Conv3d, torch.nn.BatchNorm3d, torch.nn.ReLU): fuse_conv_bn_relu,
+    (torch.nn.Conv2d, torch.nn.ReLU): torch.nn.intrinsic.ConvReLU2d,
+    (torch.nn.Conv3d, torch.nn.ReLU): torch.nn.intrinsic.ConvReLU3d,
+    (torch.nn.Linear, torch.nn.ReLU): torch.nn.intrinsic.LinearReLU,
+    (torch.nn.BatchNorm2d, torch.nn.ReLU): torch.nn.intrinsic.BNReLU2d,
+    (torch.nn.BatchNorm3d, torch.nn.ReLU): torch.nn.intrinsic.BNReLU3d,
+}
+
 # Generalization of getattr
 def _get_module(model, submodule_key):
     tokens = submodule_key.split('.')
@@ -92,20 +104,8 @@ def fuse_known_modules(mod_list):
     the fused operation. The rest of the elements are set to nn.Identity()
     """
 
-    OP_LIST_TO_FUSER_METHOD = {
-        (torch.nn.Conv2d, torch.nn.BatchNorm2d): fuse_conv_bn,
-        (torch.nn.Conv2d, torch.nn.BatchNorm2d, torch.nn.ReLU): fuse_conv_bn_relu,
-        (torch.nn.Conv3d, torch.nn.BatchNorm3d): fuse_conv_bn,
-        (torch.nn.Conv3d, torch.nn.BatchNorm3d, torch.nn.ReLU): fuse_conv_bn_relu,
-        (torch.nn.Conv2d, torch.nn.ReLU): torch.nn.intrinsic.ConvReLU2d,
-        (torch.nn.Conv3d, torch.nn.ReLU): torch.nn.intrinsic.ConvReLU3d,
-        (torch.nn.Linear, torch.nn.ReLU): torch.nn.intrinsic.LinearReLU,
-        (torch.nn.BatchNorm2d, torch.nn.ReLU): torch.nn.intrinsic.BNReLU2d,
-        (torch.nn.BatchNorm3d, torch.nn.ReLU): torch.nn.intrinsic.BNReLU3d,
-    }
-
     types = tuple(type(m) for m in mod_list)
-    fuser_method = OP_LIST_TO_FUSER_METHOD.get(types, None)
+    fuser_method = _OP_LIST_TO_FUSER_METHOD.get(types, None)
     if fuser_method is None:
         raise NotImplementedError("Cannot fuse modules: {}".format(types))
     new_mod = [None] * len(mod_list)
@@ -183,3 +183,153 @@ def fuse_modules(model, modules_to_fuse, inplace=False, fuser_func=fuse_known_mo
         for module_list in modules_to_fuse:
             _fuse_modules(model, module_list, fuser_func)
     return model
+
+def _is_fusable_type(module):
+    return any(type(module) in types for types in _OP_LIST_TO_FUSER_METHOD)
+
+def _collect_module_calls(traced, modules, prefix, calls):
+    r"""Collects the calls to submodules in the forward graph of the traced
+    submodule with qualified name ``prefix``, and recursively in the graphs
+    of the called submodules that cannot be fused themselves.
+
+    Every call is appended to ``calls`` as a tuple ``(name, prefix, node)``.
+    """
+    graph = _get_module(traced, prefix).graph if prefix else traced.graph
+    # Qualified names of the module values of the graph, starting from the
+    # ``self`` input.
+    module_names = {next(graph.inputs()).unique(): prefix}
+    for node in graph.nodes():
+        if node.kind() == 'prim::GetAttr':
+            owner = module_names.get(node.inputsAt(0).unique())
+            if owner is not None:
+                name = node.s('name')
+                module_names[node.output().unique()] = owner + '.' + name if owner else name
+        elif node.kind() == 'prim::CallMethod' and node.s('name') == 'forward':
+            name = module_names.get(node.inputsAt(0).unique())
+            if name is None or name not in modules:
+                continue
+            calls.append((name, prefix, node))
+            if not _is_fusable_type(modules[name]):
+                _collect_module_calls(traced, modules, name, calls)
+
+def find_fusable_modules(model, example_inputs):
+    r"""Finds the sequences of submodules of ``model`` that can be fused with
+    :func:`fuse_modules`.
+
+    The model is traced once with ``example_inputs`` and the sequences are read
+    from the dataflow of the traced graph, so they do not depend on the order
+    in which the submodules are registered. A sequence is only reported if
+    every module in it is called exactly once and the output of every module
+    but the last one is used only by the next module in the sequence. Modules
+    that are reused, or whose output is also consumed elsewhere (e.g. by a
+    residual connection), are left unfused.
+
+    The sequences found are the ones supported by :func:`fuse_known_modules`:
+    conv, bn, relu
+    conv, bn
+    conv, relu
+    linear, relu
+    bn, relu
+    Only sequences within the forward of a single module are considered.
+
+    Arguments:
+        model: Model containing the modules to be fused
+        example_inputs: tuple of inputs to trace ``model`` with, or a single tensor
+
+    Returns:
+        list of lists of qualified module names, which can be passed to
+        :func:`fuse_modules`
+
+    Examples::
+
+        >>> m = myModel().eval()
+        >>> modules_to_fuse = torch.quantization.find_fusable_modules(m, torch.randn(1, 3, 224, 224))
+        >>> print(modules_to_fuse)
+        [['conv1', 'bn1', 'relu1'], ['submodule.conv', 'submodule.relu']]
+    """
+    # Trace a copy so that running the model does not update the statistics
+    # of batch norm modules in training mode.
+    traced = torch.jit.trace(copy.deepcopy(model), example_inputs, check_trace=False)
+    modules = dict(model.named_modules())
+    calls = []
+    _collect_module_calls(traced, modules, '', calls)
+
+    call_counts = {}
+    for name, _, _ in calls:
+        call_counts[name] = call_counts.get(name, 0) + 1
+
+    def can_fuse(name):
+        return call_counts[name] == 1 and _is_fusable_type(modules[name])
+
+    # Value ids are only unique within a graph, so outputs are keyed by the
+    # name of the module whose graph contains the call as well.
+    calls_by_output = {}
+    for name, prefix, node in calls:
+        if node.outputsSize() == 1:
+            calls_by_output[(prefix, node.output().unique())] = name
+
+    # Links every call to the module call that is the only consumer of its
+    # output, if that call takes this output as its only input.
+    next_call = {}
+    for name, prefix, node in calls:
+        if not can_fuse(name) or node.outputsSize() != 1:
+            continue
+        uses = node.output().uses()
+        if len(uses) != 1:
+            continue
+        user = uses[0].user
+        if user.kind() != 'prim::CallMethod' or user.inputsSize() != 2 or \
+                user.outputsSize() != 1:
+            continue
+        user_name = calls_by_output.get((prefix, user.output().unique()))
+        if user_name is not None and can_fuse(user_name):
+            next_call[name] = user_name
+    has_previous = set(next_call.values())
+
+    max_length = max(len(types) for types in _OP_LIST_TO_FUSER_METHOD)
+    modules_to_fuse = []
+    for name, _, _ in calls:
+        if name in has_previous or name not in next_call:
+            continue
+        chain = [name]
+        while chain[-1] in next_call:
+            chain.append(next_call[chain[-1]])
+        # Greedily fuse the longest supported sequence starting at every module.
+        start = 0
+        while start < len(chain) - 1:
+            for length in range(min(max_length, len(chain) - start), 1, -1):
+                candidate = chain[start:start + length]
+                if tuple(type(modules[n]) for n in candidate) in _OP_LIST_TO_FUSER_METHOD:
+                    modules_to_fuse.append(candidate)
+                    start += length
+                    break
+            else:
+                start += 1
+    return modules_to_fuse
+
+def fuse_modules_by_tracing(model, example_inputs, inplace=False, fuser_func=fuse_known_modules):
+    r"""Fuses all the sequences of modules of ``model`` found by
+    :func:`find_fusable_modules`.
+
+    Arguments:
+        model: Model containing the modules to be fused
+        example_inputs: tuple of inputs to trace ``model`` with, or a single tensor
+        inplace: bool specifying if fusion happens in place on the model, by default
+                 a new model is returned
+        fuser_func: Function that takes in a list of modules and outputs a list of fused modules
+                    of the same length, see :func:`fuse_modules`
+    Returns:
+        model with fused modules. A new copy is created if inplace=False.
+
+    Examples::
+
+            >>> m = myModel().eval()
+            >>> fused_m = torch.quantization.fuse_modules_by_tracing(m, torch.randn(1, 3, 224, 224))
+            >>> output = fused_m(input)
+    """
+    modules_to_fuse = find_fusable_modules(model, example_inputs)
+    if not inplace:
+        model = copy.deepcopy(model)
+    for module_list in modules_to_fuse:
+        _fuse_modules(model, module_list, fuser_func)
+    return model
@@ -1,6 +1,8 @@
 from __future__ import absolute_import, division, print_function, unicode_literals
 
+import itertools
 import math
+import struct
 import warnings
 from abc import ABCMeta, abstractmethod
 from functools import partial
@@ -49,7 +51,10 @@ class ObserverBase(ABC, nn.Module):
     Concrete observers should follow the same API. In forward, they will update
     the statistics of the observed Tensor. And they should provide a
     `calculate_qparams` function that computes the quantization parameters given
-    the collected statistics.
+    the collected statistics. Observers that support calibrating on several data
+    shards or processes also provide a `merge(other)` method, which merges the
+    statistics recorded by ``other``, an observer of the same type, as if this
+    observer had also seen the inputs observed by ``other``.
 
     Args:
         dtype: Quantized data type
@@ -74,6 +79,11 @@ class ObserverBase(ABC, nn.Module):
     def get_qparams(self, **kwargs):
         pass
 
+    def _check_mergeable(self, other):
+        if not isinstance(other, type(self)):
+            raise TypeError("Cannot merge {} into {}".format(
+                type(other).__name__, type(self).__name__))
+
     with_args = classmethod(_with_args)
 
 
@@ -304,6 +314,25 @@ class MinMaxObserver(_ObserverBase):
         r"""Calculates the quantization parameters."""
         return self._calculate_qparams(self.min_val, self.max_val)
 
+    def merge(self, other):
+        r"""Merges the running minimum and maximum of ``other`` into this
+        observer. Moving average observers merge to the envelope of both
+        running averages.
+        """
+        self._check_mergeable(other)
+        if other.min_val.numel() == 0 or other.max_val.numel() == 0:
+            return
+        if self.min_val.numel() == 0 or self.max_val.numel() == 0:
+            min_val = other.min_val
+            max_val = other.max_val
+        else:
+            min_val = torch.min(self.min_val, other.min_val.to(self.min_val.device))
+            max_val = torch.max(self.max_val, other.max_val.to(self.max_val.device))
+        self.min_val.resize_(min_val.shape)
+        self.max_val.resize_(max_val.shape)
+        self.min_val.copy_(min_val)
+        self.max_val.copy_(max_val)
+
     @torch.jit.export
     def extra_repr(self):
         return "min_val={}, max_val={}".format(self.min_val, self.max_val)
@@ -597,6 +626,27 @@ class PerChannelMinMaxObserver(_ObserverBase):
         scales, zero_points = self.calculate_qparams()
         return scales, zero_points, self.ch_axis
 
+    def merge(self, other):
+        r"""Merges the running per channel minimum and maximum of ``other``
+        into this observer."""
+        self._check_mergeable(other)
+        if other.min_vals.numel() == 0 or other.max_vals.numel() == 0:
+            return
+        if self.min_vals.numel() == 0 or self.max_vals.numel() == 0:
+            min_vals = other.min_vals
+            max_vals = other.max_vals
+        else:
+            if self.min_vals.shape != other.min_vals.shape:
+                raise RuntimeError(
+                    "Cannot merge observers with {} and {} channels".format(
+                        self.min_vals.numel(), other.min_vals.numel()))
+            min_vals = torch.min(self.min_vals, other.min_vals.to(self.min_vals.device))
+            max_vals = torch.max(self.max_vals, other.max_vals.to(self.max_vals.device))
+        self.min_vals.resize_(min_vals.shape)
+        self.max_vals.resize_(max_vals.shape)
+        self.min_vals.copy_(min_vals)
+        self.max_vals.copy_(max_vals)
+
     def extra_repr(self):
         return "min_val={}, max_val={}".format(self.min_vals, self.max_vals)
 
@@ -674,6 +724,42 @@ class MovingAveragePerChannelMinMaxObserver(PerChannelMinMaxObserver):
         self.max_vals.copy_(max_vals)
         return x_orig
 
+def _rebin_histogram(histogram, src_min, src_max, dst_min, dst_max, dst_bins):
+    r"""Redistributes ``histogram``, whose bins evenly span
+    ``[src_min, src_max]``, onto ``dst_bins`` bins evenly spanning
+    ``[dst_min, dst_max]``. Values are assumed to be uniformly distributed
+    within every source bin. The destination range must contain the source
+    range.
+    """
+    device = histogram.device
+    dtype = histogram.dtype
+    src_bins = histogram.numel()
+    src_width = (src_max - src_min) / src_bins
+    dst_width = (dst_max - dst_min) / dst_bins
+    out = torch.zeros(dst_bins, device=device, dtype=torch.double)
+    if src_width == 0:
+        # All values are equal, put them in the bin containing src_min.
+        idx = 0 if dst_width == 0 else min(dst_bins - 1, int(math.floor((src_min - dst_min) / dst_width)))
+        out[idx] = histogram.to(torch.double).sum()
+        return out.to(dtype)
+
+    histogram = histogram.to(torch.double)
+    cumulative = torch.zeros(src_bins + 1, device=device, dtype=torch.double)
+    cumulative[1:] = torch.cumsum(histogram, 0)
+    padded = torch.cat([histogram, torch.zeros(1, device=device, dtype=torch.double)])
+    # Position of the upper edge of every destination bin, in source bins
+    edges = dst_min + dst_width * torch.arange(1, dst_bins + 1, device=device, dtype=torch.double)
+    positions = torch.clamp((edges - src_min) / src_width, 0, src_bins)
+    whole_bins = torch.floor(positions).to(torch.long)
+    integral = cumulative[whole_bins] + (positions - whole_bins.to(torch.double)) * padded[whole_bins]
+    # The last edge covers the whole source range, do not lose mass to
+    # rounding errors.
+    integral[-1] = cumulative[-1]
+    out[0] = integral[0]
+    out[1:] = integral[1:] - integral[:-1]
+    return out.to(dtype)
+
+
 class HistogramObserver(_ObserverBase):
     r"""
     The module records the running histogram of tensor values along with
@@ -720,8 +806,21 @@ class HistogramObserver(_ObserverBase):
         By selecting new min/max, we filter out outliers in input distribution.
         This follows the implementation of NormMinimization::NonlinearQuantizationParamsSearch in
         caffe2/quantization/server/norm_minimization.cc
+
+        The sequence of candidate ranges does not depend on the quantization
+        errors, so candidates are generated up front and their errors are
+        computed in batches with tensor ops over all source bins.
+
+        This does not reproduce the single precision arithmetic of the scalar
+        implementation, so its min/max can differ in rare cases: the errors
+        are computed in double precision rather than accumulated bin by bin
+        in single precision, so when the errors of two successive candidates
+        are within float32 rounding of each other the search may stop at a
+        different candidate, and the quantile thresholds use the total of the
+        cumulative sum, which is accumulated in double, so they can differ
+        for histograms of more than 2**24 values or with fractional counts.
         """
-        def _get_norm(delta_begin, delta_end, density, norm_type):
+        def _get_norm(delta_begin, delta_end, density):
             r"""
             Compute the norm of the values uniformaly distributed between
             delta_begin and delta_end.
@@ -729,117 +828,122 @@ class HistogramObserver(_ObserverBase):
             norm = density * (integral_{begin, end} x^2)
                  = density * (end^3 - begin^3) / 3
             """
-            assert norm_type == "L2", "Only L2 norms are currently supported"
-            norm = 0.0
-            if norm_type == "L2":
-                norm = (
-                    delta_end * delta_end * delta_end
-                    - delta_begin * delta_begin * delta_begin
-                ) / 3
+            norm = (
+                delta_end * delta_end * delta_end
+                - delta_begin * delta_begin * delta_begin
+            ) / 3
             return density * norm
 
-        def _compute_quantization_error(next_start_bin, next_end_bin, norm_type):
+        def _to_float32(x):
+            # Round a Python float to single precision, matching the
+            # arithmetic on float tensors.
+            return struct.unpack('f', struct.pack('f', x))[0]
+
+        def _candidate_bins():
             r"""
-            Compute the quantization error if we use start_bin to end_bin as the
-            min and max to do the quantization.
+            Yields the successive (start_bin, end_bin) candidates of the
+            search, moving the bound that cuts off less mass at every step.
             """
-            bin_width = (self.max_val.item() - self.min_val.item()) / self.bins
-
-            norm = 0.0
-            dst_bin_width = bin_width * (next_end_bin - next_start_bin + 1) / self.dst_nbins
-            if dst_bin_width == 0.0:
-                return 0.0
-            for src_bin in range(self.bins):
-                # distances from the beginning of first dst_bin to the beginning and
-                # end of src_bin
-                src_bin_begin = (src_bin - next_start_bin) * bin_width
-                src_bin_end = src_bin_begin + bin_width
-
-                # which dst_bins the beginning and end of src_bin belong to?
-                dst_bin_of_begin = min(
-                    self.dst_nbins - 1, max(0.0, math.floor(src_bin_begin / dst_bin_width))
-                )
-                dst_bin_of_end = min(
-                    self.dst_nbins - 1, max(0.0, math.floor(src_bin_end / dst_bin_width))
-                )
-                dst_bin_of_begin_center = (
-                    dst_bin_of_begin * dst_bin_width + dst_bin_width / 2
-                )
-
-                density = self.histogram[src_bin] / bin_width
-                if dst_bin_of_begin == dst_bin_of_end:
-                    # if src_bin is entirely within 1 dst_bin
-                    delta_begin = src_bin_begin - dst_bin_of_begin_center
-                    delta_end = src_bin_end - dst_bin_of_begin_center
-                    norm = norm + _get_norm(delta_begin, delta_end, density, norm_type)
+            cSum = torch.cumsum(self.histogram, dim=0).tolist()
+            total = cSum[-1]
+
+            stepsize = 1e-5  # granularity
+            alpha = 0.0  # lower bound
+            beta = 1.0  # upper bound
+            start_bin = 0
+            end_bin = self.bins - 1
+            while alpha < beta:
+                # Find the next step
+                next_alpha = alpha + stepsize
+                next_beta = beta - stepsize
+                alpha_total = _to_float32(_to_float32(next_alpha) * total)
+                beta_total = _to_float32(_to_float32(next_beta) * total)
+
+                # find the left and right bins between the quantile bounds
+                l = start_bin
+                r = end_bin
+                while l < end_bin and cSum[l] < alpha_total:
+                    l = l + 1
+                while r > start_bin and cSum[r] > beta_total:
+                    r = r - 1
+
+                # decide the next move
+                next_start_bin = start_bin
+                next_end_bin = end_bin
+                if (l - start_bin) > (end_bin - r):
+                    # move the start bin
+                    next_start_bin = l
+                    alpha = next_alpha
                 else:
-                    delta_begin = src_bin_begin - dst_bin_of_begin_center
-                    delta_end = dst_bin_width / 2
-                    norm = norm + _get_norm(delta_begin, delta_end, density, norm_type)
+                    # move the end bin
+                    next_end_bin = r
+                    beta = next_beta
 
-                    norm = norm + (dst_bin_of_end - dst_bin_of_begin - 1) * _get_norm(
-                        -dst_bin_width / 2, dst_bin_width / 2, density, norm_type
-                    )
+                if next_start_bin == start_bin and next_end_bin == end_bin:
+                    continue
 
-                    dst_bin_of_end_center = (
-                        dst_bin_of_end * dst_bin_width + dst_bin_width / 2
-                    )
-
-                    delta_begin = -dst_bin_width / 2
-                    delta_end = src_bin_end - dst_bin_of_end_center
-                    norm = norm + _get_norm(delta_begin, delta_end, density, norm_type)
-            return norm
+                yield next_start_bin, next_end_bin
+                start_bin = next_start_bin
+                end_bin = next_end_bin
 
         assert self.histogram.size()[0] == self.bins, "bins mistmatch"
         bin_width = (self.max_val - self.min_val) / self.bins
+        src_bin_width = (self.max_val.item() - self.min_val.item()) / self.bins
+        src_bin = torch.arange(self.bins, dtype=torch.double)
+        density = self.histogram.to(torch.double) / src_bin_width if src_bin_width else None
 
-        # cumulative sum
-        total = sum(self.histogram)
-        cSum = torch.cumsum(self.histogram, dim=0)
+        def _compute_quantization_error(next_start_bins, next_end_bins):
+            r"""
+            Compute the quantization errors if we use each pair of start_bin
+            and end_bin as the min and max to do the quantization. Returns one
+            error per candidate.
+            """
+            if density is None:
+                return torch.zeros(len(next_start_bins), dtype=torch.double)
+            next_start_bins = torch.tensor(next_start_bins, dtype=torch.double).unsqueeze(1)
+            next_end_bins = torch.tensor(next_end_bins, dtype=torch.double).unsqueeze(1)
+            dst_bin_width = src_bin_width * (next_end_bins - next_start_bins + 1) / self.dst_nbins
+
+            # distances from the beginning of first dst_bin to the beginning and
+            # end of every src_bin
+            src_bin_begin = (src_bin - next_start_bins) * src_bin_width
+            src_bin_end = src_bin_begin + src_bin_width
+
+            # which dst_bins the beginning and end of every src_bin belong to?
+            dst_bin_of_begin = torch.clamp(torch.floor(src_bin_begin / dst_bin_width), 0, self.dst_nbins - 1)
+            dst_bin_of_end = torch.clamp(torch.floor(src_bin_end / dst_bin_width), 0, self.dst_nbins - 1)
+            dst_bin_of_begin_center = dst_bin_of_begin * dst_bin_width + dst_bin_width / 2
+            dst_bin_of_end_center = dst_bin_of_end * dst_bin_width + dst_bin_width / 2
+
+            # The error of the part of src_bin in its first dst_bin, in the
+            # dst_bins it covers entirely and in its last dst_bin. When src_bin
+            # lies within a single dst_bin, the middle term is negative and the
+            # three terms add up to the error over [src_bin_begin, src_bin_end].
+            norm = _get_norm(src_bin_begin - dst_bin_of_begin_center, dst_bin_width / 2, density)
+            norm += (dst_bin_of_end - dst_bin_of_begin - 1) * _get_norm(
+                -dst_bin_width / 2, dst_bin_width / 2, density)
+            norm += _get_norm(-dst_bin_width / 2, src_bin_end - dst_bin_of_end_center, density)
+            return norm.sum(dim=1)
 
-        stepsize = 1e-5  # granularity
-        alpha = 0.0  # lower bound
-        beta = 1.0  # upper bound
         start_bin = 0
         end_bin = self.bins - 1
         norm_min = float("inf")
-
-        while alpha < beta:
-            # Find the next step
-            next_alpha = alpha + stepsize
-            next_beta = beta - stepsize
-
-            # find the left and right bins between the quantile bounds
-            l = start_bin
-            r = end_bin
-            while l < end_bin and cSum[l] < next_alpha * total:
-                l = l + 1
-            while r > start_bin and cSum[r] > next_beta * total:
-                r = r - 1
-
-            # decide the next move
-            next_start_bin = start_bin
-            next_end_bin = end_bin
-            if (l - start_bin) > (end_bin - r):
-                # move the start bin
-                next_start_bin = l
-                alpha = next_alpha
-            else:
-                # move the end bin
-                next_end_bin = r
-                beta = next_beta
-
-            if next_start_bin == start_bin and next_end_bin == end_bin:
-                continue
-
-            # calculate the quantization error using next_start_bin and next_end_bin
-            norm = _compute_quantization_error(next_start_bin, next_end_bin, "L2")
-
-            if norm > norm_min:
+        candidates = _candidate_bins()
+        batch_size = 32
+        done = False
+        while not done:
+            batch = list(itertools.islice(candidates, batch_size))
+            if not batch:
                 break
-            norm_min = norm
-            start_bin = next_start_bin
-            end_bin = next_end_bin
+            next_start_bins, next_end_bins = zip(*batch)
+            norms = _compute_quantization_error(next_start_bins, next_end_bins).tolist()
+            for next_start_bin, next_end_bin, norm in zip(next_start_bins, next_end_bins, norms):
+                if norm > norm_min:
+                    done = True
+                    break
+                norm_min = norm
+                start_bin = next_start_bin
+                end_bin = next_end_bin
 
         new_min = self.min_val + bin_width * start_bin
         new_max = self.min_val + bin_width * (end_bin + 1)
@@ -866,23 +970,28 @@ class HistogramObserver(_ObserverBase):
     @torch.jit.ignore
     def _combine_histograms(self, orig_hist, new_hist, upsample_rate, downsample_rate, start_idx, Nbins):
         # type: (Tensor, Tensor, int, int, int, int) -> Tensor
-        # First up-sample the histogram with new data by a factor of L
-        # This creates an approximate probability density thats piecwise constant
-        upsampled_histogram = new_hist.repeat_interleave(upsample_rate)
-        # Now insert the upsampled histogram into the output
-        # histogram, which is initialized with zeros.
-        # The offset at which the histogram is introduced is determined
-        # by the start index as the output histogram can cover a wider range
-        histogram_with_output_range = torch.zeros((Nbins * downsample_rate), device=orig_hist.device)
-        histogram_with_output_range[start_idx:Nbins * upsample_rate + start_idx] = upsampled_histogram
-        # Compute integral histogram, double precision is needed to ensure
-        # that there are no overflows
-        integral_histogram = torch.cumsum(histogram_with_output_range, 0,
-                                          dtype=torch.double)[downsample_rate - 1 :: downsample_rate]
+        # Conceptually, the histogram with new data is up-sampled by a factor
+        # of L, which creates an approximate probability density thats
+        # piecewise constant, inserted at start_idx into a zero histogram of
+        # Nbins * downsample_rate fine bins and integrated. Instead of
+        # materializing that dense grid, evaluate the integral directly at the
+        # upper edge of every output bin: the first t fine bins cover
+        # t // L whole source bins and t % L fine bins of the next one.
+        device = orig_hist.device
+        edges = torch.arange(1, Nbins + 1, device=device, dtype=torch.long) * downsample_rate - start_idx
+        edges = torch.clamp(edges, 0, Nbins * upsample_rate)
+        whole_bins = edges // upsample_rate
+        partial_bins = (edges % upsample_rate).to(torch.double)
+        # Double precision is needed to ensure that there are no overflows
+        new_hist = new_hist.to(torch.double)
+        cumulative_hist = torch.zeros(Nbins + 1, device=device, dtype=torch.double)
+        cumulative_hist[1:] = torch.cumsum(new_hist, 0)
+        padded_hist = torch.cat([new_hist, torch.zeros(1, device=device, dtype=torch.double)])
+        integral_histogram = cumulative_hist[whole_bins] + partial_bins * padded_hist[whole_bins] / upsample_rate
         # Finally perform interpolation
-        shifted_integral_histogram = torch.zeros((Nbins), device=orig_hist.device)
+        shifted_integral_histogram = torch.zeros((Nbins), device=device, dtype=torch.double)
         shifted_integral_histogram[1:Nbins] = integral_histogram[0:-1]
-        interpolated_histogram = (integral_histogram - shifted_integral_histogram) / upsample_rate
+        interpolated_histogram = integral_histogram - shifted_integral_histogram
         orig_hist = orig_hist + interpolated_histogram.to(torch.float)
         return orig_hist
 
@@ -905,8 +1014,8 @@ class HistogramObserver(_ObserverBase):
             combined_min = torch.min(new_min, min_val)
             combined_max = torch.max(new_max, max_val)
             # combine the existing histogram and new histogram into 1 histogram
-            # We do this by first upsampling the histogram to a dense grid
-            # and then downsampling the histogram efficiently
+            # We do this by (implicitly) upsampling the histogram to a dense
+            # grid and then downsampling the histogram efficiently
             combined_min, combined_max, downsample_rate, start_idx = \
                 self._adjust_min_max(combined_min, combined_max, self.upsample_rate)
             combined_histogram = torch.histc(x, self.bins, min=combined_min, max=combined_max)
@@ -929,6 +1038,40 @@ class HistogramObserver(_ObserverBase):
             self.max_val.copy_(combined_max)
         return x_orig
 
+    def merge(self, other):
+        r"""Merges the histogram of ``other`` into this observer. Both
+        histograms are rebinned onto ``self.bins`` bins spanning the combined
+        range, assuming values are uniformly distributed within every bin.
+        """
+        self._check_mergeable(other)
+        if other.min_val.numel() == 0 or other.max_val.numel() == 0:
+            return
+        device = self.histogram.device
+        other_min = other.min_val.to(device)
+        other_max = other.max_val.to(device)
+        other_histogram = other.histogram.to(device)
+        if self.min_val.numel() == 0 or self.max_val.numel() == 0:
+            combined_min, combined_max = other_min, other_max
+            combined_histogram = _rebin_histogram(
+                other_histogram, other_min.item(), other_max.item(),
+                combined_min.item(), combined_max.item(), self.bins)
+        else:
+            combined_min = torch.min(self.min_val, other_min)
+            combined_max = torch.max(self.max_val, other_max)
+            combined_histogram = _rebin_histogram(
+                self.histogram, self.min_val.item(), self.max_val.item(),
+                combined_min.item(), combined_max.item(), self.bins)
+            combined_histogram += _rebin_histogram(
+                other_histogram, other_min.item(), other_max.item(),
+                combined_min.item(), combined_max.item(), self.bins)
+
+        self.histogram.resize_(combined_histogram.shape)
+        self.histogram.copy_(combined_histogram)
+        self.min_val.resize_(combined_min.shape)
+        self.min_val.copy_(combined_min)
+        self.max_val.resize_(combined_max.shape)
+        self.max_val.copy_(combined_max)
+
     @torch.jit.export
     def calculate_qparams(self):
         if self.min_val.numel() == 0 or self.max_val.numel() == 0:
@@ -992,6 +1135,11 @@ class RecordingObserver(_ObserverBase):
     def get_tensor_value(self):
         return self.tensor_val
 
+    def merge(self, other):
+        r"""Appends the tensors recorded by ``other`` to the recorded tensors."""
+        self._check_mergeable(other)
+        self.tensor_val.extend(other.tensor_val)
+
 
 class NoopObserver(ObserverBase):
     r"""
@@ -1018,6 +1166,42 @@ class NoopObserver(ObserverBase):
     def get_qparams(self):
         return self.calculate_qparams()
 
+    def merge(self, other):
+        r"""Does nothing, there are no statistics to merge."""
+        self._check_mergeable(other)
+
+
+class RowwiseWeightObserver(ObserverBase):
+    r"""
+    Observer that doesn't do anything and just passes the bit width to the
+    quantized module's ``.from_float()``.
+
+    Used for embedding tables, whose rows are quantized with their own scale
+    and bias when the weight is packed, so no ranges need to be determined.
+
+    Args:
+        dtype: Quantized data type
+        bit_width: Number of bits per quantized value, 8 or 4
+    """
+    def __init__(self, dtype=torch.quint8, bit_width=8):
+        if bit_width not in (8, 4):
+            raise ValueError("Only 8 and 4 bit row-wise quantization is supported")
+        super(RowwiseWeightObserver, self).__init__(dtype=dtype)
+        self.bit_width = bit_width
+
+    def forward(self, x):
+        return x
+
+    def calculate_qparams(self):
+        raise Exception("calculate_qparams should not be called for RowwiseWeightObserver")
+
+    def get_qparams(self):
+        return self.calculate_qparams()
+
+    def merge(self, other):
+        r"""Does nothing, there are no statistics to merge."""
+        self._check_mergeable(other)
+
 
 # Restrict activations to be in the range (0,127)
 default_observer = MinMaxObserver.with_args(reduce_range=True)
@@ -66,6 +66,8 @@ default_dynamic_qconfig = QConfigDynamic(activation=default_dynamic_quant_observ
 float16_dynamic_qconfig = QConfigDynamic(activation=default_dynamic_quant_observer,
                                          weight=NoopObserver.with_args(dtype=torch.float16))
 per_channel_dynamic_qconfig = QConfigDynamic(weight=default_per_channel_weight_observer)
+embedding_8bit_dynamic_qconfig = QConfigDynamic(weight=RowwiseWeightObserver.with_args(bit_width=8))
+embedding_4bit_dynamic_qconfig = QConfigDynamic(weight=RowwiseWeightObserver.with_args(bit_width=4))
 
 default_qat_qconfig = QConfig(activation=default_fake_quant,
                               weight=default_weight_fake_quant)
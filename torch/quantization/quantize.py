@@ -12,9 +12,11 @@ import torch.nn.quantized as nnq
 from .default_mappings import (DEFAULT_DYNAMIC_MODULE_MAPPING,
                                DEFAULT_MODULE_MAPPING,
                                DEFAULT_QAT_MODULE_MAPPING,
-                               DEFAULT_QCONFIG_PROPAGATE_WHITE_LIST)
+                               DEFAULT_QCONFIG_PROPAGATE_WHITE_LIST,
+                               DEFAULT_DYNAMIC_QCONFIG_PROPAGATE_WHITE_LIST)
 from .stubs import DeQuantStub, QuantWrapper
 from .qconfig import default_dynamic_qconfig, float16_dynamic_qconfig
+from .observer import ObserverBase, RecordingObserver
 
 def _propagate_qconfig_helper(module, qconfig_dict, white_list=None,
                               qconfig_parent=None, prefix=''):
@@ -197,6 +199,8 @@ def quantize_dynamic(model, qconfig_spec=None, dtype=torch.qint8,
 
     For simplest usage provide `dtype` argument that can be float16 or qint8. Weight-only quantization
     by default is performed for layers with large weights size - i.e. Linear and RNN variants.
+    Embedding and EmbeddingBag are quantized row-wise when listed in `qconfig_spec`, to 8 bits
+    by default or to 4 bits with `embedding_4bit_dynamic_qconfig`.
 
     Fine grained control is possible with `qconfig` and `mapping` that act similarly to `quantize()`.
     If `qconfig` is provided, the `dtype` argument is ignored.
@@ -224,11 +228,16 @@ def quantize_dynamic(model, qconfig_spec=None, dtype=torch.qint8,
             qconfig_spec = {
                 nn.Linear : default_dynamic_qconfig,
                 nn.LSTM : default_dynamic_qconfig,
+                nn.GRU : default_dynamic_qconfig,
+                nn.LSTMCell : default_dynamic_qconfig,
+                nn.RNNCell : default_dynamic_qconfig,
+                nn.GRUCell : default_dynamic_qconfig,
             }
         elif dtype == torch.float16:
             qconfig_spec = {
                 nn.Linear : float16_dynamic_qconfig,
                 nn.LSTM : float16_dynamic_qconfig,
+                nn.GRU : float16_dynamic_qconfig,
             }
         else:
             raise ValueError(
@@ -248,7 +257,7 @@ def quantize_dynamic(model, qconfig_spec=None, dtype=torch.qint8,
     if not inplace:
         model = copy.deepcopy(model)
     model.eval()
-    propagate_qconfig_(model, qconfig_spec)
+    propagate_qconfig_(model, qconfig_spec, DEFAULT_DYNAMIC_QCONFIG_PROPAGATE_WHITE_LIST)
     convert(model, mapping, inplace=True)
     _remove_qconfig(model)
     return model
@@ -368,3 +377,72 @@ def get_observer_dict(mod, target_dict, prefix=""):
     for name, child in mod.named_children():
         module_prefix = get_prefix(prefix) + name if prefix else name
         get_observer_dict(child, target_dict, module_prefix)
+
+def _get_mergeable_observers(mod):
+    observers = {}
+    get_observer_dict(mod, observers)
+    observers = {name: obs for name, obs in observers.items()
+                 if isinstance(obs, ObserverBase)}
+    for name, obs in observers.items():
+        if not hasattr(obs, 'merge'):
+            raise RuntimeError("Observer {} of type {} does not define merge(), its "
+                               "statistics cannot be merged".format(name, type(obs).__name__))
+    return observers
+
+def _observer_state_cpu(obs):
+    state = copy.deepcopy(obs).cpu()
+    if isinstance(obs, RecordingObserver):
+        state.tensor_val = [t.cpu() for t in state.tensor_val]
+    return state
+
+def _copy_observer_state(dst, src):
+    for name, buf in src.named_buffers(recurse=False):
+        own = getattr(dst, name)
+        own.resize_(buf.shape)
+        own.copy_(buf)
+    if isinstance(dst, RecordingObserver):
+        dst.tensor_val = list(src.tensor_val)
+
+def merge_observers(model, other_models):
+    r"""Merges the statistics recorded by the observers of ``other_models``
+    into the corresponding observers of ``model``. All models must be
+    prepared from the same float model, e.g. copies of a prepared model
+    that were calibrated on different shards of the calibration data.
+
+    Args:
+        model: prepared model whose observers are updated inplace
+        other_models: iterable of prepared models with the same observers
+    """
+    observers = _get_mergeable_observers(model)
+    for other in other_models:
+        other_observers = _get_mergeable_observers(other)
+        if set(other_observers.keys()) != set(observers.keys()):
+            raise RuntimeError("Cannot merge observers of models with "
+                               "different structures")
+        for name, obs in observers.items():
+            obs.merge(other_observers[name])
+
+def all_reduce_observers(model, group=None):
+    r"""Merges the statistics recorded by the observers of ``model`` across
+    all processes of ``group``, so that every process computes the same
+    quantization parameters in `convert`. Each process calibrates the
+    model on its own shard of the calibration data, then calls this
+    function before `convert`. The statistics are merged in rank order,
+    which makes the result identical on every process.
+
+    Args:
+        model: prepared model whose observers are updated inplace
+        group: process group to reduce over, defaults to the default group
+    """
+    import torch.distributed as dist
+    if group is None:
+        group = dist.group.WORLD
+    observers = _get_mergeable_observers(model)
+    local_state = {name: _observer_state_cpu(obs) for name, obs in observers.items()}
+    gathered = [None] * dist.get_world_size(group)
+    dist.all_gather_object(gathered, local_state, group=group)
+    for name, obs in observers.items():
+        merged = gathered[0][name]
+        for state in gathered[1:]:
+            merged.merge(state[name])
+        _copy_observer_state(obs, merged)
@@ -1,5 +1,6 @@
 import concurrent.futures
 import sys
+import threading
 import time
 import unittest
 from collections import namedtuple
@@ -298,6 +299,57 @@ def get_rref_debug_info():
     return _rref_context_get_debug_info()
 
 
+@rpc.functions.async_execution
+def async_add_chained(to, x, y, z):
+    return rpc.rpc_async(to, torch.add, args=(x, y)).then(
+        lambda fut: fut.wait() + z
+    )
+
+
+@rpc.functions.async_execution
+def async_wrong_type():
+    return torch.zeros(2, 2)
+
+
+pending_futures = []
+pending_futures_lock = threading.Lock()
+
+
+@rpc.functions.async_execution
+def async_wait_for_result():
+    fut = rpc.Future()
+    with pending_futures_lock:
+        pending_futures.append(fut)
+    return fut
+
+
+def complete_pending_futures(num_futures, value):
+    while True:
+        with pending_futures_lock:
+            if len(pending_futures) == num_futures:
+                futs = pending_futures[:]
+                del pending_futures[:]
+                break
+        time.sleep(0.01)
+    for fut in futs:
+        fut.set_result(value)
+
+
+# Number of calls in every invocation of batched_add in this process.
+batch_sizes = []
+
+
+@rpc.functions.batch(max_batch_size=4, max_wait_ms=100)
+def batched_add(a, b):
+    # ``a`` and ``b`` hold one value per call in the batch.
+    batch_sizes.append(len(a))
+    return [x + y for x, y in zip(a, b)]
+
+
+def get_batch_sizes():
+    return list(batch_sizes)
+
+
 # load_tests from common_utils is used to automatically filter tests for
 # sharding on sandcastle. This line silences flake warnings
 load_tests = load_tests
@@ -2366,6 +2418,97 @@ class RpcTest(RpcAgentTestFixture):
             self.assertEqual(t_view, t_ret)
             self.assertFalse(t_ret.is_contiguous())
 
+    @dist_init
+    def test_rpc_async_batch(self):
+        dst = worker_name((self.rank + 1) % self.world_size)
+        futs = rpc.rpc_async_batch(
+            dst,
+            [
+                (torch.add, (torch.ones(2, 2), 1)),
+                (my_function, (torch.ones(2, 2), 1, 3)),
+                (raise_func,),
+                (min, (1, 2), None),
+                (my_sleep_func, None, {"seconds": 0}),
+            ],
+        )
+        self.assertEqual(len(futs), 5)
+        self.assertEqual(futs[0].wait(), torch.ones(2, 2) + 1)
+        self.assertEqual(futs[1].wait(), torch.ones(2, 2) + 1 + 3)
+        with self.assertRaisesRegex(ValueError, "Expected error"):
+            futs[2].wait()
+        self.assertEqual(futs[3].wait(), 1)
+        self.assertEqual(futs[4].wait(), None)
+
+    @dist_init
+    def test_rpc_async_batch_script_function(self):
+        dst = worker_name((self.rank + 1) % self.world_size)
+        with self.assertRaisesRegex(TypeError, "TorchScript"):
+            rpc.rpc_async_batch(dst, [(my_script_func, (torch.ones(2),))])
+
+    @dist_init
+    def test_async_function_chained(self):
+        dst1 = worker_name((self.rank + 1) % self.world_size)
+        dst2 = worker_name((self.rank + 2) % self.world_size)
+        ret = rpc.rpc_sync(
+            dst1, async_add_chained, args=(dst2, torch.ones(2, 2), 1, 2)
+        )
+        self.assertEqual(ret, torch.ones(2, 2) + 3)
+
+    @dist_init
+    def test_async_function_wrong_return_type(self):
+        dst = worker_name((self.rank + 1) % self.world_size)
+        with self.assertRaisesRegex(TypeError, "must return a"):
+            rpc.rpc_sync(dst, async_wrong_type)
+
+    @dist_init
+    def test_async_function_releases_thread(self):
+        if self.rank != 0:
+            return
+        dst = worker_name((self.rank + 1) % self.world_size)
+        # Exceed the number of agent threads. If every pending call held on to
+        # a thread, the call completing the futures could never run.
+        num_futures = 20
+        futs = [
+            rpc.rpc_async(dst, async_wait_for_result) for _ in range(num_futures)
+        ]
+        rpc.rpc_sync(dst, complete_pending_futures, args=(num_futures, 7))
+        for fut in futs:
+            self.assertEqual(fut.wait(), 7)
+
+    @dist_init
+    def test_future_then(self):
+        dst = worker_name((self.rank + 1) % self.world_size)
+        fut = rpc.rpc_async(dst, torch.add, args=(torch.ones(2), 1))
+        chained = fut.then(lambda f: f.wait() * 2)
+        self.assertEqual(chained.wait(), (torch.ones(2) + 1) * 2)
+        self.assertTrue(chained.done())
+
+        def raise_in_callback(f):
+            raise ValueError("Expected error")
+
+        with self.assertRaisesRegex(Exception, "Expected error"):
+            rpc.rpc_async(dst, torch.add, args=(1, 1)).then(raise_in_callback).wait()
+
+    @dist_init
+    def test_batch_decorator(self):
+        dst = worker_name((self.rank + 1) % self.world_size)
+        futs = [
+            rpc.rpc_async(dst, batched_add, args=(torch.ones(2) * i, i))
+            for i in range(8)
+        ]
+        for i, fut in enumerate(futs):
+            self.assertEqual(fut.wait(), torch.ones(2) * i + i)
+
+        # Concurrent calls were coalesced into fewer invocations. The callee
+        # may also have run its own local call.
+        sizes = rpc.rpc_sync(dst, get_batch_sizes)
+        self.assertGreaterEqual(sum(sizes), len(futs))
+        self.assertLess(len(sizes), sum(sizes))
+        self.assertLessEqual(max(sizes), 4)
+
+        # Calls made locally are batched as well.
+        self.assertEqual(batched_add(torch.ones(2), 1), torch.ones(2) + 1)
+
 
 class FaultyAgentRpcTest(FaultyRpcAgentTestFixture):
 
@@ -0,0 +1,3 @@
+from .timer import Timer  # noqa: F401
+from .measurement import Measurement, TaskSpec  # noqa: F401
+from .compare import Compare  # noqa: F401
@@ -0,0 +1,116 @@
+"""Tables comparing the measurements of :class:`~torch.utils.benchmark.Timer`."""
+from collections import OrderedDict
+
+from .measurement import Measurement, select_unit
+
+
+class Compare(object):
+    r"""Formats measurements as tables, one table per label.
+
+    The rows of a table are the sub labels, the number of threads and the
+    environments of the measurements, and its columns are their
+    descriptions. Cells show the median time per iteration, followed by the
+    relative interquartile range when the measurement is noisy.
+
+    When the measurements come from several environments, e.g. two builds of
+    PyTorch, the rows of every environment but the first also show the
+    relative change of the median against the first environment. The change
+    is marked with ``*`` when it is statistically significant, according to
+    :meth:`Measurement.significantly_differs`.
+
+    Arguments:
+        results (list of Measurement): the measurements to compare.
+            Measurements of the same task are merged.
+        alpha (float): the significance level of differences. Default: 0.05
+
+    Example::
+
+        >>> results = []
+        >>> for n in [64, 256]:
+        >>>     for threads in [1, 4]:
+        >>>         results.append(Timer('x.mm(x)', globals={'x': torch.randn(n, n)},
+        >>>                              label='mm', sub_label=str(n),
+        >>>                              num_threads=threads).blocked_autorange())
+        >>> print(Compare(results))
+    """
+
+    def __init__(self, results, alpha=0.05):
+        self._results = list(results)
+        self.alpha = alpha
+
+    def extend_results(self, results):
+        r"""Adds measurements to the comparison."""
+        self._results.extend(results)
+
+    def _groups(self):
+        groups = OrderedDict()
+        for m in Measurement.merge(self._results):
+            groups.setdefault(m.task_spec.title if m.task_spec.label is None
+                              else m.task_spec.label, []).append(m)
+        return groups
+
+    def _table(self, title, measurements):
+        columns = []
+        envs = []
+        rows = OrderedDict()
+        for m in measurements:
+            spec = m.task_spec
+            if spec.description not in columns:
+                columns.append(spec.description)
+            if spec.env not in envs:
+                envs.append(spec.env)
+            row = rows.setdefault((spec.sub_label, spec.num_threads), OrderedDict())
+            row.setdefault(spec.env, {})[spec.description] = m
+
+        # Use one unit per table, the one of the fastest measurement.
+        unit, scale = select_unit(min(m.median for m in measurements))
+
+        def cell(m, baseline):
+            text = '{:.1f}'.format(m.median / scale)
+            if m.is_noisy:
+                text += ' (+-{:.0f}%)'.format(100 * m.noise)
+            if baseline is not None and baseline is not m:
+                change = m.median / baseline.median - 1
+                significant = m.significantly_differs(baseline, self.alpha)
+                text += ' [{:+.0f}%{}]'.format(100 * change, '*' if significant else '')
+            return text
+
+        header = ['']
+        if len(envs) > 1:
+            header.append('env')
+        header.append('threads')
+        header.extend(str(c) if c is not None else '' for c in columns)
+        lines = [header]
+        for (sub_label, num_threads), by_env in rows.items():
+            baselines = by_env.get(envs[0], {})
+            for env, by_column in by_env.items():
+                line = [sub_label if sub_label is not None else '']
+                if len(envs) > 1:
+                    line.append(str(env))
+                line.append(str(num_threads))
+                for c in columns:
+                    m = by_column.get(c)
+                    line.append(cell(m, baselines.get(c)) if m is not None else '')
+                lines.append(line)
+
+        widths = [max(len(line[i]) for line in lines) for i in range(len(header))]
+        formatted = ['[{}]'.format(' ' + title + ' ')]
+        for i, line in enumerate(lines):
+            formatted.append('  '.join(
+                text.ljust(w) if j == 0 else text.rjust(w)
+                for j, (text, w) in enumerate(zip(line, widths))).rstrip())
+            if i == 0:
+                formatted.append('-' * len(formatted[-1]))
+        formatted.append('')
+        formatted.append('Times are in {}s ({}).'.format(
+            {'ns': 'nanosecond', 'us': 'microsecond', 'ms': 'millisecond', 's': 'second'}[unit], unit))
+        if len(envs) > 1:
+            formatted.append('Changes are relative to env {}, * marks significant changes.'.format(envs[0]))
+        return '\n'.join(formatted)
+
+    def __str__(self):
+        return '\n\n'.join(self._table(title, measurements)
+                           for title, measurements in self._groups().items())
+
+    def print(self):
+        print(str(self))
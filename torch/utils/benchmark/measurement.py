@@ -0,0 +1,198 @@
+"""The results of :class:`~torch.utils.benchmark.Timer` and the statistics
+used to summarize and compare them."""
+import math
+
+
+# A relative interquartile range above this is reported as noisy.
+NOISE_THRESHOLD = 0.1
+
+
+def _quantile(sorted_values, q):
+    r"""Linearly interpolated quantile :attr:`q` of :attr:`sorted_values`,
+    like ``numpy.percentile(values, 100 * q)``."""
+    position = (len(sorted_values) - 1) * q
+    lower = int(math.floor(position))
+    upper = min(lower + 1, len(sorted_values) - 1)
+    weight = position - lower
+    return sorted_values[lower] * (1 - weight) + sorted_values[upper] * weight
+
+
+def mann_whitney_u(x, y):
+    r"""Returns the two-sided p-value of the Mann-Whitney U test that the
+    samples :attr:`x` and :attr:`y` come from the same distribution.
+
+    The normal approximation with a correction for ties is used, it is
+    accurate for samples of at least about 5 values each.
+    """
+    n_x, n_y = len(x), len(y)
+    if n_x == 0 or n_y == 0:
+        raise ValueError("Both samples must be non-empty")
+    values = sorted([(v, 0) for v in x] + [(v, 1) for v in y])
+    n = n_x + n_y
+    rank_sum_x = 0.
+    tie_term = 0.
+    i = 0
+    while i < n:
+        j = i
+        while j + 1 < n and values[j + 1][0] == values[i][0]:
+            j += 1
+        # Tied values get the average of their ranks.
+        rank = (i + j) / 2. + 1
+        ties = j - i + 1
+        tie_term += ties ** 3 - ties
+        rank_sum_x += rank * sum(1 for k in range(i, j + 1) if values[k][1] == 0)
+        i = j + 1
+    u = rank_sum_x - n_x * (n_x + 1) / 2.
+    mean = n_x * n_y / 2.
+    variance = n_x * n_y / 12. * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 1.
+    z = (abs(u - mean) - 0.5) / math.sqrt(variance)
+    return min(1., math.erfc(max(z, 0.) / math.sqrt(2)))
+
+
+class TaskSpec(object):
+    r"""What a measurement measured, used to group measurements in
+    :class:`~torch.utils.benchmark.Compare`."""
+
+    __slots__ = ['stmt', 'setup', 'label', 'sub_label', 'description', 'env', 'num_threads']
+
+    def __init__(self, stmt, setup, label=None, sub_label=None, description=None, env=None,
+                 num_threads=1):
+        self.stmt = stmt
+        self.setup = setup
+        self.label = label
+        self.sub_label = sub_label
+        self.description = description
+        self.env = env
+        self.num_threads = num_threads
+
+    @property
+    def title(self):
+        if self.label is not None:
+            return self.label + (': {}'.format(self.sub_label) if self.sub_label else '')
+        if callable(self.stmt):
+            return getattr(self.stmt, '__name__', repr(self.stmt))
+        return self.stmt
+
+    def _key(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other):
+        return isinstance(other, TaskSpec) and self._key() == other._key()
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(tuple(id(v) if callable(v) else v for v in self._key()))
+
+
+class Measurement(object):
+    r"""The times of a statement measured by :class:`~torch.utils.benchmark.Timer`.
+
+    The statement is run in blocks of :attr:`number_per_run` iterations, and
+    the time of every block is recorded. Statistics are computed on the time
+    per iteration of the blocks, which averages out the noise within a block.
+
+    Attributes:
+        number_per_run (int): number of iterations per block.
+        raw_times (list of float): time in seconds of every block.
+        task_spec (TaskSpec): the statement, its setup and its labels.
+    """
+
+    def __init__(self, number_per_run, raw_times, task_spec):
+        if not raw_times:
+            raise ValueError("A measurement needs at least one time")
+        self.number_per_run = number_per_run
+        self.raw_times = list(raw_times)
+        self.task_spec = task_spec
+
+    @property
+    def times(self):
+        r"""Time in seconds per iteration of every block."""
+        return [t / self.number_per_run for t in self.raw_times]
+
+    @property
+    def median(self):
+        return _quantile(sorted(self.times), 0.5)
+
+    @property
+    def mean(self):
+        times = self.times
+        return sum(times) / len(times)
+
+    @property
+    def iqr(self):
+        r"""Interquartile range of the time per iteration."""
+        times = sorted(self.times)
+        return _quantile(times, 0.75) - _quantile(times, 0.25)
+
+    @property
+    def noise(self):
+        r"""Relative interquartile range ``iqr / median``, an estimate of
+        the noise of the measurement."""
+        median = self.median
+        return self.iqr / median if median > 0 else 0.
+
+    @property
+    def is_noisy(self):
+        r"""Whether :attr:`noise` is larger than 10%, or there are too few
+        blocks to estimate it."""
+        return len(self.raw_times) < 4 or self.noise > NOISE_THRESHOLD
+
+    def significantly_differs(self, other, alpha=0.05):
+        r"""Whether the times per iteration of this measurement and of
+        :attr:`other` differ at the significance level :attr:`alpha`,
+        according to a Mann-Whitney U test on the blocks."""
+        return mann_whitney_u(self.times, other.times) < alpha
+
+    @staticmethod
+    def merge(measurements):
+        r"""Merges the measurements of the same task into one measurement
+        per task, e.g. measurements of several processes."""
+        grouped = []
+        for m in measurements:
+            for merged in grouped:
+                if merged.task_spec == m.task_spec:
+                    # Keep the time per iteration of every block.
+                    merged.raw_times.extend(
+                        t * merged.number_per_run / m.number_per_run for t in m.raw_times)
+                    break
+            else:
+                grouped.append(Measurement(m.number_per_run, m.raw_times, m.task_spec))
+        return grouped
+
+    def __repr__(self):
+        lines = ['<{} object at {}>'.format(type(self).__name__, hex(id(self)))]
+        spec = self.task_spec
+        lines.append(spec.title)
+        if spec.description:
+            lines.append('  ' + spec.description)
+        if spec.env:
+            lines.append('  env: ' + spec.env)
+        lines.append('  {} threads'.format(spec.num_threads))
+        unit, scale = select_unit(self.median)
+        lines.append('  Median: {:.2f} {}'.format(self.median / scale, unit))
+        lines.append('  IQR:    {:.2f} {} ({:.2f} to {:.2f})'.format(
+            self.iqr / scale, unit, _quantile(sorted(self.times), 0.25) / scale,
+            _quantile(sorted(self.times), 0.75) / scale))
+        lines.append('  {} measurements, {} runs per measurement'.format(
+            len(self.raw_times), self.number_per_run))
+        if self.is_noisy:
+            lines.append('  WARNING: Interquartile range is {:.1f}% of the median measurement.'.format(
+                100 * self.noise))
+            lines.append('           This could indicate system fluctuation.')
+        return '\n'.join(lines)
+
+
+_UNITS = [('ns', 1e-9), ('us', 1e-6), ('ms', 1e-3), ('s', 1.)]
+
+
+def select_unit(t):
+    r"""Returns the largest unit in which :attr:`t` seconds is at least 1,
+    and its scale in seconds."""
+    for unit, scale in reversed(_UNITS):
+        if t >= scale:
+            return unit, scale
+    return _UNITS[0]
@@ -0,0 +1,153 @@
+"""A timer for statements using PyTorch, built on :mod:`timeit`."""
+import contextlib
+import timeit
+
+import torch
+from .measurement import Measurement, TaskSpec
+
+
+def _synchronized_timer():
+    torch.cuda.synchronize()
+    return timeit.default_timer()
+
+
+@contextlib.contextmanager
+def _set_num_threads(num_threads):
+    previous = torch.get_num_threads()
+    torch.set_num_threads(num_threads)
+    try:
+        yield
+    finally:
+        torch.set_num_threads(previous)
+
+
+class Timer(object):
+    r"""Measures the execution time of a PyTorch statement.
+
+    The statement is run like with :class:`timeit.Timer`, with PyTorch set to
+    use :attr:`num_threads` threads, and CUDA synchronized before taking each
+    time when CUDA is available. Unlike :mod:`timeit`, the results are
+    :class:`Measurement` objects holding the time of every block of
+    iterations, which summarize the times with robust statistics (median,
+    interquartile range) and can be compared with
+    :class:`~torch.utils.benchmark.Compare`.
+
+    Arguments:
+        stmt (str or callable): the statement to time.
+        setup (str or callable): run once before timing. Default: ``'pass'``
+        timer (callable): returns the current time in seconds. Default:
+            :func:`timeit.default_timer`, preceded by
+            :func:`torch.cuda.synchronize` when CUDA is available
+        globals (dict, optional): namespace in which the statements run.
+        label (str, optional): what is timed, e.g. ``'matmul'``, used to
+            group measurements in tables.
+        sub_label (str, optional): a variant of :attr:`label`, e.g. a shape,
+            one row of a table.
+        description (str, optional): a setting of the statement, e.g. a
+            dtype, one column of a table.
+        env (str, optional): the build or environment, e.g. ``'master'``,
+            measurements of different environments are compared in tables.
+        num_threads (int): the number of threads PyTorch uses while timing,
+            see :func:`torch.set_num_threads`. Default: 1
+
+    Example::
+
+        >>> timer = Timer('x.mm(x)', setup='x = torch.randn(64, 64)', label='mm',
+        ...               sub_label='64x64', num_threads=4)
+        >>> m = timer.blocked_autorange(min_run_time=1)
+        >>> m.median, m.iqr
+    """
+
+    def __init__(self, stmt='pass', setup='pass', timer=None, globals=None, label=None,
+                 sub_label=None, description=None, env=None, num_threads=1):
+        if timer is None:
+            timer = _synchronized_timer if torch.cuda.is_available() else timeit.default_timer
+        globals = dict(globals or {})
+        globals.setdefault('torch', torch)
+        self._timer = timeit.Timer(stmt=stmt, setup=setup, timer=timer, globals=globals)
+        self._timer_fn = timer
+        self._task_spec = TaskSpec(stmt, setup, label, sub_label, description, env, num_threads)
+
+    def _timeit(self, number):
+        with _set_num_threads(self._task_spec.num_threads):
+            return self._timer.timeit(number)
+
+    def timeit(self, number=1000000):
+        r"""Runs the statement :attr:`number` times in one block, like
+        :meth:`timeit.Timer.timeit`, and returns the :class:`Measurement`."""
+        # Warm up, e.g. for lazy initialization and caching allocators.
+        self._timeit(max(number // 100, 1))
+        return Measurement(number, [self._timeit(number)], self._task_spec)
+
+    def repeat(self, repeat=5, number=1000000):
+        r"""Runs :attr:`repeat` blocks of :attr:`number` iterations and
+        returns the :class:`Measurement`."""
+        self._timeit(max(number // 100, 1))
+        return Measurement(number, [self._timeit(number) for _ in range(repeat)], self._task_spec)
+
+    def _estimate_block_size(self, min_block_time):
+        number = 1
+        while True:
+            time_taken = self._timeit(number)
+            if time_taken >= min_block_time:
+                return number
+            # Grow fast while the blocks are much too short.
+            number *= 10 if time_taken < min_block_time / 10 else 2
+
+    def _run_blocks(self, number, stop, callback, min_run_time, max_run_time=None):
+        times = []
+        total_time = 0.
+        start = self._timer_fn()
+        while True:
+            time_taken = self._timeit(number)
+            times.append(time_taken)
+            total_time += time_taken
+            if callback is not None:
+                callback(number, time_taken)
+            elapsed = self._timer_fn() - start
+            if max_run_time is not None and elapsed >= max_run_time:
+                break
+            if total_time >= min_run_time and stop(times):
+                break
+        return Measurement(number, times, self._task_spec)
+
+    def blocked_autorange(self, callback=None, min_run_time=0.2, min_block_time=0.01):
+        r"""Times the statement in blocks until :attr:`min_run_time` seconds
+        have been spent running it.
+
+        The number of iterations per block is chosen so that a block lasts at
+        least :attr:`min_block_time` seconds, which makes the overhead of
+        taking the time negligible, and the time of every block is kept,
+        which lets :class:`Measurement` estimate the noise of the measurement.
+
+        Arguments:
+            callback (callable, optional): called with the number of
+                iterations and the time of every block.
+            min_run_time (float): minimum total time in seconds of the blocks.
+            min_block_time (float): minimum time in seconds of a block.
+        """
+        number = self._estimate_block_size(min_block_time)
+        return self._run_blocks(number, lambda times: True, callback, min_run_time)
+
+    def adaptive_autorange(self, threshold=0.1, min_run_time=0.01, max_run_time=10.,
+                           callback=None, min_block_time=0.01):
+        r"""Times the statement in blocks, like :meth:`blocked_autorange`,
+        until the relative interquartile range of the time per iteration is
+        below :attr:`threshold`, or :attr:`max_run_time` seconds have elapsed.
+
+        Arguments:
+            threshold (float): the relative interquartile range to reach.
+            min_run_time (float): minimum total time in seconds of the blocks.
+            max_run_time (float): maximum time in seconds to spend timing.
+            callback (callable, optional): called with the number of
+                iterations and the time of every block.
+            min_block_time (float): minimum time in seconds of a block.
+        """
+        number = self._estimate_block_size(min_block_time)
+
+        def stop(times):
+            if len(times) < 4:
+                return False
+            return Measurement(number, times, self._task_spec).noise < threshold
+
+        return self._run_blocks(number, stop, callback, min_run_time, max_run_time)
@@ -1,6 +1,9 @@
 from __future__ import absolute_import, division, print_function, unicode_literals
+import time
 import torch
 import warnings
+import weakref
+from collections import defaultdict, namedtuple
 
 
 def detach_variable(inputs):
@@ -57,18 +60,7 @@ class CheckpointFunction(torch.autograd.Function):
     @staticmethod
     def forward(ctx, run_function, preserve_rng_state, *args):
         check_backward_validity(args)
-        ctx.run_function = run_function
-        ctx.preserve_rng_state = preserve_rng_state
-        if preserve_rng_state:
-            ctx.fwd_cpu_state = torch.get_rng_state()
-            # Don't eagerly initialize the cuda context by accident.
-            # (If the user intends that the context is initialized later, within their
-            # run_function, we SHOULD actually stash the cuda state here.  Unfortunately,
-            # we have no way to anticipate this will happen before we run the function.)
-            ctx.had_cuda_in_fwd = False
-            if torch.cuda._initialized:
-                ctx.had_cuda_in_fwd = True
-                ctx.fwd_gpu_devices, ctx.fwd_gpu_states = get_device_states(*args)
+        _stash_rng_state(ctx, run_function, preserve_rng_state, args)
         ctx.save_for_backward(*args)
         with torch.no_grad():
             outputs = run_function(*args)
@@ -79,27 +71,172 @@ class CheckpointFunction(torch.autograd.Function):
         if not torch.autograd._is_checkpoint_valid():
             raise RuntimeError("Checkpointing is not compatible with .grad(), please use .backward() if possible")
         inputs = ctx.saved_tensors
-        # Stash the surrounding rng state, and mimic the state that was
-        # present at this time during forward.  Restore the surrounding state
-        # when we're done.
-        rng_devices = []
-        if ctx.preserve_rng_state and ctx.had_cuda_in_fwd:
-            rng_devices = ctx.fwd_gpu_devices
-        with torch.random.fork_rng(devices=rng_devices, enabled=ctx.preserve_rng_state):
-            if ctx.preserve_rng_state:
-                torch.set_rng_state(ctx.fwd_cpu_state)
-                if ctx.had_cuda_in_fwd:
-                    set_device_states(ctx.fwd_gpu_devices, ctx.fwd_gpu_states)
-            detached_inputs = detach_variable(inputs)
-            with torch.enable_grad():
-                outputs = ctx.run_function(*detached_inputs)
-
-        if isinstance(outputs, torch.Tensor):
-            outputs = (outputs,)
-        torch.autograd.backward(outputs, args)
-        grads = tuple(inp.grad if isinstance(inp, torch.Tensor) else inp
-                      for inp in detached_inputs)
-        return (None, None) + grads
+        return (None, None) + _recompute_backward(ctx, detach_variable(inputs), args)
+
+
+def _stash_rng_state(ctx, run_function, preserve_rng_state, args):
+    ctx.run_function = run_function
+    ctx.preserve_rng_state = preserve_rng_state
+    if preserve_rng_state:
+        ctx.fwd_cpu_state = torch.get_rng_state()
+        # Don't eagerly initialize the cuda context by accident.
+        # (If the user intends that the context is initialized later, within their
+        # run_function, we SHOULD actually stash the cuda state here.  Unfortunately,
+        # we have no way to anticipate this will happen before we run the function.)
+        ctx.had_cuda_in_fwd = False
+        if torch.cuda._initialized:
+            ctx.had_cuda_in_fwd = True
+            ctx.fwd_gpu_devices, ctx.fwd_gpu_states = get_device_states(*args)
+
+
+def _recompute_backward(ctx, detached_inputs, grad_outputs):
+    r"""Recomputes ``ctx.run_function`` on :attr:`detached_inputs` and returns
+    the gradients of the inputs."""
+    # Stash the surrounding rng state, and mimic the state that was
+    # present at this time during forward.  Restore the surrounding state
+    # when we're done.
+    rng_devices = []
+    if ctx.preserve_rng_state and ctx.had_cuda_in_fwd:
+        rng_devices = ctx.fwd_gpu_devices
+    with torch.random.fork_rng(devices=rng_devices, enabled=ctx.preserve_rng_state):
+        if ctx.preserve_rng_state:
+            torch.set_rng_state(ctx.fwd_cpu_state)
+            if ctx.had_cuda_in_fwd:
+                set_device_states(ctx.fwd_gpu_devices, ctx.fwd_gpu_states)
+        with torch.enable_grad():
+            outputs = ctx.run_function(*detached_inputs)
+
+    if isinstance(outputs, torch.Tensor):
+        outputs = (outputs,)
+    torch.autograd.backward(outputs, grad_outputs)
+    return tuple(inp.grad if isinstance(inp, torch.Tensor) else inp
+                 for inp in detached_inputs)
+
+
+_offload_streams = {}
+
+
+def _get_offload_stream(device):
+    if device not in _offload_streams:
+        _offload_streams[device] = torch.cuda.Stream(device)
+    return _offload_streams[device]
+
+
+class _OffloadedTensor(object):
+    r"""A copy of a tensor in host memory, made on a side stream for CUDA
+    tensors so that it overlaps with compute. CPU tensors are cloned, which
+    goes through the same code path on machines without CUDA."""
+
+    def __init__(self, tensor):
+        self.device = tensor.device
+        self.requires_grad = tensor.requires_grad
+        self.prefetched = None
+        # Like a tensor saved for backward, the tensor must not be modified
+        # in-place before backward.
+        self.source = weakref.ref(tensor)
+        self.version = tensor._version
+        if not tensor.is_cuda:
+            self.host = tensor.detach().clone()
+            return
+        stream = _get_offload_stream(self.device)
+        stream.wait_stream(torch.cuda.current_stream(self.device))
+        with torch.cuda.stream(stream):
+            self.host = torch.empty(tensor.size(), dtype=tensor.dtype, pin_memory=True)
+            self.host.copy_(tensor, non_blocking=True)
+        # The memory of tensor may only be reused once the copy is done.
+        tensor.record_stream(stream)
+
+    def prefetch(self):
+        r"""Starts copying the tensor back to its device on the side stream."""
+        if self.device.type != 'cuda' or self.prefetched is not None:
+            return
+        stream = _get_offload_stream(self.device)
+        with torch.cuda.stream(stream):
+            self.prefetched = self.host.to(self.device, non_blocking=True)
+
+    def fetch(self):
+        r"""Returns the tensor on its device, detached."""
+        source = self.source()
+        if source is not None and source._version != self.version:
+            raise RuntimeError("one of the inputs offloaded by checkpoint has been modified by an "
+                               "inplace operation: its version is {}, expected version {} "
+                               "instead.".format(source._version, self.version))
+        if self.device.type != 'cuda':
+            tensor = self.host
+        elif self.prefetched is not None:
+            current_stream = torch.cuda.current_stream(self.device)
+            current_stream.wait_stream(_get_offload_stream(self.device))
+            tensor = self.prefetched
+            tensor.record_stream(current_stream)
+        else:
+            torch.cuda.current_stream(self.device).wait_stream(_get_offload_stream(self.device))
+            tensor = self.host.to(self.device, non_blocking=True)
+        tensor.requires_grad = self.requires_grad
+        return tensor
+
+
+class _OffloadedInputs(object):
+    r"""The inputs of an :class:`OffloadFunction`. They are linked to the
+    inputs offloaded just before in forward, which are prefetched when these
+    are fetched since backward runs in the reverse order."""
+
+    # The inputs offloaded last, or None.
+    last = None
+
+    def __init__(self, args):
+        self.values = [_OffloadedTensor(arg) if isinstance(arg, torch.Tensor) else arg
+                       for arg in args]
+        previous = _OffloadedInputs.last
+        self.previous = weakref.ref(previous) if previous is not None else None
+        _OffloadedInputs.last = self
+
+    def wait(self):
+        r"""Makes the current streams wait for the copies to host memory, so
+        that later in-place writes to the inputs are ordered after them."""
+        devices = set(value.device for value in self.values
+                      if isinstance(value, _OffloadedTensor) and value.device.type == 'cuda')
+        for device in devices:
+            torch.cuda.current_stream(device).wait_stream(_get_offload_stream(device))
+
+    def prefetch(self):
+        for value in self.values:
+            if isinstance(value, _OffloadedTensor):
+                value.prefetch()
+
+    def fetch(self):
+        inputs = tuple(value.fetch() if isinstance(value, _OffloadedTensor) else value
+                       for value in self.values)
+        previous = self.previous() if self.previous is not None else None
+        if previous is not None:
+            previous.prefetch()
+        # The host copies are not needed anymore.
+        self.values = []
+        return inputs
+
+
+class OffloadFunction(torch.autograd.Function):
+    r"""Like :class:`CheckpointFunction`, but the inputs saved for backward
+    are offloaded to host memory in forward and copied back in backward."""
+
+    @staticmethod
+    def forward(ctx, run_function, preserve_rng_state, *args):
+        check_backward_validity(args)
+        _stash_rng_state(ctx, run_function, preserve_rng_state, args)
+        ctx.offloaded = _OffloadedInputs(args)
+        with torch.no_grad():
+            outputs = run_function(*args)
+        # The copies overlap with run_function, which only reads the inputs.
+        ctx.offloaded.wait()
+        return outputs
+
+    @staticmethod
+    def backward(ctx, *args):
+        if not torch.autograd._is_checkpoint_valid():
+            raise RuntimeError("Checkpointing is not compatible with .grad(), please use .backward() if possible")
+        if not ctx.offloaded.values:
+            raise RuntimeError("Trying to backward through the graph a second time, but the offloaded "
+                               "inputs have already been freed.")
+        return (None, None) + _recompute_backward(ctx, ctx.offloaded.fetch(), args)
 
 
 def checkpoint(function, *args, **kwargs):
@@ -150,6 +287,13 @@ def checkpoint(function, *args, **kwargs):
             first input as ``activation`` and the second input as ``hidden``
         preserve_rng_state(bool, optional, default=True):  Omit stashing and restoring
             the RNG state during each checkpoint.
+        offload(bool, optional, default=False): Offload the inputs saved for
+            backward to pinned host memory instead of keeping them on the
+            device. CUDA inputs are copied asynchronously on a side stream,
+            and copied back in backward, where the inputs of the previous
+            offloaded checkpoint are prefetched while this one is recomputed.
+            CPU inputs are copied in host memory, which only exercises the
+            same code path.
         args: tuple containing inputs to the :attr:`function`
 
     Returns:
@@ -157,9 +301,12 @@ def checkpoint(function, *args, **kwargs):
     """
     # Hack to mix *args with **kwargs in a python 2.7-compliant way
     preserve = kwargs.pop('preserve_rng_state', True)
+    offload = kwargs.pop('offload', False)
     if kwargs:
         raise ValueError("Unexpected keyword arguments: " + ",".join(arg for arg in kwargs))
 
+    if offload:
+        return OffloadFunction.apply(function, preserve, *args)
     return CheckpointFunction.apply(function, preserve, *args)
 
 
@@ -195,6 +342,8 @@ def checkpoint_sequential(functions, segments, input, **kwargs):
         input: A Tensor that is input to :attr:`functions`
         preserve_rng_state(bool, optional, default=True):  Omit stashing and restoring
             the RNG state during each checkpoint.
+        offload(bool, optional, default=False): Offload the inputs of the
+            segments to host memory, see :func:`~torch.utils.checkpoint.checkpoint`.
 
     Returns:
         Output of running :attr:`functions` sequentially on :attr:`*inputs`
@@ -205,6 +354,7 @@ def checkpoint_sequential(functions, segments, input, **kwargs):
     """
     # Hack for keyword-only parameter in a python 2.7-compliant way
     preserve = kwargs.pop('preserve_rng_state', True)
+    offload = kwargs.pop('offload', False)
     if kwargs:
         raise ValueError("Unexpected keyword arguments: " + ",".join(arg for arg in kwargs))
 
@@ -224,5 +374,332 @@ def checkpoint_sequential(functions, segments, input, **kwargs):
     for start in range(0, segment_size * (segments - 1), segment_size):
         end = start + segment_size - 1
         input = checkpoint(run_function(start, end, functions), input,
-                           preserve_rng_state=preserve)
+                           preserve_rng_state=preserve, offload=offload)
     return run_function(end + 1, len(functions) - 1, functions)(input)
+
+
+class ModuleProfile(namedtuple('ModuleProfile', ['output_bytes', 'leaf_output_bytes', 'time',
+                                                 'calls', 'checkpointable'])):
+    r"""Forward statistics of a module collected by :func:`profile_modules`.
+
+    Attributes:
+        output_bytes: size in bytes of the tensors returned by the module.
+        leaf_output_bytes: size in bytes of the tensors returned by the modules
+            without children of its subtree, an estimate of the activation
+            memory of the module.
+        time: forward time in seconds.
+        calls: number of times the module was called.
+        checkpointable: whether the module returned a tensor or a tuple of
+            tensors every time, as required by :func:`checkpoint`.
+    """
+    __slots__ = ()
+
+
+def _tensor_bytes(value):
+    if isinstance(value, torch.Tensor):
+        return value.numel() * value.element_size()
+    if isinstance(value, (list, tuple)):
+        return sum(_tensor_bytes(v) for v in value)
+    if isinstance(value, dict):
+        return sum(_tensor_bytes(v) for v in value.values())
+    return 0
+
+
+def _is_tensor_or_tensors(value):
+    if isinstance(value, tuple):
+        return all(isinstance(v, torch.Tensor) for v in value)
+    return isinstance(value, torch.Tensor)
+
+
+def _is_leaf(module):
+    return next(module.children(), None) is None
+
+
+def profile_modules(model, inputs):
+    r"""Runs one forward pass of :attr:`model` and returns the
+    :class:`ModuleProfile` of every module it called, keyed by the module
+    names of :meth:`~torch.nn.Module.named_modules`.
+
+    The forward pass runs in :func:`torch.no_grad` mode. The activation memory
+    of a module is estimated as the size of the outputs of the modules without
+    children it calls, which are the tensors saved for backward between them.
+
+    Args:
+        model: the :class:`torch.nn.Module` to profile
+        inputs: a Tensor or a tuple of the inputs of :attr:`model`
+    """
+    if not isinstance(inputs, tuple):
+        inputs = (inputs,)
+    synchronize = torch.cuda.is_available() and any(
+        t.is_cuda for t in list(model.parameters()) + [x for x in inputs if isinstance(x, torch.Tensor)])
+    stats = defaultdict(lambda: [0, 0, 0., 0, True])
+    running = []
+
+    def forward_pre_hook(name):
+        def hook(module, input):
+            if synchronize:
+                torch.cuda.synchronize()
+            running.append((name, time.perf_counter()))
+        return hook
+
+    def forward_hook(name):
+        def hook(module, input, output):
+            if synchronize:
+                torch.cuda.synchronize()
+            _, start = running.pop()
+            output_bytes = _tensor_bytes(output)
+            stat = stats[name]
+            stat[0] += output_bytes
+            stat[2] += time.perf_counter() - start
+            stat[3] += 1
+            stat[4] = stat[4] and _is_tensor_or_tensors(output)
+            if _is_leaf(module):
+                for running_name in [name] + [n for n, _ in running]:
+                    stats[running_name][1] += output_bytes
+        return hook
+
+    handles = []
+    try:
+        for name, module in model.named_modules():
+            handles.append(module.register_forward_pre_hook(forward_pre_hook(name)))
+            handles.append(module.register_forward_hook(forward_hook(name)))
+        with torch.no_grad():
+            model(*inputs)
+    finally:
+        for handle in handles:
+            handle.remove()
+    return {name: ModuleProfile(*stat) for name, stat in stats.items()}
+
+
+def _child_name(name, child_name):
+    return name + '.' + child_name if name else child_name
+
+
+def _keeps(keep, module):
+    if keep is None:
+        return False
+    if isinstance(keep, (type, tuple)):
+        return isinstance(module, keep)
+    return keep(module)
+
+
+def _sequential_segments(module, keep):
+    r"""Splits the children of the :class:`torch.nn.Sequential` :attr:`module`
+    in runs of children kept by :attr:`keep` and runs of children to recompute.
+    Returns a list of ``(recompute, [(child_name, child), ...])`` pairs."""
+    segments = []
+    for child_name, child in module.named_children():
+        recompute = not _keeps(keep, child)
+        if segments and segments[-1][0] == recompute:
+            segments[-1][1].append((child_name, child))
+        else:
+            segments.append((recompute, [(child_name, child)]))
+    # Recomputing a single module without children saves nothing, its input
+    # is saved by the checkpoint.
+    return [(recompute and (len(children) > 1 or not _is_leaf(children[0][1])), children)
+            for recompute, children in segments]
+
+
+def _checkpoint_estimate(name, module, profile, keep):
+    r"""Returns the estimated activation memory saved and the recompute time
+    of checkpointing :attr:`module` with the :attr:`keep` policy."""
+    if keep is None or not isinstance(module, torch.nn.Sequential):
+        stat = profile[name]
+        return stat.leaf_output_bytes - stat.output_bytes, stat.time
+    saved, recompute_time = 0, 0.
+    for recompute, children in _sequential_segments(module, keep):
+        stats = [profile.get(_child_name(name, child_name)) for child_name, _ in children]
+        if not recompute or any(stat is None for stat in stats):
+            continue
+        saved += sum(stat.leaf_output_bytes for stat in stats) - stats[-1].output_bytes
+        recompute_time += sum(stat.time for stat in stats)
+    return saved, recompute_time
+
+
+def _overlaps(name, other):
+    return name == other or name.startswith(other + '.') or other.startswith(name + '.')
+
+
+class CheckpointPlan(object):
+    r"""The modules to checkpoint chosen by :func:`plan_checkpointing`.
+
+    Attributes:
+        modules: names of the modules to checkpoint.
+        keep: the policy of the modules whose outputs are kept, see
+            :func:`plan_checkpointing`.
+        activation_bytes: estimated activation memory without checkpointing.
+        saved_bytes: estimated activation memory saved by the plan.
+        recompute_time: estimated time in seconds spent recomputing
+            activations in every backward pass.
+    """
+
+    def __init__(self, modules, keep, activation_bytes, saved_bytes, recompute_time):
+        self.modules = modules
+        self.keep = keep
+        self.activation_bytes = activation_bytes
+        self.saved_bytes = saved_bytes
+        self.recompute_time = recompute_time
+
+    def apply(self, model, offload=False):
+        r"""Checkpoints the planned modules of :attr:`model` in place and
+        returns it, see :func:`checkpoint_modules`."""
+        return checkpoint_modules(model, self.modules, self.keep, offload)
+
+    def __repr__(self):
+        return '{}(modules={}, activation_bytes={}, saved_bytes={}, recompute_time={:.6f})'.format(
+            type(self).__name__, self.modules, self.activation_bytes, self.saved_bytes,
+            self.recompute_time)
+
+
+def _run_children(children):
+    def forward(input):
+        for _, child in children:
+            input = child(input)
+        return input
+    return forward
+
+
+def _checkpoint_module(module, keep, offload):
+    forward = module.forward
+    segments = None
+    if keep is not None and isinstance(module, torch.nn.Sequential):
+        segments = _sequential_segments(module, keep)
+
+    def checkpointed_forward(*args, **kwargs):
+        # The gradients of the parameters of a checkpointed module are only
+        # computed if one of its inputs requires grad.
+        if kwargs or not torch.is_grad_enabled() or not any(
+                isinstance(arg, torch.Tensor) and arg.requires_grad for arg in args):
+            return forward(*args, **kwargs)
+        if segments is None:
+            return checkpoint(forward, *args, offload=offload)
+        input, = args
+        for recompute, children in segments:
+            if recompute and input.requires_grad:
+                input = checkpoint(_run_children(children), input, offload=offload)
+            else:
+                input = _run_children(children)(input)
+        return input
+
+    checkpointed_forward._checkpointed = True
+    module.forward = checkpointed_forward
+
+
+def checkpoint_modules(model, names, keep=None, offload=False):
+    r"""Checkpoints the modules of :attr:`model` named :attr:`names` in
+    place and returns :attr:`model`. Use :func:`remove_checkpointing` to undo it.
+
+    Args:
+        model: a :class:`torch.nn.Module`
+        names (list of str): names of the modules to checkpoint, as given by
+            :meth:`~torch.nn.Module.named_modules`
+        keep (type, tuple of types or callable, optional): the children of
+            :class:`torch.nn.Sequential` modules whose outputs are kept, see
+            :func:`plan_checkpointing`
+        offload (bool): offload the inputs saved by the checkpointed modules
+            to host memory, see :func:`checkpoint`
+
+    Example:
+        >>> # Recompute the first blocks, offload the inputs of the last ones.
+        >>> checkpoint_modules(model, ['blocks.0', 'blocks.1'])
+        >>> checkpoint_modules(model, ['blocks.2', 'blocks.3'], offload=True)
+    """
+    modules = dict(model.named_modules())
+    for name in names:
+        _checkpoint_module(modules[name], keep, offload)
+    return model
+
+
+def remove_checkpointing(model):
+    r"""Undoes :func:`checkpoint_modules` on :attr:`model`."""
+    for module in model.modules():
+        if getattr(module.__dict__.get('forward'), '_checkpointed', False):
+            del module.forward
+    return model
+
+
+def plan_checkpointing(model, inputs, memory_budget, candidates=None, keep=None, profile=None):
+    r"""Chooses the modules of :attr:`model` to checkpoint so that its
+    activation memory fits in :attr:`memory_budget` with the least recompute
+    time.
+
+    The model is profiled with :func:`profile_modules` on :attr:`inputs`.
+    Checkpointing a module saves the estimated activation memory of its
+    subtree, except its output, and costs its forward time in backward.
+    Modules are chosen greedily, those with the least recompute time per
+    saved byte first, without checkpointing a module and one of its
+    descendants.
+
+    With a :attr:`keep` policy, the children of a checkpointed
+    :class:`torch.nn.Sequential` that the policy keeps are not recomputed: only
+    the runs of children between them are checkpointed. For example,
+    ``keep=(nn.Linear, nn.Conv2d)`` keeps the outputs of the matrix
+    multiplications and convolutions and recomputes the cheap elementwise
+    modules between them.
+
+    .. note::
+        A module whose inputs don't require grad, or that is called with
+        keyword arguments, is not checkpointed when called.
+
+    Args:
+        model: the :class:`torch.nn.Module` to plan for
+        inputs: a Tensor or a tuple of example inputs of :attr:`model`, with
+            the shapes used in training
+        memory_budget (int): activation memory in bytes the model may keep
+        candidates (list of str, optional): names of the modules that may be
+            checkpointed. Default: all the modules with children called by the
+            forward pass
+        keep (type, tuple of types or callable, optional): the children of
+            :class:`torch.nn.Sequential` modules whose outputs are kept, see above
+        profile (dict, optional): the result of :func:`profile_modules`, to
+            avoid profiling again
+
+    Returns:
+        A :class:`CheckpointPlan`, apply it with :meth:`CheckpointPlan.apply`.
+
+    Example:
+        >>> plan = plan_checkpointing(model, input, memory_budget=2 * 1024 ** 3,
+        >>>                           keep=(nn.Linear, nn.Conv2d))
+        >>> plan.apply(model)
+        >>> model(input).sum().backward()
+    """
+    if profile is None:
+        profile = profile_modules(model, inputs)
+    modules = dict(model.named_modules())
+    if candidates is None:
+        candidates = [name for name, module in modules.items() if name and not _is_leaf(module)]
+
+    options = []
+    for name in candidates:
+        stat = profile.get(name)
+        if stat is None or not stat.checkpointable:
+            continue
+        saved, recompute_time = _checkpoint_estimate(name, modules[name], profile, keep)
+        if saved > 0:
+            options.append((name, saved, recompute_time))
+
+    activation_bytes = profile[''].leaf_output_bytes
+    required = activation_bytes - memory_budget
+    chosen = []
+    saved_bytes = 0
+    for option in sorted(options, key=lambda option: option[2] / option[1]):
+        if saved_bytes >= required:
+            break
+        if any(_overlaps(option[0], other[0]) for other in chosen):
+            continue
+        chosen.append(option)
+        saved_bytes += option[1]
+    if saved_bytes < required:
+        warnings.warn("The activations of the model don't fit in the memory budget, checkpointing "
+                      "the planned modules saves {} of the {} bytes needed".format(saved_bytes, required))
+
+    # Drop the modules that are not needed to fit in the budget anymore, the
+    # most expensive to recompute first.
+    for option in sorted(chosen, key=lambda option: option[2], reverse=True):
+        if saved_bytes - option[1] >= required:
+            chosen.remove(option)
+            saved_bytes -= option[1]
+
+    chosen_names = set(name for name, _, _ in chosen)
+    return CheckpointPlan([name for name in candidates if name in chosen_names], keep,
+                          activation_bytes, saved_bytes, sum(option[2] for option in chosen))
@@ -16,6 +16,7 @@ class DataLoader(Generic[T_co]):
     dataset: Dataset[T_co]
     batch_size: int
     num_workers: int
+    prefetch_factor: int
     pin_memory: bool
     drop_last: bool
     timeout: float
@@ -24,11 +25,11 @@ class DataLoader(Generic[T_co]):
     def __init__(self, dataset: Dataset[T_co], batch_size: int=..., shuffle: bool=...,
                  sampler: Optional[Sampler[int]]=..., num_workers: int=..., collate_fn: _collate_fn_t=...,
                  pin_memory: bool=..., drop_last: bool=..., timeout: float=...,
-                 worker_init_fn: _worker_init_fn_t=...) -> None: ...
+                 worker_init_fn: _worker_init_fn_t=..., prefetch_factor: int=...) -> None: ...
     @overload
     def __init__(self, dataset: Dataset[T_co], batch_sampler: Optional[Sampler[Sequence[int]]]=...,
                  num_workers: int=..., collate_fn: _collate_fn_t=..., pin_memory: bool=..., timeout: float=...,
-                 worker_init_fn: _worker_init_fn_t=...) -> None: ...
+                 worker_init_fn: _worker_init_fn_t=..., prefetch_factor: int=...) -> None: ...
 
     def __len__(self) -> int: ...
     # We quote '_BaseDataLoaderIter' since it isn't defined yet and the definition can't be moved up
@@ -0,0 +1,124 @@
+"""A background thread that builds and writes summaries for `SummaryWriter`
+in asynchronous mode."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import threading
+import warnings
+
+import numpy as np
+import torch
+from six.moves import queue
+
+_WHEN_FULL_POLICIES = ('block', 'drop_newest', 'drop_oldest')
+
+
+def snapshot(value):
+    """Returns a copy of `value` that is not affected by later in-place
+    updates of `value`, and a CUDA event to synchronize on before reading it,
+    or None.
+
+    CUDA tensors are copied to pinned host memory without blocking the
+    calling thread, CPU tensors and numpy arrays are cloned and other values
+    are returned as they are.
+    """
+    if isinstance(value, torch.Tensor):
+        value = value.detach()
+        if value.is_cuda:
+            host_copy = torch.empty(value.size(), dtype=value.dtype, pin_memory=True)
+            host_copy.copy_(value, non_blocking=True)
+            event = torch.cuda.Event()
+            event.record()
+            return host_copy, event
+        return value.clone(), None
+    if isinstance(value, np.ndarray):
+        return value.copy(), None
+    return value, None
+
+
+class SummaryWorker(object):
+    """Runs the functions submitted to it, in order, on a background thread.
+
+    At most `max_pending` functions wait to be run. When the queue is full,
+    `submit` waits for a free slot with the 'block' policy, drops the new
+    function with 'drop_newest' and drops the oldest pending function with
+    'drop_oldest'. The first exception raised by a function is re-raised by
+    the next call to `join` or `close`.
+    """
+
+    def __init__(self, max_pending=64, when_full='block'):
+        if max_pending <= 0:
+            raise ValueError('max_pending must be positive, got {}'.format(max_pending))
+        if when_full not in _WHEN_FULL_POLICIES:
+            raise ValueError('when_full must be one of {}, got {}'.format(
+                _WHEN_FULL_POLICIES, when_full))
+        self.when_full = when_full
+        self.num_dropped = 0
+        self._queue = queue.Queue(max_pending)
+        self._error = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='SummaryWorker')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def submit(self, fn):
+        """Schedules `fn()` to be run on the worker thread. Returns whether it
+        was scheduled or dropped."""
+        if self._closed:
+            raise RuntimeError('The summary worker is closed')
+        if self.when_full == 'block':
+            self._queue.put(fn)
+            return True
+        while True:
+            try:
+                self._queue.put_nowait(fn)
+                return True
+            except queue.Full:
+                if self.when_full == 'drop_newest':
+                    self._dropped()
+                    return False
+            try:
+                self._queue.get_nowait()
+                self._queue.task_done()
+                self._dropped()
+            except queue.Empty:
+                pass
+
+    def _dropped(self):
+        if self.num_dropped == 0:
+            warnings.warn('The queue of pending summaries is full, summaries are '
+                          'dropped. Increase max_pending_summaries or log less often.')
+        self.num_dropped += 1
+
+    def _run(self):
+        while True:
+            fn = self._queue.get()
+            try:
+                if fn is None:
+                    return
+                fn()
+            except Exception as e:
+                if self._error is None:
+                    self._error = e
+            finally:
+                self._queue.task_done()
+
+    def _raise_error(self):
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def join(self):
+        """Waits until all the submitted functions have been run."""
+        self._queue.join()
+        self._raise_error()
+
+    def close(self):
+        """Runs the pending functions and stops the worker thread."""
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+            self._thread.join()
+        self._raise_error()
@@ -6,6 +6,8 @@ import json
 import logging
 import numpy as np
 import os
+import six
+import torch
 
 # pylint: disable=unused-import
 from six.moves import range
@@ -214,7 +216,7 @@ def histogram_raw(name, min, max, num, sum, sum_squares, bucket_limits, bucket_c
     return Summary(value=[Summary.Value(tag=name, histo=hist)])
 
 
-def histogram(name, values, bins, max_bins=None):
+def histogram(name, values, bins, max_bins=None, max_samples=None):
     # pylint: disable=line-too-long
     """Outputs a `Summary` protocol buffer with a histogram.
     The generated
@@ -226,21 +228,75 @@ def histogram(name, values, bins, max_bins=None):
         TensorBoard.
       values: A real numeric `Tensor`. Any shape. Values to use to
         build the histogram.
+      bins: The number of bins, the bin edges, or one of numpy's binning
+        strategies. With a number of bins or bin edges, the histogram of a
+        `torch.Tensor` is computed on the device of the tensor.
+      max_samples: If the number of values is larger, the histogram is built
+        from an evenly strided subsample of at most `max_samples` values.
     Returns:
       A scalar `Tensor` of type `string`. The serialized `Summary` protocol
       buffer.
     """
-    values = make_np(values)
-    hist = make_histogram(values.astype(float), bins, max_bins)
+    if isinstance(values, torch.Tensor) and bins is not None and not isinstance(bins, six.string_types):
+        hist = make_histogram_from_tensor(_subsample(values, max_samples), bins, max_bins)
+    else:
+        values = _subsample(make_np(values), max_samples)
+        hist = make_histogram(values.astype(float), bins, max_bins)
     return Summary(value=[Summary.Value(tag=name, histo=hist)])
 
 
+def _subsample(values, max_samples):
+    values = values.reshape(-1)
+    if max_samples is None or len(values) <= max_samples:
+        return values
+    stride = -(-len(values) // max_samples)
+    return values[::stride]
+
+
 def make_histogram(values, bins, max_bins=None):
     """Convert values into a histogram proto using logic from histogram.cc."""
     if values.size == 0:
         raise ValueError('The input has no element.')
     values = values.reshape(-1)
     counts, limits = np.histogram(values, bins=bins)
+    return _make_histogram_proto(counts, limits, max_bins, min=values.min(), max=values.max(),
+                                 num=len(values), sum=values.sum(),
+                                 sum_squares=values.dot(values))
+
+
+def make_histogram_from_tensor(values, bins, max_bins=None):
+    """Like `make_histogram` for a `torch.Tensor` and a number of bins or bin
+    edges. The bucket counts and the statistics are computed with torch ops on
+    the device of `values` and only they are copied to the host."""
+    values = values.detach().reshape(-1)
+    if values.numel() == 0:
+        raise ValueError('The input has no element.')
+    if not values.is_floating_point() or values.dtype in (torch.float16, torch.bfloat16):
+        values = values.float()
+    stats = torch.stack([values.min().double(), values.max().double(),
+                         values.sum(dtype=torch.float64),
+                         (values * values).sum(dtype=torch.float64)])
+    if np.ndim(bins) == 0:
+        # Same bin edges as np.histogram for a number of bins.
+        min_value, max_value = stats[:2].tolist()
+        if min_value == max_value:
+            min_value, max_value = min_value - 0.5, max_value + 0.5
+        limits = np.linspace(min_value, max_value, int(bins) + 1)
+    else:
+        limits = np.asarray(bins, dtype=float)
+    edges = torch.as_tensor(limits, dtype=values.dtype, device=values.device)
+    # Like np.histogram, the bins are half-open except for the last one and
+    # values outside of the edges are not counted.
+    counts = torch.bincount(torch.bucketize(values, edges, right=True), minlength=len(limits) + 1)
+    counts = counts[1:len(limits)]
+    counts[-1] += (values == edges[-1]).sum()
+    host = torch.cat([stats, counts.double()]).cpu().numpy()
+    counts = host[4:].astype(np.int64)
+    return _make_histogram_proto(counts, limits, max_bins, min=host[0], max=host[1],
+                                 num=values.numel(), sum=host[2], sum_squares=host[3])
+
+
+def _make_histogram_proto(counts, limits, max_bins, min, max, num, sum, sum_squares):
     num_bins = len(counts)
     if max_bins is not None and num_bins > max_bins:
         subsampling = num_bins // max_bins
@@ -271,12 +327,11 @@ def make_histogram(values, bins, max_bins=None):
     if counts.size == 0 or limits.size == 0:
         raise ValueError('The histogram is empty, please file a bug report.')
 
-    sum_sq = values.dot(values)
-    return HistogramProto(min=values.min(),
-                          max=values.max(),
-                          num=len(values),
-                          sum=values.sum(),
-                          sum_squares=sum_sq,
+    return HistogramProto(min=min,
+                          max=max,
+                          num=num,
+                          sum=sum,
+                          sum_squares=sum_squares,
                           bucket_limit=limits.tolist(),
                           bucket=counts.tolist())
 
@@ -23,13 +23,18 @@ from ._embedding import (
 )
 from ._onnx_graph import load_onnx_graph
 from ._pytorch_graph import graph
+from ._summary_worker import SummaryWorker, snapshot
 from ._utils import figure_to_image
 from .summary import (
     scalar, histogram, histogram_raw, image, audio, text,
-    pr_curve, pr_curve_raw, video, custom_scalars, image_boxes, mesh, hparams
+    pr_curve, pr_curve_raw, video, custom_scalars, image_boxes, mesh, hparams, _subsample
 )
 
 
+def _pr_curve(tag, labels, predictions, num_thresholds, weights):
+    return pr_curve(tag, make_np(labels), make_np(predictions), num_thresholds, weights)
+
+
 class FileWriter(object):
     """Writes protocol buffers to event files to be consumed by TensorBoard.
 
@@ -163,7 +168,8 @@ class SummaryWriter(object):
     """
 
     def __init__(self, log_dir=None, comment='', purge_step=None, max_queue=10,
-                 flush_secs=120, filename_suffix=''):
+                 flush_secs=120, filename_suffix='', async_summaries=False,
+                 max_pending_summaries=64, when_full='block'):
         """Creates a `SummaryWriter` that will write out events and summaries
         to the event file.
 
@@ -188,6 +194,21 @@ class SummaryWriter(object):
             filename_suffix (string): Suffix added to all event filenames in
               the log_dir directory. More details on filename construction in
               tensorboard.summary.writer.event_file_writer.EventFileWriter.
+            async_summaries (bool): If True, the ``add_*`` methods that log
+              tensors or arrays only copy their inputs and return. Converting
+              the copies, building the summaries (e.g. computing histograms or
+              encoding images) and writing them is done by a background thread.
+              CUDA tensors are copied to pinned host memory without
+              synchronizing with the device. Errors raised while building a
+              summary are re-raised by the next ``flush()`` or ``close()``.
+            max_pending_summaries (int): With ``async_summaries``, the maximum
+              number of summaries waiting to be built. Default is 64.
+            when_full (string): With ``async_summaries``, what ``add_*`` does
+              when ``max_pending_summaries`` summaries are waiting: ``'block'``
+              waits for the background thread, ``'drop_newest'`` drops the new
+              summary and ``'drop_oldest'`` drops the oldest waiting summary.
+              The number of dropped summaries is available as
+              ``num_dropped_summaries``. Default is ``'block'``.
 
         Examples::
 
@@ -205,6 +226,10 @@ class SummaryWriter(object):
             writer = SummaryWriter(comment="LR_0.1_BATCH_16")
             # folder location: runs/May04_22-14-54_s-MacBook-Pro.localLR_0.1_BATCH_16/
 
+            # create a summary writer that builds summaries in the background
+            # and drops the oldest ones if the training loop logs too fast.
+            writer = SummaryWriter(async_summaries=True, when_full='drop_oldest')
+
         """
         torch._C._log_api_usage_once("tensorboard.create.summarywriter")
         if not log_dir:
@@ -218,11 +243,18 @@ class SummaryWriter(object):
         self.max_queue = max_queue
         self.flush_secs = flush_secs
         self.filename_suffix = filename_suffix
+        self.async_summaries = async_summaries
+        self.max_pending_summaries = max_pending_summaries
+        self.when_full = when_full
+        self.num_dropped_summaries = 0
 
         # Initialize the file writers, but they can be cleared out on close
         # and recreated later as needed.
         self.file_writer = self.all_writers = None
+        self.summary_worker = None
         self._get_file_writer()
+        if async_summaries:
+            self._get_summary_worker()
 
         # Create default bins for histograms, see generate_testdata.py in tensorflow/tensorboard
         v = 1E-12
@@ -264,6 +296,40 @@ class SummaryWriter(object):
                 self.purge_step = None
         return self.file_writer
 
+    def _get_summary_worker(self):
+        """Returns the SummaryWorker instance of asynchronous mode. Recreates it if closed."""
+        if self.summary_worker is None:
+            self.summary_worker = SummaryWorker(self.max_pending_summaries, self.when_full)
+        return self.summary_worker
+
+    def _add_summary(self, make_summary, args, kwargs=None, global_step=None, walltime=None,
+                     file_writer=None):
+        """Adds the summary `make_summary(*args, **kwargs)` to `file_writer`,
+        the default FileWriter if not given. In asynchronous mode, the
+        positional arguments are snapshotted and the summary is built and
+        added by the background thread."""
+        kwargs = kwargs or {}
+        if file_writer is None:
+            file_writer = self._get_file_writer()
+        if not self.async_summaries:
+            file_writer.add_summary(make_summary(*args, **kwargs), global_step, walltime)
+            return
+
+        walltime = time.time() if walltime is None else walltime
+        snapshots = [snapshot(arg) for arg in args]
+        args = [arg for arg, _ in snapshots]
+        events = [event for _, event in snapshots if event is not None]
+
+        def add_summary():
+            for event in events:
+                event.synchronize()
+            file_writer.add_summary(make_summary(*args, **kwargs), global_step, walltime)
+
+        worker = self._get_summary_worker()
+        num_dropped = worker.num_dropped
+        worker.submit(add_summary)
+        self.num_dropped_summaries += worker.num_dropped - num_dropped
+
     def get_logdir(self):
         """Returns the directory where event files will be written."""
         return self.log_dir
@@ -340,8 +406,7 @@ class SummaryWriter(object):
         torch._C._log_api_usage_once("tensorboard.logging.add_scalar")
         if self._check_caffe2_blob(scalar_value):
             scalar_value = workspace.FetchBlob(scalar_value)
-        self._get_file_writer().add_summary(
-            scalar(tag, scalar_value), global_step, walltime)
+        self._add_summary(scalar, (tag, scalar_value), global_step=global_step, walltime=walltime)
 
     def add_scalars(self, main_tag, tag_scalar_dict, global_step=None, walltime=None):
         """Adds many scalar data to summary.
@@ -385,10 +450,11 @@ class SummaryWriter(object):
                 self.all_writers[fw_tag] = fw
             if self._check_caffe2_blob(scalar_value):
                 scalar_value = workspace.FetchBlob(scalar_value)
-            fw.add_summary(scalar(main_tag, scalar_value),
-                           global_step, walltime)
+            self._add_summary(scalar, (main_tag, scalar_value), global_step=global_step,
+                              walltime=walltime, file_writer=fw)
 
-    def add_histogram(self, tag, values, global_step=None, bins='tensorflow', walltime=None, max_bins=None):
+    def add_histogram(self, tag, values, global_step=None, bins='tensorflow', walltime=None, max_bins=None,
+                      max_samples=None):
         """Add histogram to summary.
 
         Args:
@@ -397,8 +463,13 @@ class SummaryWriter(object):
             global_step (int): Global step value to record
             bins (string): One of {'tensorflow','auto', 'fd', ...}. This determines how the bins are made. You can find
               other options in: https://docs.scipy.org/doc/numpy/reference/generated/numpy.histogram.html
+              With 'tensorflow', a number of bins or a sequence of bin edges, the histogram of a
+              torch.Tensor is computed with torch ops on the device of the tensor and only the
+              bucket counts are copied to the host.
             walltime (float): Optional override default walltime (time.time())
               seconds after epoch of event
+            max_samples (int): If given and ``values`` has more elements, the histogram and its
+              statistics are computed from an evenly strided subsample of ``max_samples`` values.
 
         Examples::
 
@@ -421,8 +492,11 @@ class SummaryWriter(object):
             values = workspace.FetchBlob(values)
         if isinstance(bins, six.string_types) and bins == 'tensorflow':
             bins = self.default_bins
-        self._get_file_writer().add_summary(
-            histogram(tag, values, bins, max_bins=max_bins), global_step, walltime)
+        if max_samples is not None and isinstance(values, torch.Tensor):
+            # Subsample first, so that asynchronous mode only copies the subsample.
+            values = _subsample(values, max_samples)
+        self._add_summary(histogram, (tag, values, bins), {'max_bins': max_bins, 'max_samples': max_samples},
+                          global_step, walltime)
 
     def add_histogram_raw(self, tag, min, max, num, sum, sum_squares,
                           bucket_limits, bucket_counts, global_step=None,
@@ -479,17 +553,17 @@ class SummaryWriter(object):
         torch._C._log_api_usage_once("tensorboard.logging.add_histogram_raw")
         if len(bucket_limits) != len(bucket_counts):
             raise ValueError('len(bucket_limits) != len(bucket_counts), see the document.')
-        self._get_file_writer().add_summary(
-            histogram_raw(tag,
-                          min,
-                          max,
-                          num,
-                          sum,
-                          sum_squares,
-                          bucket_limits,
-                          bucket_counts),
-            global_step,
-            walltime)
+        self._add_summary(histogram_raw,
+                          (tag,
+                           min,
+                           max,
+                           num,
+                           sum,
+                           sum_squares,
+                           bucket_limits,
+                           bucket_counts),
+                          global_step=global_step,
+                          walltime=walltime)
 
     def add_image(self, tag, img_tensor, global_step=None, walltime=None, dataformats='CHW'):
         """Add image data to summary.
@@ -536,8 +610,8 @@ class SummaryWriter(object):
         torch._C._log_api_usage_once("tensorboard.logging.add_image")
         if self._check_caffe2_blob(img_tensor):
             img_tensor = workspace.FetchBlob(img_tensor)
-        self._get_file_writer().add_summary(
-            image(tag, img_tensor, dataformats=dataformats), global_step, walltime)
+        self._add_summary(image, (tag, img_tensor), {'dataformats': dataformats},
+                          global_step, walltime)
 
     def add_images(self, tag, img_tensor, global_step=None, walltime=None, dataformats='NCHW'):
         """Add batched image data to summary.
@@ -579,8 +653,8 @@ class SummaryWriter(object):
         torch._C._log_api_usage_once("tensorboard.logging.add_images")
         if self._check_caffe2_blob(img_tensor):
             img_tensor = workspace.FetchBlob(img_tensor)
-        self._get_file_writer().add_summary(
-            image(tag, img_tensor, dataformats=dataformats), global_step, walltime)
+        self._add_summary(image, (tag, img_tensor), {'dataformats': dataformats},
+                          global_step, walltime)
 
     def add_image_with_boxes(self, tag, img_tensor, box_tensor, global_step=None,
                              walltime=None, rescale=1, dataformats='CHW', labels=None):
@@ -615,8 +689,9 @@ class SummaryWriter(object):
                 labels = [labels]
             if len(labels) != box_tensor.shape[0]:
                 labels = None
-        self._get_file_writer().add_summary(image_boxes(
-            tag, img_tensor, box_tensor, rescale=rescale, dataformats=dataformats, labels=labels), global_step, walltime)
+        self._add_summary(image_boxes, (tag, img_tensor, box_tensor),
+                          {'rescale': rescale, 'dataformats': dataformats, 'labels': labels},
+                          global_step, walltime)
 
     def add_figure(self, tag, figure, global_step=None, close=True, walltime=None):
         """Render matplotlib figure into an image and add it to summary.
@@ -653,8 +728,7 @@ class SummaryWriter(object):
             vid_tensor: :math:`(N, T, C, H, W)`. The values should lie in [0, 255] for type `uint8` or [0, 1] for type `float`.
         """
         torch._C._log_api_usage_once("tensorboard.logging.add_video")
-        self._get_file_writer().add_summary(
-            video(tag, vid_tensor, fps), global_step, walltime)
+        self._add_summary(video, (tag, vid_tensor, fps), global_step=global_step, walltime=walltime)
 
     def add_audio(self, tag, snd_tensor, global_step=None, sample_rate=44100, walltime=None):
         """Add audio data to summary.
@@ -672,8 +746,8 @@ class SummaryWriter(object):
         torch._C._log_api_usage_once("tensorboard.logging.add_audio")
         if self._check_caffe2_blob(snd_tensor):
             snd_tensor = workspace.FetchBlob(snd_tensor)
-        self._get_file_writer().add_summary(
-            audio(tag, snd_tensor, sample_rate=sample_rate), global_step, walltime)
+        self._add_summary(audio, (tag, snd_tensor), {'sample_rate': sample_rate},
+                          global_step, walltime)
 
     def add_text(self, tag, text_string, global_step=None, walltime=None):
         """Add text data to summary.
@@ -690,8 +764,7 @@ class SummaryWriter(object):
             writer.add_text('rnn', 'This is an rnn', 10)
         """
         torch._C._log_api_usage_once("tensorboard.logging.add_text")
-        self._get_file_writer().add_summary(
-            text(tag, text_string), global_step, walltime)
+        self._add_summary(text, (tag, text_string), global_step=global_step, walltime=walltime)
 
     def add_onnx_graph(self, prototxt):
         torch._C._log_api_usage_once("tensorboard.logging.add_onnx_graph")
@@ -854,10 +927,8 @@ class SummaryWriter(object):
 
         """
         torch._C._log_api_usage_once("tensorboard.logging.add_pr_curve")
-        labels, predictions = make_np(labels), make_np(predictions)
-        self._get_file_writer().add_summary(
-            pr_curve(tag, labels, predictions, num_thresholds, weights),
-            global_step, walltime)
+        self._add_summary(_pr_curve, (tag, labels, predictions, num_thresholds, weights),
+                          global_step=global_step, walltime=walltime)
 
     def add_pr_curve_raw(self, tag, true_positive_counts,
                          false_positive_counts,
@@ -886,18 +957,18 @@ class SummaryWriter(object):
             see: https://github.com/tensorflow/tensorboard/blob/master/tensorboard/plugins/pr_curve/README.md
         """
         torch._C._log_api_usage_once("tensorboard.logging.add_pr_curve_raw")
-        self._get_file_writer().add_summary(
-            pr_curve_raw(tag,
-                         true_positive_counts,
-                         false_positive_counts,
-                         true_negative_counts,
-                         false_negative_counts,
-                         precision,
-                         recall,
-                         num_thresholds,
-                         weights),
-            global_step,
-            walltime)
+        self._add_summary(
+            pr_curve_raw, (tag,
+                           true_positive_counts,
+                           false_positive_counts,
+                           true_negative_counts,
+                           false_negative_counts,
+                           precision,
+                           recall,
+                           num_thresholds,
+                           weights),
+            global_step=global_step,
+            walltime=walltime)
 
     def add_custom_scalars_multilinechart(self, tags, category='default', title='untitled'):
         """Shorthand for creating multilinechart. Similar to ``add_custom_scalars()``, but the only necessary argument
@@ -1004,25 +1075,33 @@ class SummaryWriter(object):
             writer.close()
         """
         torch._C._log_api_usage_once("tensorboard.logging.add_mesh")
-        self._get_file_writer().add_summary(mesh(tag, vertices, colors, faces, config_dict), global_step, walltime)
+        self._add_summary(mesh, (tag, vertices, colors, faces, config_dict),
+                          global_step=global_step, walltime=walltime)
 
     def flush(self):
         """Flushes the event file to disk.
         Call this method to make sure that all pending events have been written to
         disk.
         """
+        if self.summary_worker is not None:
+            self.summary_worker.join()
         if self.all_writers is None:
             return
         for writer in self.all_writers.values():
             writer.flush()
 
     def close(self):
-        if self.all_writers is None:
-            return  # ignore double close
-        for writer in self.all_writers.values():
-            writer.flush()
-            writer.close()
-        self.file_writer = self.all_writers = None
+        worker, self.summary_worker = self.summary_worker, None
+        try:
+            if worker is not None:
+                worker.close()
+        finally:
+            # all_writers is None after a previous close
+            if self.all_writers is not None:
+                for writer in self.all_writers.values():
+                    writer.flush()
+                    writer.close()
+                self.file_writer = self.all_writers = None
 
     def __enter__(self):
         return self
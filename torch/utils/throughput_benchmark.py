@@ -1,5 +1,6 @@
 from __future__ import absolute_import, division, print_function, unicode_literals
 
+import torch
 import torch._C
 
 def format_time(time_us=None, time_ms=None, time_s=None):
@@ -28,6 +29,7 @@ class ExecutionStats(object):
     def __init__(self, c_stats, benchmark_config):
         self._c_stats = c_stats
         self.benchmark_config = benchmark_config
+        self._sorted_latencies_ms = None
 
     @property
     def latency_avg_ms(self):
@@ -37,6 +39,45 @@ class ExecutionStats(object):
     def num_iters(self):
         return self._c_stats.num_iters
 
+    @property
+    def latencies_ms(self):
+        '''
+        Returns the latency of every iteration in milliseconds. In the open-loop
+        mode it is measured from the scheduled arrival of the request, so it
+        includes the time the request waited for a free calling thread
+        '''
+        return self._c_stats.latencies_ms
+
+    def latency_percentile_ms(self, percentile):
+        '''
+        Returns the given percentile (between 0 and 100) of the latencies in
+        milliseconds, linearly interpolated between the closest iterations
+        '''
+        assert 0 <= percentile <= 100
+        if self._sorted_latencies_ms is None:
+            self._sorted_latencies_ms = sorted(self.latencies_ms)
+        latencies = self._sorted_latencies_ms
+        position = (len(latencies) - 1) * percentile / 100.0
+        lower = int(position)
+        upper = min(lower + 1, len(latencies) - 1)
+        return latencies[lower] + (latencies[upper] - latencies[lower]) * (position - lower)
+
+    @property
+    def latency_p50_ms(self):
+        return self.latency_percentile_ms(50)
+
+    @property
+    def latency_p90_ms(self):
+        return self.latency_percentile_ms(90)
+
+    @property
+    def latency_p99_ms(self):
+        return self.latency_percentile_ms(99)
+
+    @property
+    def latency_p999_ms(self):
+        return self.latency_percentile_ms(99.9)
+
     @property
     def iters_per_second(self):
         '''
@@ -46,17 +87,27 @@ class ExecutionStats(object):
 
     @property
     def total_time_seconds(self):
-        return self.num_iters * (
-            self.latency_avg_ms / 1000.0) / self.benchmark_config.num_calling_threads
-
+        return self._c_stats.total_time_ms / 1000.0
 
     def __str__(self):
-        return '\n'.join([
+        lines = []
+        if self.benchmark_config.target_qps > 0:
+            lines.append("Target iterations per second: {:.2f} ({} arrivals)".format(
+                self.benchmark_config.target_qps,
+                "Poisson" if self.benchmark_config.poisson_arrivals else "evenly spaced"))
+        lines += [
+            "Calling threads: {}, intra-op threads: {}".format(
+                self.benchmark_config.num_calling_threads,
+                self.benchmark_config.num_intra_op_threads or torch.get_num_threads()),
             "Average latency per example: " + format_time(time_ms=self.latency_avg_ms),
+            "Latency percentiles: " + ", ".join(
+                "p{}: {}".format(p, format_time(time_ms=self.latency_percentile_ms(p)))
+                for p in (50, 90, 99, 99.9)),
             "Total number of iterations: {}".format(self.num_iters),
             "Total number of iterations per second (across all threads): {:.2f}".format(self.iters_per_second),
             "Total time: " + format_time(time_s=self.total_time_seconds)
-        ])
+        ]
+        return '\n'.join(lines)
 
 
 class ThroughputBenchmark(object):
@@ -122,7 +173,10 @@ class ThroughputBenchmark(object):
             num_calling_threads=1,
             num_warmup_iters=10,
             num_iters=100,
-            profiler_output_path=""):
+            profiler_output_path="",
+            target_qps=None,
+            poisson_arrivals=False,
+            num_intra_op_threads=None):
         '''
         Args:
             num_warmup_iters (int): Warmup iters are used to make sure we run a module
@@ -142,16 +196,68 @@ class ThroughputBenchmark(object):
                 execution (but not the warmup phase). The full trace will be saved
                 into the file path provided by this argument
 
+            target_qps (float): If set, the benchmark runs in the open-loop mode:
+                requests arrive at this rate (requests per second) whether or not the
+                previous ones are finished, and are served in order of arrival by the
+                first free calling thread. The latency of a request is measured from
+                its arrival, so it includes queueing when the calling threads can't
+                keep up. By default every calling thread issues its next request as
+                soon as the previous one is finished (closed loop), which measures
+                the latency under saturation
+
+            poisson_arrivals (bool): In the open-loop mode, draw the times between
+                requests from an exponential distribution, like independent clients
+                of a server, instead of spacing them evenly
+
+            num_intra_op_threads (int): If set, the number of threads used by each
+                operator (see torch.set_num_threads) during the benchmark. The previous
+                setting is restored afterwards
 
-        This function returns BenchmarkExecutionStats object which is defined via pybind11.
-        It currently has two fields:
+
+        This function returns ExecutionStats object which wraps
+        BenchmarkExecutionStats defined via pybind11. It provides:
             - num_iters - number of actual iterations the benchmark have made
-            - avg_latency_ms - average time it took to infer on one input example in milliseconds
+            - latency_avg_ms - average time it took to infer on one input example in milliseconds
+            - latencies_ms and latency_percentile_ms() - latency of every iteration
+              and its percentiles
+            - iters_per_second - achieved throughput across all calling threads
         '''
         config = torch._C.BenchmarkConfig()
         config.num_calling_threads = num_calling_threads
         config.num_warmup_iters = num_warmup_iters
         config.num_iters = num_iters
         config.profiler_output_path = profiler_output_path
+        if target_qps is not None:
+            assert target_qps > 0, "target_qps must be positive"
+            config.target_qps = target_qps
+        config.poisson_arrivals = poisson_arrivals
+        if num_intra_op_threads is not None:
+            config.num_intra_op_threads = num_intra_op_threads
         c_stats = self._benchmark.benchmark(config)
         return ExecutionStats(c_stats, config)
+
+    def sweep(self, num_calling_threads=(1, 2, 4), num_intra_op_threads=(1,), **kwargs):
+        '''
+        Runs the benchmark for every combination of the given numbers of calling
+        threads and of intra-op threads, with the other arguments of benchmark(),
+        and returns the list of ExecutionStats. This finds the serving
+        configuration of a model on a given machine: with target_qps, the one
+        with the lowest latency percentile of interest; without it, the one with
+        the highest iters_per_second.
+
+        Example::
+
+            >>> results = bench.sweep(num_calling_threads=[1, 2, 4, 8],
+                                      num_intra_op_threads=[1, 2, 4],
+                                      num_iters=10000, target_qps=500)
+            >>> best = min(results, key=lambda stats: stats.latency_p99_ms)
+            >>> print(best)
+        '''
+        results = []
+        for calling_threads in num_calling_threads:
+            for intra_op_threads in num_intra_op_threads:
+                results.append(self.benchmark(
+                    num_calling_threads=calling_threads,
+                    num_intra_op_threads=intra_op_threads,
+                    **kwargs))
+        return results